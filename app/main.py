@@ -1,4 +1,9 @@
-from flask import Flask, render_template, jsonify, request, redirect, url_for, flash, send_file, session
+import time
+# Taken before any other import so --startup-report covers them
+BOOT_STARTED = time.perf_counter()
+
+from flask import Flask, render_template, jsonify, request, redirect, url_for, flash, send_file, session, g, Response
+from flask import got_request_exception
 import json
 import os
 import sys
@@ -7,13 +12,45 @@ from functools import wraps
 
 # Add parent directory to path to import inventory_manager
 sys.path.append(str(Path(__file__).parent.parent))
-from inventory_manager import InventoryManager
+from inventory_manager import (InventoryManager, InvalidField, check_model_year, clean_vehicle_fields,
+                               format_import_report, run_excel_job)
+from search_index import MATCH_MODES
+from vehicle_resolver import ACCEPT_CONFIDENCE
+from catalog_pages import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, parse_fields
+from data_snapshot import SnapshotStore
+from excel_watcher import ExcelWatcher
+from facet_index import parse_price_range
+from job_queue import JobQueue
+from metrics import Metrics
+from repository import InventoryRepository
+from request_profiler import DEFAULT_SLOW_MS, MAX_BODY_CHARS, RequestProfiler, folded_stacks, hot_frames, top_functions
+from response_cache import ResponseCache
+from static_site import StaticSite, prerender
+from year_ranges import (YEAR_FORMATS, contains_year, count_years, expand_inventory, expand_model,
+                         expand_years, format_year_ranges, year_bounds)
 
 app = Flask(__name__, template_folder='templates', static_folder='../static')
 app.secret_key = 'your-secret-key-change-this'  # Change this in production
 
-# Initialize inventory manager
-inventory_manager = InventoryManager()
+# Initialize inventory manager ('journal' appends admin changes instead of rewriting files)
+# INVENTORY_BINARY_SNAPSHOT=1 loads data from marshal snapshots (<file>.bin) kept next to the JSON files
+inventory_manager = InventoryManager(storage=os.environ.get('INVENTORY_STORAGE', 'json'),
+                                     binary_snapshot=os.environ.get('INVENTORY_BINARY_SNAPSHOT') == '1')
+repository = InventoryRepository(inventory_manager)
+metrics = Metrics()
+# Static copy of the public pages, kept current when PRERENDER_DIR is set (see the end of this file)
+static_site = None
+
+def on_snapshot_reload(seconds):
+    metrics.observe_reload(seconds)
+    if static_site is not None:
+        static_site.schedule()
+
+snapshot_store = SnapshotStore(repository, on_reload=on_snapshot_reload)
+response_cache = ResponseCache()
+# Admin-requested cProfile runs, and requests slower than SLOW_REQUEST_MS once slow capture is on
+# (off by default; also switched from the profiling page)
+profiler = RequestProfiler(slow_ms=int(os.environ.get('SLOW_REQUEST_MS', 0)))
 
 # Admin credentials
 ADMIN_USERNAME = 'admin'
@@ -28,76 +65,332 @@ def admin_required(f):
         return f(*args, **kwargs)
     return decorated_function
 
-# Load data function with reload capability
-def load_json_data(filename):
+def reload_data(force=False):
+    """Reload inventory and parts data from JSON files (only the files that changed unless forced)"""
+    return snapshot_store.refresh(force=force)
+
+def current_data():
+    """Data snapshot pinned to the current request"""
+    if 'data' not in g:
+        g.data = snapshot_store.refresh()
+    return g.data
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+# Pages for browsing captures are never captured themselves
+PROFILER_PAGES = '/admin/profiling'
+
+@app.before_request
+def start_request_profiling():
+    """Track the request for slow-request capture and on-demand profiling"""
+    if not request.path.startswith(PROFILER_PAGES):
+        g.profiling = profiler.start(request.path)
+
+@app.teardown_request
+def finish_request_profiling(exception):
+    tracked = g.pop('profiling', None)
+    if tracked is None:
+        return
+    # Only JSON bodies are kept; form posts such as the admin login may carry passwords
+    body = request.get_data(as_text=True)[:MAX_BODY_CHARS] if request.is_json else None
+    profiler.finish(tracked, {
+        'method': request.method,
+        'path': request.path,
+        'endpoint': request.endpoint,
+        'status': g.get('response_status', 500),
+        'error': type(exception).__name__ if exception is not None else g.get('error_type'),
+        'args': request.args.to_dict(flat=False),
+        'view_args': request.view_args or {},
+        'body': body
+    })
+
+@app.after_request
+def record_request_metrics(response):
+    """Per-route latency, status and size; the route template keeps label cardinality bounded"""
+    g.response_status = response.status_code
+    started = g.get('request_started')
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule is not None else '<unmatched>'
+        size = None if response.is_streamed else response.calculate_content_length()
+        metrics.observe_request(request.method, route, response.status_code,
+                                time.perf_counter() - started, size, g.get('error_type'))
+    return response
+
+@got_request_exception.connect_via(app)
+def record_unhandled_exception(sender, exception, **extra):
+    g.error_type = type(exception).__name__
+
+def webhook_error(e, message):
+    """500 response for an exception caught in a webhook, logged and counted in /metrics"""
+    app.logger.exception(f"Webhook {request.path} failed")
+    g.error_type = type(e).__name__
+    return jsonify({
+        "error": f"Error processing request: {str(e)}",
+        "message": message
+    }), 500
+
+@app.before_request
+def check_data_version():
+    """Pick up changes written by other workers (a few stat calls when nothing changed)"""
+    g.data = snapshot_store.refresh(wait=False)
+
+def cached_page(key, render):
+    """Serve render(snapshot) as HTML, rendered and compressed once per data version"""
+    snapshot = current_data()
+    entry = response_cache.get(snapshot.generation, ('page',) + key,
+                               lambda: Response(render(snapshot), mimetype='text/html'))
+    return entry.to_response(request)
+
+def cached_json(key, build):
+    """Serve build(snapshot) as JSON, serialized and compressed once per data version"""
+    snapshot = current_data()
+    entry = response_cache.get(snapshot.generation, key, lambda: jsonify(build(snapshot)))
+    return entry.to_response(request)
+
+def parse_year_format(options):
+    """Requested year format: 'expanded' (default, every year listed) or 'compact' ranges"""
+    year_format = options.get('format', 'expanded')
+    if year_format not in YEAR_FORMATS:
+        raise ValueError(f"'format' must be one of: {', '.join(YEAR_FORMATS)}")
+    return year_format
+
+def format_years(years, year_format):
+    return years if year_format == 'compact' else expand_years(years)
+
+# Template helpers for year ranges
+app.add_template_filter(expand_years)
+app.add_template_filter(count_years)
+app.add_template_filter(format_year_ranges)
+
+def parse_search_options(options):
+    """Read optional match/sort/limit search settings from request args or a JSON body"""
+    match = options.get('match', 'phrase')
+    if match not in MATCH_MODES:
+        raise ValueError(f"'match' must be one of: {', '.join(MATCH_MODES)}")
+    
+    ranked = options.get('sort') == 'relevance'
+    return {'match': match, 'limit': parse_limit(options), 'ranked': ranked}
+
+def parse_part_search_options(options):
+    """Read optional make/model/category filters and limit for part searches"""
+    for name in ('make', 'model', 'category'):
+        if options.get(name) is not None and not isinstance(options.get(name), str):
+            raise ValueError(f"'{name}' must be a string")
+    return {
+        'make': options.get('make') or None,
+        'model': options.get('model') or None,
+        'category': options.get('category') or None,
+        'limit': parse_limit(options)
+    }
+
+def resolve_vehicle(snapshot, make, model):
+    """Look up a model by exact name, falling back to the fuzzy resolver for noisy (spoken) names
+
+    Returns (make, model, model_data, candidates); model_data is empty when
+    no candidate is confident enough, and candidates then holds suggestions.
+    """
+    model_data = snapshot.inventory.get(make, {}).get(model, {}) if make and model else {}
+    if model_data:
+        return make, model, model_data, []
+    
+    candidates = snapshot.vehicle_resolver.resolve(make, model)
+    if candidates and candidates[0]['confidence'] >= ACCEPT_CONFIDENCE:
+        best = candidates[0]
+        return best['make'], best['model'], snapshot.inventory[best['make']][best['model']], candidates
+    return make, model, {}, candidates
+
+def describe_candidates(candidates):
+    return " or ".join(f"the {c['make']} {c['model']}" for c in candidates)
+
+def parse_limit(options):
+    limit = options.get('limit')
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            raise ValueError("'limit' must be an integer")
+        if limit < 1:
+            raise ValueError("'limit' must be a positive integer")
+    return limit
+
+def parse_offset(options):
+    offset = options.get('offset')
+    if offset is None:
+        return 0
     try:
-        with open(f'data/{filename}', 'r') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return {}
+        offset = int(offset)
+    except (TypeError, ValueError):
+        raise ValueError("'offset' must be an integer")
+    if offset < 0:
+        raise ValueError("'offset' must not be negative")
+    return offset
 
-def reload_data():
-    """Reload inventory and parts data from JSON files"""
-    global inventory, parts_catalog
-    inventory = load_json_data('inventory.json')
-    parts_catalog = load_json_data('parts_catalog.json')
+def parse_page_options(request):
+    """Pagination, projection and streaming options for catalog endpoints, or None for the plain full response
+
+    Paging starts when any of cursor/limit/fields is given (pages default to
+    DEFAULT_PAGE_SIZE models); NDJSON streaming is requested with
+    stream=ndjson or an 'Accept: application/x-ndjson' header and is not
+    limited unless a limit is given.
+    """
+    args = request.args
+    stream = args.get('stream') == 'ndjson' or request.accept_mimetypes.best == 'application/x-ndjson'
+    if 'stream' in args and args['stream'] != 'ndjson':
+        raise ValueError("'stream' must be 'ndjson'")
+    if not stream and not any(name in args for name in ('cursor', 'limit', 'fields')):
+        return None
+    
+    limit = parse_limit(args)
+    if limit is None and not stream:
+        limit = DEFAULT_PAGE_SIZE
+    if limit is not None and not stream and limit > MAX_PAGE_SIZE:
+        raise ValueError(f"'limit' must be at most {MAX_PAGE_SIZE}")
+    
+    cursor = args.get('cursor')
+    return {
+        'cursor': decode_cursor(cursor) if cursor else None,
+        'limit': limit,
+        'fields': parse_fields(args.get('fields')),
+        'stream': stream
+    }
+
+def catalog_response(pages, build_record, options):
+    """One page of flat per-model records as JSON, or NDJSON lines yielded from a generator"""
+    keys, next_cursor = pages.page(options['cursor'], options['limit'])
+    fields = options['fields']
+    
+    def project(record):
+        if fields is None:
+            return record
+        return {name: value for name, value in record.items() if name in fields or name in ('make', 'model')}
+    
+    if options['stream']:
+        def generate():
+            for make, model in keys:
+                yield json.dumps(project(build_record(make, model))) + '\n'
+        response = Response(generate(), mimetype='application/x-ndjson')
+        if next_cursor is not None:
+            response.headers['X-Next-Cursor'] = next_cursor
+        return response
+    
+    return jsonify({
+        "results": [project(build_record(make, model)) for make, model in keys],
+        "count": len(keys),
+        "total": len(pages),
+        "next_cursor": next_cursor
+    })
 
 # Initial data load
 reload_data()
 
+def on_excel_import(report):
+    """Swap in the data written by a background Excel import"""
+    repository.invalidate()
+    reload_data()
+    for line in format_import_report(report):
+        app.logger.info(f"Excel import: {line}")
+
+# Import the workbook in the background whenever it is saved (INVENTORY_WATCH_EXCEL=1)
+excel_watcher = None
+if os.environ.get('INVENTORY_WATCH_EXCEL') == '1':
+    excel_watcher = ExcelWatcher(inventory_manager, on_import=on_excel_import,
+                                 guard=snapshot_store.hold_reloads).start()
+
+# Admin Excel imports and exports run here, in a worker process unless INVENTORY_JOBS=thread
+job_queue = JobQueue(use_processes=os.environ.get('INVENTORY_JOBS', 'process') != 'thread')
+
 @app.route('/')
 def home():
-    return render_template('home.html')
+    return cached_page(('home',), lambda snapshot: render_template('home.html'))
+
+def make_page(make):
+    return cached_page(('make', make), lambda snapshot: render_template(
+        'make.html', make=make, models=snapshot.inventory.get(make, {})))
 
 @app.route('/ford')
 def ford():
-    ford_models = inventory.get('Ford', {})
-    return render_template('make.html', make='Ford', models=ford_models)
+    return make_page('Ford')
 
 @app.route('/lincoln')
 def lincoln():
-    lincoln_models = inventory.get('Lincoln', {})
-    return render_template('make.html', make='Lincoln', models=lincoln_models)
+    return make_page('Lincoln')
 
 @app.route('/jeep')
 def jeep():
-    jeep_models = inventory.get('Jeep', {})
-    return render_template('make.html', make='Jeep', models=jeep_models)
+    return make_page('Jeep')
 
 @app.route('/model/<make>/<model_name>')
 def model_detail(make, model_name):
-    model_data = inventory.get(make, {}).get(model_name, {})
-    return render_template('model.html', make=make, model_name=model_name, model_data=model_data)
+    return cached_page(('model', make, model_name), lambda snapshot: render_template(
+        'model.html', make=make, model_name=model_name,
+        model_data=snapshot.inventory.get(make, {}).get(model_name, {})))
 
 @app.route('/services')
 def services():
-    return render_template('services.html', parts=parts_catalog)
+    return cached_page(('services',), lambda snapshot: render_template(
+        'services.html', parts=snapshot.parts_catalog))
 
 # API endpoints for Vapi integration
 @app.route('/api/inventory')
 def api_inventory():
-    """Get all inventory data"""
-    return jsonify(inventory)
+    """Get all inventory data (paged, projected or streamed per model on request)"""
+    try:
+        year_format = parse_year_format(request.args)
+        page_options = parse_page_options(request)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    if page_options is not None:
+        inventory = current_data().inventory
+        
+        def build_record(make, model):
+            data = inventory[make][model]
+            record = {"make": make, "model": model}
+            record.update(data if year_format == 'compact' else expand_model(data))
+            return record
+        
+        return catalog_response(current_data().inventory_pages, build_record, page_options)
+    
+    if year_format == 'compact':
+        return cached_json(('inventory', 'compact'), lambda snapshot: snapshot.inventory)
+    return cached_json(('inventory',), lambda snapshot: expand_inventory(snapshot.inventory))
 
 @app.route('/api/inventory/<make>')
 def api_inventory_by_make(make):
     """Get inventory for a specific make"""
-    make_data = inventory.get(make, {})
+    try:
+        year_format = parse_year_format(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    make_data = current_data().inventory.get(make, {})
     if not make_data:
         return jsonify({"error": f"No inventory found for {make}"}), 404
-    return jsonify({make: make_data})
+    if year_format == 'compact':
+        return cached_json(('inventory', make, 'compact'), lambda snapshot: {make: make_data})
+    return cached_json(('inventory', make), lambda snapshot: expand_inventory({make: make_data}))
 
 @app.route('/api/inventory/<make>/<model>')
 def api_inventory_by_model(make, model):
     """Get details for a specific make and model"""
-    model_data = inventory.get(make, {}).get(model, {})
+    try:
+        year_format = parse_year_format(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    resolved_make, resolved_model, model_data, candidates = resolve_vehicle(current_data(), make, model)
     if not model_data:
-        return jsonify({"error": f"No data found for {make} {model}"}), 404
-    return jsonify({
-        "make": make,
-        "model": model,
-        "data": model_data
-    })
+        return jsonify({"error": f"No data found for {make} {model}", "candidates": candidates}), 404
+    response = {
+        "make": resolved_make,
+        "model": resolved_model,
+        "data": model_data if year_format == 'compact' else expand_model(model_data)
+    }
+    if candidates:
+        response["confidence"] = candidates[0]['confidence']
+    return jsonify(response)
 
 @app.route('/api/search')
 def api_search():
@@ -106,49 +399,154 @@ def api_search():
     if not query:
         return jsonify({"error": "Search query required"}), 400
     
+    try:
+        options = parse_search_options(request.args)
+        year_format = parse_year_format(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
     results = []
-    for make, models in inventory.items():
-        for model, data in models.items():
-            # Search in model name, description, category, and features
-            searchable_text = f"{make} {model} {data.get('description', '')} {data.get('category', '')} {' '.join(data.get('features', []))}".lower()
-            
-            if query in searchable_text:
-                results.append({
-                    "make": make,
-                    "model": model,
-                    "category": data.get('category'),
-                    "description": data.get('description'),
-                    "features": data.get('features', []),
-                    "years": data.get('years', [])
-                })
+    for doc in current_data().search_index.search(query, **options):
+        data = doc.data
+        results.append({
+            "make": doc.make,
+            "model": doc.model,
+            "category": data.get('category'),
+            "description": data.get('description'),
+            "features": data.get('features', []),
+            "years": format_years(data.get('years', []), year_format)
+        })
     
     return jsonify({"results": results, "count": len(results)})
 
+def parse_vehicle_filters(args):
+    """Read /api/vehicles filters; list filters accept repeated or comma separated values"""
+    def values(name):
+        return [value.strip() for raw in args.getlist(name) for value in raw.split(',') if value.strip()]
+    
+    def year(name):
+        value = args.get(name)
+        if value is None:
+            return None
+        try:
+            return int(value)
+        except ValueError:
+            raise ValueError(f"'{name}' must be a year")
+    
+    def price(name, bound):
+        value = args.get(name)
+        if value is None:
+            return None
+        parsed = parse_price_range(value)
+        # 'under $40k' is (0, 40000): price_max takes the high end, price_min the low one
+        if parsed is None or parsed[bound] == float('inf'):
+            raise ValueError(f"'{name}' must be a price such as 40000 or $40k")
+        return parsed[bound]
+    
+    filters = {
+        'makes': values('make'),
+        'categories': values('category'),
+        'statuses': values('status'),
+        'features': values('feature'),
+        'year_min': year('year_min'),
+        'year_max': year('year_max'),
+        'price_min': price('price_min', 0),
+        'price_max': price('price_max', 1)
+    }
+    exact_year = year('year')
+    if exact_year is not None:
+        filters['year_min'] = filters['year_max'] = exact_year
+    return filters
+
+@app.route('/api/vehicles')
+def api_vehicles():
+    """Filter vehicles by make, category, status, features, years and price, with facet counts"""
+    try:
+        filters = parse_vehicle_filters(request.args)
+        year_format = parse_year_format(request.args)
+        limit = parse_limit(request.args)
+        offset = parse_offset(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    facet_index = current_data().facet_index
+    bits = facet_index.query(**filters)
+    matches = facet_index.documents_for(bits)
+    page = matches[offset:offset + limit] if limit is not None else matches[offset:]
+    
+    results = []
+    for make, model, data in page:
+        results.append({
+            "make": make,
+            "model": model,
+            "category": data.get('category'),
+            "description": data.get('description'),
+            "features": data.get('features', []),
+            "price_range": data.get('price_range', ''),
+            "status": data.get('status', 'Available'),
+            "years": format_years(data.get('years', []), year_format)
+        })
+    
+    return jsonify({
+        "results": results,
+        "count": len(matches),
+        "offset": offset,
+        "facets": facet_index.facet_counts(bits)
+    })
+
 @app.route('/api/parts')
 def api_parts():
-    """Get all parts catalog"""
-    return jsonify(parts_catalog)
+    """Get all parts catalog (paged, projected or streamed per model on request)"""
+    try:
+        page_options = parse_page_options(request)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    if page_options is not None:
+        parts_catalog = current_data().parts_catalog
+        return catalog_response(current_data().parts_pages, lambda make, model: {
+            "make": make,
+            "model": model,
+            "parts": parts_catalog[make][model]
+        }, page_options)
+    
+    return cached_json(('parts',), lambda snapshot: snapshot.parts_catalog)
 
 @app.route('/api/parts/<make>')
 def api_parts_by_make(make):
     """Get parts for a specific make"""
-    make_parts = parts_catalog.get(make, {})
+    make_parts = current_data().parts_catalog.get(make, {})
     if not make_parts:
         return jsonify({"error": f"No parts found for {make}"}), 404
-    return jsonify({make: make_parts})
+    return cached_json(('parts', make), lambda snapshot: {make: make_parts})
 
 @app.route('/api/parts/<make>/<model>')
 def api_parts_by_model(make, model):
     """Get parts for a specific make and model"""
-    model_parts = parts_catalog.get(make, {}).get(model, {})
+    model_parts = current_data().parts_catalog.get(make, {}).get(model, {})
     if not model_parts:
         return jsonify({"error": f"No parts found for {make} {model}"}), 404
-    return jsonify({
+    return cached_json(('parts', make, model), lambda snapshot: {
         "make": make,
         "model": model,
         "parts": model_parts
     })
 
+@app.route('/api/parts/search')
+def api_parts_search():
+    """Fuzzy search for a part across every make, model and category"""
+    query = request.args.get('q', '')
+    if not query.strip():
+        return jsonify({"error": "Search query required"}), 400
+    
+    try:
+        options = parse_part_search_options(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    results = current_data().part_index.search(query, **options)
+    return jsonify({"query": query, "results": results, "count": len(results)})
+
 @app.route('/api/business-info')
 def api_business_info():
     """Get business information"""
@@ -171,141 +569,327 @@ def api_business_info():
         ]
     })
 
-# Vapi webhook endpoints
-@app.route('/webhook/check-vehicle', methods=['POST'])
-def webhook_check_vehicle():
-    """Webhook for Vapi to check vehicle availability"""
+# Vapi webhook operations; each takes the JSON body and returns (response, status).
+# They read current_data(), so every operation in one request sees the same snapshot.
+def check_vehicle(data):
+    """Check vehicle availability"""
+    # Extract parameters from Vapi function call
+    requested_make = data.get('make')
+    requested_model = data.get('model')
+    year = data.get('year')
+    
+    for name, value in (('make', requested_make), ('model', requested_model)):
+        if value is not None and not isinstance(value, str):
+            return {"error": f"'{name}' must be a string"}, 400
+    
+    if not requested_model:
+        return {
+            "error": "The 'model' parameter is required ('make' is optional)"
+        }, 400
+    
     try:
-        data = request.get_json()
-        
-        # Extract parameters from Vapi function call
-        make = data.get('make')
-        model = data.get('model')
-        
-        if not make or not model:
-            return jsonify({
-                "error": "Both 'make' and 'model' parameters are required"
-            }), 400
-        
-        # Get vehicle data from inventory
-        model_data = inventory.get(make, {}).get(model, {})
-        
-        if not model_data:
-            return jsonify({
-                "message": f"I don't currently have any {make} {model} vehicles in our inventory.",
-                "available": False,
-                "make": make,
-                "model": model
+        year_format = parse_year_format(data)
+    except ValueError as e:
+        return {"error": str(e)}, 400
+    
+    if year is not None:
+        try:
+            year = int(year)
+        except (TypeError, ValueError):
+            return {"error": "'year' must be a number"}, 400
+    
+    # Get vehicle data from inventory; speech-to-text names are resolved fuzzily
+    make, model, model_data, candidates = resolve_vehicle(current_data(), requested_make, requested_model)
+    
+    if not model_data:
+        asked = " ".join(filter(None, [requested_make, requested_model]))
+        message = f"I don't currently have any {asked} vehicles in our inventory."
+        if candidates:
+            message += f" Did you mean {describe_candidates(candidates)}?"
+        return {
+            "message": message,
+            "available": False,
+            "make": requested_make,
+            "model": requested_model,
+            "candidates": candidates
+        }, 200
+    
+    # Get available years (stored as ranges)
+    years = model_data.get('years', [])
+    bounds = year_bounds(years)
+    description = model_data.get('description', f"{make} {model}")
+    
+    # Format response for Vapi
+    response = {
+        "message": f"Yes, we have {make} {model} vehicles available! {description}",
+        "available": True,
+        "make": make,
+        "model": model,
+        "years": format_years(years, year_format),
+        "year_range": f"{bounds[0]}-{bounds[1]}" if bounds else "N/A",
+        "description": description
+    }
+    if candidates:
+        response["confidence"] = candidates[0]['confidence']
+        response["requested"] = {"make": requested_make, "model": requested_model}
+    
+    if year is not None:
+        response["year"] = year
+        response["year_available"] = contains_year(years, year)
+        if not response["year_available"]:
+            response["message"] = (f"We have {make} {model} vehicles, but not the {year} model year. "
+                                   f"Available years: {format_year_ranges(years)}.")
+    
+    return response, 200
+
+def business_info(data):
+    """Business information"""
+    business_info = {
+        "name": "Premium Auto Dealership",
+        "phone": "(555) 123-4567",
+        "email": "info@premiumauto.com",
+        "address": "123 Auto Lane, Car City, CC 12345",
+        "hours": {
+            "monday_friday": "8:00 AM - 7:00 PM",
+            "saturday": "9:00 AM - 6:00 PM",
+            "sunday": "12:00 PM - 5:00 PM"
+        },
+        "brands": ["Ford", "Lincoln", "Jeep"],
+        "services": [
+            "New & Used Vehicle Sales",
+            "Professional Service Center",
+            "Genuine Parts & Accessories",
+            "Financing Options Available"
+        ]
+    }
+    
+    # Format response for Vapi
+    response = {
+        "message": f"We're {business_info['name']} located at {business_info['address']}. You can reach us at {business_info['phone']}. Our hours are Monday-Friday {business_info['hours']['monday_friday']}, Saturday {business_info['hours']['saturday']}, and Sunday {business_info['hours']['sunday']}. We sell {', '.join(business_info['brands'])} vehicles and offer {', '.join(business_info['services'])}.",
+        "data": business_info
+    }
+    
+    return response, 200
+
+def search_vehicles(data):
+    """Search vehicles"""
+    query = data.get('query') or ''
+    if not isinstance(query, str):
+        return {
+            "error": "'query' must be a string",
+            "message": "Please provide a search term."
+        }, 400
+    query = query.lower()
+    
+    if not query:
+        return {
+            "error": "Search query is required",
+            "message": "Please provide a search term."
+        }, 400
+    
+    try:
+        options = parse_search_options(data)
+        year_format = parse_year_format(data)
+    except ValueError as e:
+        return {
+            "error": str(e),
+            "message": "Please check the search options."
+        }, 400
+    
+    snapshot = current_data()
+    results = []
+    for doc in snapshot.search_index.search(query, **options):
+        results.append({
+            "make": doc.make,
+            "model": doc.model,
+            "description": doc.data.get('description', ''),
+            "years": format_years(doc.data.get('years', []), year_format)
+        })
+    
+    if not results:
+        # Nothing contains the transcribed text; try it as a (misheard) make/model name
+        for candidate in snapshot.vehicle_resolver.resolve(model=query, limit=options['limit'] or 3):
+            model_data = snapshot.inventory[candidate['make']][candidate['model']]
+            results.append({
+                "make": candidate['make'],
+                "model": candidate['model'],
+                "description": model_data.get('description', ''),
+                "years": format_years(model_data.get('years', []), year_format),
+                "confidence": candidate['confidence']
             })
-        
-        # Get available years
-        years = model_data.get('years', [])
-        description = model_data.get('description', f"{make} {model}")
-        
-        # Format response for Vapi
+    
+    if results:
+        vehicle_list = ", ".join([f"{r['make']} {r['model']}" for r in results])
         response = {
-            "message": f"Yes, we have {make} {model} vehicles available! {description}",
-            "available": True,
-            "make": make,
-            "model": model,
-            "years": years,
-            "year_range": f"{min(years)}-{max(years)}" if years else "N/A",
-            "description": description
+            "message": f"I found {len(results)} vehicles matching '{query}': {vehicle_list}",
+            "results": results,
+            "count": len(results)
         }
-        
-        return jsonify(response)
-        
+    else:
+        response = {
+            "message": f"I couldn't find any vehicles matching '{query}'. We have Ford, Lincoln, and Jeep vehicles available.",
+            "results": [],
+            "count": 0
+        }
+    
+    return response, 200
+
+def search_parts(data):
+    """Find which vehicles a part is stocked for"""
+    query = data.get('query') or ''
+    if not isinstance(query, str):
+        return {
+            "error": "'query' must be a string",
+            "message": "Please tell me which part you are looking for."
+        }, 400
+    
+    if not query.strip():
+        return {
+            "error": "Part name is required",
+            "message": "Please tell me which part you are looking for."
+        }, 400
+    
+    try:
+        options = parse_part_search_options(data)
+    except ValueError as e:
+        return {
+            "error": str(e),
+            "message": "Please check the search options."
+        }, 400
+    
+    snapshot = current_data()
+    if options['make']:
+        options['make'] = snapshot.vehicle_resolver.resolve_make(options['make'])[0] or options['make']
+    if options['model']:
+        match = snapshot.vehicle_resolver.best(options['make'], options['model'])
+        if match is not None:
+            options['make'], options['model'] = match['make'], match['model']
+    
+    results = snapshot.part_index.search(query, **options)
+    
+    if results:
+        best = results[0]
+        vehicles = ", ".join(f"{loc['make']} {loc['model']}" for loc in best['locations'][:5])
+        more = len(best['locations']) - 5
+        if more > 0:
+            vehicles += f" and {more} more"
+        message = f"Yes, we carry {best['part']} for the {vehicles}."
+        if len(results) > 1:
+            others = ", ".join(result['part'] for result in results[1:4])
+            message += f" Similar parts: {others}."
+    else:
+        vehicle = " ".join(filter(None, [options['make'], options['model']]))
+        suffix = f" for the {vehicle}" if vehicle else ""
+        message = f"I couldn't find any parts matching '{query}'{suffix}. Please call our parts department for special orders."
+    
+    return {
+        "message": message,
+        "results": results,
+        "count": len(results)
+    }, 200
+
+# Operation name -> (function, message spoken when it fails unexpectedly)
+WEBHOOK_OPERATIONS = {
+    'check-vehicle': (check_vehicle, "Sorry, I encountered an error while checking vehicle availability."),
+    'business-info': (business_info, "Sorry, I encountered an error while getting business information."),
+    'search-vehicles': (search_vehicles, "Sorry, I encountered an error while searching vehicles."),
+    'search-parts': (search_parts, "Sorry, I encountered an error while searching parts.")
+}
+
+# Most operations accepted in one /webhook/batch call
+MAX_BATCH_ITEMS = 20
+
+def run_webhook(operation):
+    """Run one webhook operation on the request body"""
+    function, error_message = WEBHOOK_OPERATIONS[operation]
+    try:
+        response, status = function(request.get_json())
+        return jsonify(response), status
     except Exception as e:
-        return jsonify({
-            "error": f"Error processing request: {str(e)}",
-            "message": "Sorry, I encountered an error while checking vehicle availability."
-        }), 500
+        return webhook_error(e, error_message)
+
+# Vapi webhook endpoints
+@app.route('/webhook/check-vehicle', methods=['POST'])
+def webhook_check_vehicle():
+    """Webhook for Vapi to check vehicle availability"""
+    return run_webhook('check-vehicle')
 
 @app.route('/webhook/business-info', methods=['POST'])
 def webhook_business_info():
     """Webhook for Vapi to get business information"""
-    try:
-        business_info = {
-            "name": "Premium Auto Dealership",
-            "phone": "(555) 123-4567",
-            "email": "info@premiumauto.com",
-            "address": "123 Auto Lane, Car City, CC 12345",
-            "hours": {
-                "monday_friday": "8:00 AM - 7:00 PM",
-                "saturday": "9:00 AM - 6:00 PM",
-                "sunday": "12:00 PM - 5:00 PM"
-            },
-            "brands": ["Ford", "Lincoln", "Jeep"],
-            "services": [
-                "New & Used Vehicle Sales",
-                "Professional Service Center",
-                "Genuine Parts & Accessories",
-                "Financing Options Available"
-            ]
-        }
-        
-        # Format response for Vapi
-        response = {
-            "message": f"We're {business_info['name']} located at {business_info['address']}. You can reach us at {business_info['phone']}. Our hours are Monday-Friday {business_info['hours']['monday_friday']}, Saturday {business_info['hours']['saturday']}, and Sunday {business_info['hours']['sunday']}. We sell {', '.join(business_info['brands'])} vehicles and offer {', '.join(business_info['services'])}.",
-            "data": business_info
-        }
-        
-        return jsonify(response)
-        
-    except Exception as e:
-        return jsonify({
-            "error": f"Error processing request: {str(e)}",
-            "message": "Sorry, I encountered an error while getting business information."
-        }), 500
+    return run_webhook('business-info')
 
 @app.route('/webhook/search-vehicles', methods=['POST'])
 def webhook_search_vehicles():
     """Webhook for Vapi to search vehicles"""
-    try:
-        data = request.get_json()
-        query = data.get('query', '').lower()
-        
-        if not query:
-            return jsonify({
-                "error": "Search query is required",
-                "message": "Please provide a search term."
-            }), 400
-        
-        results = []
-        for make, models in inventory.items():
-            for model, model_data in models.items():
-                # Search in model name, description, category, and features
-                searchable_text = f"{make} {model} {model_data.get('description', '')} {model_data.get('category', '')} {' '.join(model_data.get('features', []))}".lower()
-                
-                if query in searchable_text:
-                    results.append({
-                        "make": make,
-                        "model": model,
-                        "description": model_data.get('description', ''),
-                        "years": model_data.get('years', [])
-                    })
+    return run_webhook('search-vehicles')
+
+@app.route('/webhook/search-parts', methods=['POST'])
+def webhook_search_parts():
+    """Webhook for Vapi to find which vehicles a part is stocked for"""
+    return run_webhook('search-parts')
+
+@app.route('/webhook/batch', methods=['POST'])
+def webhook_batch():
+    """Webhook for Vapi to run several operations in one round-trip against one data snapshot
+
+    Body: {"operations": [{"type": "check-vehicle", "params": {...}}, ...]}.
+    Every item gets its own result or error; one failing item does not
+    fail the others.
+    """
+    data = request.get_json(silent=True) or {}
+    operations = data.get('operations')
+    if not isinstance(operations, list) or not operations:
+        return jsonify({
+            "error": "'operations' must be a non-empty list",
+            "message": "Please provide the operations to run."
+        }), 400
+    if len(operations) > MAX_BATCH_ITEMS:
+        return jsonify({
+            "error": f"At most {MAX_BATCH_ITEMS} operations are allowed per batch",
+            "message": "Please send fewer operations at once."
+        }), 400
+    
+    snapshot = current_data()
+    results = []
+    messages = []
+    for index, item in enumerate(operations):
+        operation = item.get('type') if isinstance(item, dict) else None
+        if operation not in WEBHOOK_OPERATIONS:
+            results.append({
+                "index": index,
+                "type": operation,
+                "status": 400,
+                "error": f"'type' must be one of: {', '.join(WEBHOOK_OPERATIONS)}"
+            })
+            continue
         
-        if results:
-            vehicle_list = ", ".join([f"{r['make']} {r['model']}" for r in results])
-            response = {
-                "message": f"I found {len(results)} vehicles matching '{query}': {vehicle_list}",
-                "results": results,
-                "count": len(results)
-            }
-        else:
-            response = {
-                "message": f"I couldn't find any vehicles matching '{query}'. We have Ford, Lincoln, and Jeep vehicles available.",
-                "results": [],
-                "count": 0
-            }
+        # 'params' may be left out, but when given it must be an object ([] or "" are errors, not {})
+        params = item.get('params', {})
+        if not isinstance(params, dict):
+            results.append({"index": index, "type": operation, "status": 400, "error": "'params' must be an object"})
+            continue
         
-        return jsonify(response)
+        function, error_message = WEBHOOK_OPERATIONS[operation]
+        try:
+            response, status = function(params)
+        except Exception as e:
+            app.logger.exception(f"Batch operation {index} ({operation}) failed")
+            g.error_type = type(e).__name__
+            response, status = {"error": f"Error processing request: {str(e)}", "message": error_message}, 500
         
-    except Exception as e:
-        return jsonify({
-            "error": f"Error processing request: {str(e)}",
-            "message": "Sorry, I encountered an error while searching vehicles."
-        }), 500
+        results.append({"index": index, "type": operation, "status": status, "result": response})
+        if response.get("message"):
+            messages.append(response["message"])
+    
+    errors = sum(1 for result in results if result["status"] >= 400)
+    return jsonify({
+        "message": " ".join(messages),
+        "results": results,
+        "count": len(results),
+        "errors": errors,
+        "version": snapshot.version
+    })
 
 @app.route('/webhook/get-inventory', methods=['POST'])
 def webhook_get_inventory():
@@ -314,7 +898,7 @@ def webhook_get_inventory():
         makes = []
         total_models = 0
         
-        for make, models in inventory.items():
+        for make, models in current_data().inventory.items():
             model_list = list(models.keys())
             makes.append({
                 "make": make,
@@ -336,10 +920,7 @@ def webhook_get_inventory():
         return jsonify(response)
         
     except Exception as e:
-        return jsonify({
-            "error": f"Error processing request: {str(e)}",
-            "message": "Sorry, I encountered an error while getting inventory information."
-        }), 500
+        return webhook_error(e, "Sorry, I encountered an error while getting inventory information.")
 
 # Authentication routes
 @app.route('/admin/login', methods=['GET', 'POST'])
@@ -370,15 +951,10 @@ def admin_logout():
 @admin_required
 def admin_dashboard():
     """Main admin dashboard with statistics"""
-    # Load current data
-    inventory_data = inventory_manager.load_json(inventory_manager.inventory_file)
-    parts_data = inventory_manager.load_json(inventory_manager.parts_file)
-    
-    # Handle case where data might be in different format
-    if not isinstance(inventory_data, dict):
-        inventory_data = {}
-    if not isinstance(parts_data, dict):
-        parts_data = {}
+    # Current in-memory data (only re-read from disk after a change)
+    snapshot = current_data()
+    inventory_data = snapshot.inventory
+    parts_data = snapshot.parts_catalog
     
     # Calculate statistics
     total_vehicles = 0
@@ -390,7 +966,7 @@ def admin_dashboard():
             total_vehicles += len(models)
             for model, data in models.items():
                 if isinstance(data, dict):
-                    total_combinations += len(data.get('years', []))
+                    total_combinations += count_years(data.get('years', []))
     
     for make, make_parts in parts_data.items():
         if isinstance(make_parts, dict):
@@ -414,17 +990,13 @@ def admin_dashboard():
 @admin_required
 def admin_vehicles():
     """Vehicle management page"""
-    inventory_data = inventory_manager.load_json(inventory_manager.inventory_file)
-    if not isinstance(inventory_data, dict):
-        inventory_data = {}
-    return render_template('crud_vehicles.html', inventory=inventory_data)
+    return render_template('crud_vehicles.html', inventory=current_data().inventory)
 
 @app.route('/admin/vehicles/<make>')
 @admin_required
 def admin_vehicles_by_make(make):
     """Vehicle management for specific make"""
-    inventory_data = inventory_manager.load_json(inventory_manager.inventory_file)
-    make_inventory = inventory_data.get(make, {})
+    make_inventory = current_data().inventory.get(make, {})
     return render_template('crud_vehicles_make.html', make=make, vehicles=make_inventory)
 
 @app.route('/admin/vehicle/add', methods=['GET', 'POST'])
@@ -436,28 +1008,19 @@ def admin_add_vehicle():
         
         make = data['make']
         model = data['model']
-        year = int(data['year'])
-        
-        inventory_data = inventory_manager.load_json(inventory_manager.inventory_file)
-        
-        if make not in inventory_data:
-            inventory_data[make] = {}
-        
-        if model not in inventory_data[make]:
-            inventory_data[make][model] = {
-                'years': [],
+        try:
+            year = check_model_year(data['year'])
+            attributes = clean_vehicle_fields({
                 'category': data.get('category', ''),
                 'description': data.get('description', f'{make} {model}'),
                 'features': data.get('features', []),
                 'price_range': data.get('price_range', ''),
                 'status': data.get('status', 'Available')
-            }
-        
-        if year not in inventory_data[make][model]['years']:
-            inventory_data[make][model]['years'].append(year)
-            inventory_data[make][model]['years'].sort()
+            })
+        except InvalidField as e:
+            return jsonify({'success': False, 'error': str(e), 'field': e.field}), 400
         
-        inventory_manager.save_json(inventory_data, inventory_manager.inventory_file)
+        repository.add_vehicle(make, model, year, attributes)
         reload_data()  # Reload the global data
         return jsonify({'success': True})
     
@@ -467,8 +1030,7 @@ def admin_add_vehicle():
 @admin_required
 def admin_edit_vehicle(make, model):
     """Edit vehicle"""
-    inventory_data = inventory_manager.load_json(inventory_manager.inventory_file)
-    vehicle = inventory_data.get(make, {}).get(model, {})
+    vehicle = current_data().inventory.get(make, {}).get(model, {})
     return render_template('crud_edit_vehicle.html', make=make, model=model, vehicle=vehicle)
 
 @app.route('/admin/vehicle/update', methods=['POST'])
@@ -480,19 +1042,21 @@ def admin_update_vehicle():
     make = data['make']
     model = data['model']
     
-    inventory_data = inventory_manager.load_json(inventory_manager.inventory_file)
-    
-    if make in inventory_data and model in inventory_data[make]:
-        inventory_data[make][model].update({
+    try:
+        fields = clean_vehicle_fields({
             'category': data.get('category', ''),
             'description': data.get('description', ''),
             'features': data.get('features', []),
             'price_range': data.get('price_range', ''),
             'status': data.get('status', 'Available'),
-            'years': sorted(data.get('years', []))
+            'years': data.get('years', [])
         })
-        
-        inventory_manager.save_json(inventory_data, inventory_manager.inventory_file)
+    except InvalidField as e:
+        return jsonify({'success': False, 'error': str(e), 'field': e.field}), 400
+    
+    updated = repository.update_vehicle(make, model, fields)
+    
+    if updated:
         reload_data()  # Reload the global data
         return jsonify({'success': True})
     
@@ -502,16 +1066,7 @@ def admin_update_vehicle():
 @admin_required
 def admin_delete_vehicle(make, model):
     """Delete vehicle"""
-    inventory_data = inventory_manager.load_json(inventory_manager.inventory_file)
-    
-    if make in inventory_data and model in inventory_data[make]:
-        del inventory_data[make][model]
-        
-        # Remove make if no models left
-        if not inventory_data[make]:
-            del inventory_data[make]
-        
-        inventory_manager.save_json(inventory_data, inventory_manager.inventory_file)
+    if repository.delete_vehicle(make, model):
         reload_data()  # Reload the global data
         flash(f'Successfully deleted {make} {model}', 'success')
     else:
@@ -523,8 +1078,7 @@ def admin_delete_vehicle(make, model):
 @admin_required
 def admin_parts():
     """Parts management page"""
-    parts_data = inventory_manager.load_json(inventory_manager.parts_file)
-    return render_template('crud_parts.html', parts=parts_data)
+    return render_template('crud_parts.html', parts=current_data().parts_catalog)
 
 @app.route('/admin/part/add', methods=['GET', 'POST'])
 @admin_required
@@ -538,26 +1092,12 @@ def admin_add_part():
         category = data['category']
         part = data['part']
         
-        parts_data = inventory_manager.load_json(inventory_manager.parts_file)
-        
-        if make not in parts_data:
-            parts_data[make] = {}
-        if model not in parts_data[make]:
-            parts_data[make][model] = {}
-        if category not in parts_data[make][model]:
-            parts_data[make][model][category] = []
-        
-        if part not in parts_data[make][model][category]:
-            parts_data[make][model][category].append(part)
-            parts_data[make][model][category].sort()
-        
-        inventory_manager.save_json(parts_data, inventory_manager.parts_file)
+        repository.add_part(make, model, category, part)
         reload_data()  # Reload the global data
         return jsonify({'success': True})
     
     # Get available vehicles for dropdown
-    inventory_data = inventory_manager.load_json(inventory_manager.inventory_file)
-    return render_template('crud_add_part.html', inventory=inventory_data)
+    return render_template('crud_add_part.html', inventory=current_data().inventory)
 
 @app.route('/admin/part/delete')
 @admin_required
@@ -568,27 +1108,48 @@ def admin_delete_part():
     category = request.args.get('category')
     part = request.args.get('part')
     
-    parts_data = inventory_manager.load_json(inventory_manager.parts_file)
-    
-    try:
-        parts_data[make][model][category].remove(part)
-        
-        # Clean up empty categories/models/makes
-        if not parts_data[make][model][category]:
-            del parts_data[make][model][category]
-        if not parts_data[make][model]:
-            del parts_data[make][model]
-        if not parts_data[make]:
-            del parts_data[make]
-        
-        inventory_manager.save_json(parts_data, inventory_manager.parts_file)
+    if repository.delete_part(make, model, category, part):
         reload_data()  # Reload the global data
         flash(f'Successfully deleted part: {part}', 'success')
-    except (KeyError, ValueError):
+    else:
         flash(f'Part not found: {part}', 'error')
     
     return redirect(url_for('admin_parts'))
 
+# Most operations accepted in one /admin/bulk call
+MAX_BULK_OPERATIONS = 1000
+
+@app.route('/admin/bulk', methods=['POST'])
+@admin_required
+def admin_bulk():
+    """Apply several vehicle and part changes in one transaction with a single write and reload
+
+    Body: {"operations": [{"op": "add_part", "make": ..., "model": ...,
+    "category": ..., "part": ...}, ...]}. Supported ops: add_vehicle (year,
+    optional attributes), update_vehicle (fields), delete_vehicle, add_part
+    and delete_part. If any operation is invalid or its target is missing,
+    nothing is applied and the response is 400 with a result per operation.
+    """
+    data = request.get_json(silent=True) or {}
+    operations = data.get('operations')
+    if not isinstance(operations, list) or not operations:
+        return jsonify({'success': False, 'error': "'operations' must be a non-empty list"}), 400
+    if len(operations) > MAX_BULK_OPERATIONS:
+        return jsonify({'success': False,
+                        'error': f"At most {MAX_BULK_OPERATIONS} operations are allowed per request"}), 400
+
+    committed, results = repository.apply_bulk(operations)
+    errors = sum(1 for result in results if not result['ok'])
+    if not committed:
+        return jsonify({
+            'success': False,
+            'error': f"{errors} of {len(results)} operations failed, no changes were made",
+            'results': results
+        }), 400
+
+    snapshot = reload_data()
+    return jsonify({'success': True, 'results': results, 'count': len(results), 'version': snapshot.version})
+
 # Legacy admin endpoints for Excel management (updated with authentication)
 @app.route('/admin/legacy')
 @admin_required
@@ -597,27 +1158,53 @@ def admin_legacy():
     excel_exists = os.path.exists('inventory.xlsx')
     return render_template('admin.html', excel_exists=excel_exists)
 
+def submit_excel_job(kind):
+    """Queue an Excel import or export; JSON callers get the job, form posts return to the dashboard"""
+    settings = inventory_manager.worker_settings()
+    if kind == 'import':
+        job = job_queue.submit('import', run_excel_job, ('import', settings),
+                               guard=snapshot_store.hold_reloads, on_done=on_excel_import)
+    else:
+        job = job_queue.submit('export', run_excel_job, ('export', settings))
+    
+    if request.is_json or request.accept_mimetypes.best == 'application/json':
+        return jsonify({'success': True, 'job': job, 'status_url': url_for('admin_job', job_id=job['id'])}), 202
+    flash(f"Excel {kind} started in the background (job {job['id']}). Its progress is shown under Background Jobs.",
+          'success')
+    return redirect(url_for('admin_dashboard'))
+
+def describe_job(job):
+    """Job as returned by the status endpoints, with readable lines for import reports"""
+    if job['kind'] == 'import' and job['result']:
+        job['summary'] = format_import_report(job['result'])
+    return job
+
 @app.route('/admin/export-excel', methods=['POST'])
 @admin_required
 def admin_export_excel():
-    """Export current inventory to Excel"""
-    if inventory_manager.export_to_excel():
-        flash('Successfully exported inventory to Excel with 5 separate sheets!', 'success')
-    else:
-        flash('Failed to export inventory to Excel.', 'error')
-    return redirect(url_for('admin_dashboard'))
+    """Export current inventory to Excel in the background"""
+    return submit_excel_job('export')
 
 @app.route('/admin/import-excel', methods=['POST'])
 @admin_required
 def admin_import_excel():
-    """Import Excel file and update inventory"""
-    if inventory_manager.import_from_excel():
-        # Reload data in Flask app
-        reload_data()
-        flash('Successfully imported inventory from Excel!', 'success')
-    else:
-        flash('Failed to import inventory from Excel.', 'error')
-    return redirect(url_for('admin_dashboard'))
+    """Import Excel file and update inventory in the background"""
+    return submit_excel_job('import')
+
+@app.route('/admin/jobs')
+@admin_required
+def admin_jobs():
+    """Recent background jobs, newest first (polled by the dashboard)"""
+    return jsonify({'jobs': [describe_job(job) for job in job_queue.list()], 'stats': job_queue.stats()})
+
+@app.route('/admin/jobs/<job_id>')
+@admin_required
+def admin_job(job_id):
+    """State, timings and result of one background job"""
+    try:
+        return jsonify(describe_job(job_queue.get(job_id)))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 404
 
 @app.route('/admin/download-excel')
 @admin_required
@@ -633,14 +1220,154 @@ def admin_download_excel():
 @admin_required
 def admin_reload_data():
     """Reload data from JSON files"""
-    reload_data()
+    reload_data(force=True)
     flash('Data reloaded successfully!', 'success')
     return redirect(url_for('admin_dashboard'))
 
+@app.route('/admin/backups')
+@admin_required
+def admin_backups():
+    """List data backups"""
+    return render_template('crud_backups.html', backups=inventory_manager.backups.list(),
+                           keep=inventory_manager.backups.keep)
+
+@app.route('/admin/backups/create', methods=['POST'])
+@admin_required
+def admin_create_backup():
+    """Back up the current inventory and parts data"""
+    backup, created = inventory_manager.backups.create(reason='manual')
+    if created:
+        flash(f"Created backup {backup['id']}.", 'success')
+    else:
+        flash(f"Data unchanged since backup {backup['id']}, no new backup needed.", 'success')
+    return redirect(url_for('admin_backups'))
+
+@app.route('/admin/backups/<backup_id>/restore', methods=['POST'])
+@admin_required
+def admin_restore_backup(backup_id):
+    """Replace the inventory and parts data with a backup"""
+    try:
+        # Both files are replaced; keep serving the old snapshot until both are written
+        with snapshot_store.hold_reloads():
+            inventory_manager.backups.restore(backup_id)
+    except ValueError as e:
+        flash(str(e), 'error')
+        return redirect(url_for('admin_backups'))
+    repository.invalidate()
+    reload_data()
+    flash(f'Restored backup {backup_id}. The previous data was backed up first.', 'success')
+    return redirect(url_for('admin_backups'))
+
+@app.route('/api/data-version')
+def api_data_version():
+    """Report the data version served by this worker"""
+    current_data()
+    info = snapshot_store.describe()
+    info['response_cache'] = response_cache.stats()
+    if excel_watcher is not None:
+        info['excel_watcher'] = excel_watcher.stats()
+    if static_site is not None:
+        info['static_site'] = static_site.stats()
+    info['jobs'] = job_queue.stats()
+    info['profiler'] = profiler.stats()
+    return jsonify(info)
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """Request, error and data-reload metrics for this worker in Prometheus text format"""
+    snapshot = current_data()
+    cache = response_cache.stats()
+    repo = repository.stats()
+    extra = [
+        ('data_generation', 'gauge', 'Generation of the data snapshot being served', snapshot.generation),
+        ('data_loaded_timestamp_seconds', 'gauge', 'When the served data snapshot was loaded', snapshot.loaded_at),
+        ('data_version_checks_total', 'counter', 'Data file change checks', snapshot_store.checks),
+        ('inventory_models', 'gauge', 'Vehicle models in the served snapshot', len(snapshot.search_index)),
+        ('repository_reads_total', 'counter', 'Data files read from disk', repo['misses']),
+        ('response_cache_hits_total', 'counter', 'Responses served from the response cache', cache['hits']),
+        ('response_cache_misses_total', 'counter', 'Responses serialized on a cache miss', cache['misses'])
+    ]
+    return Response(metrics.render(extra), mimetype='text/plain; version=0.0.4')
+
+def describe_capture(capture):
+    """Capture with its start time formatted for the profiling pages"""
+    return dict(capture, started=time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(capture['started_at'])))
+
+@app.route('/admin/profiling', methods=['GET', 'POST'])
+@admin_required
+def admin_profiling():
+    """Slow-request captures and the on-demand profiling switch"""
+    if request.method == 'POST':
+        action = request.form.get('action')
+        if action == 'stop':
+            profiler.disable_profiling()
+            flash('Profiling stopped.', 'success')
+        elif action in ('slow_on', 'slow_off'):
+            try:
+                slow_ms = int(request.form.get('slow_ms') or DEFAULT_SLOW_MS) if action == 'slow_on' else 0
+                profiler.set_slow_ms(slow_ms)
+            except ValueError as e:
+                flash(f'Could not change slow-request capture: {e}', 'error')
+            else:
+                flash(f'Capturing requests slower than {slow_ms} ms.' if slow_ms else 'Slow-request capture is off.',
+                      'success')
+        else:
+            prefix = request.form.get('prefix') or '/'
+            try:
+                count = int(request.form.get('count') or 10)
+                profiler.enable_profiling(prefix, count)
+            except ValueError as e:
+                flash(f'Could not start profiling: {e}', 'error')
+            else:
+                flash(f'Profiling the next {count} requests under {prefix}.', 'success')
+        return redirect(url_for('admin_profiling'))
+    
+    return render_template('crud_profiling.html', captures=[describe_capture(capture) for capture in profiler.list()],
+                           stats=profiler.stats(), keep=profiler.captures.maxlen, pid=os.getpid(),
+                           default_slow_ms=DEFAULT_SLOW_MS)
+
+@app.route('/admin/profiling/<capture_id>')
+@admin_required
+def admin_profiling_capture(capture_id):
+    """One capture: request details, hottest frames and the cProfile report if profiled"""
+    try:
+        capture = profiler.get(capture_id)
+    except ValueError as e:
+        flash(str(e), 'error')
+        return redirect(url_for('admin_profiling'))
+    
+    sort = request.args.get('sort', 'cumulative')
+    if sort not in ('cumulative', 'tottime', 'ncalls'):
+        sort = 'cumulative'
+    report = top_functions(capture, sort) if 'pstats' in capture else None
+    return render_template('crud_profiling_capture.html', capture=describe_capture(capture), report=report, sort=sort,
+                           hot_frames=hot_frames(capture))
+
+@app.route('/admin/profiling/<capture_id>/download')
+@admin_required
+def admin_profiling_download(capture_id):
+    """Download a capture: cProfile stats (.prof) when profiled, otherwise folded stack samples"""
+    try:
+        capture = profiler.get(capture_id)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 404
+    
+    if 'pstats' in capture and request.args.get('format') != 'folded':
+        response = Response(capture['pstats'], mimetype='application/octet-stream')
+        filename = f'{capture_id}.prof'
+    else:
+        response = Response(folded_stacks(capture), mimetype='text/plain')
+        filename = f'{capture_id}.folded'
+    response.headers['Content-Disposition'] = f'attachment; filename={filename}'
+    return response
+
 @app.route('/admin/stats')
 @admin_required
 def admin_stats():
     """Get inventory statistics"""
+    snapshot = current_data()
+    inventory = snapshot.inventory
+    parts_catalog = snapshot.parts_catalog
     total_models = sum(len(models) for models in inventory.values())
     total_year_models = 0
     total_parts = 0
@@ -648,8 +1375,7 @@ def admin_stats():
     # Calculate total year-model combinations
     for make, models in inventory.items():
         for model, model_data in models.items():
-            years = model_data.get('years', [])
-            total_year_models += len(years)
+            total_year_models += count_years(model_data.get('years', []))
     
     # Calculate total parts
     for make, make_parts in parts_catalog.items():
@@ -669,7 +1395,53 @@ def admin_stats():
     
     return jsonify(stats)
 
+def startup_report():
+    """Boot time, memory and heavy modules loaded by this process"""
+    rss_mb = peak_rss_mb = None
+    try:
+        with open('/proc/self/statm') as f:
+            rss_mb = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Kilobytes on Linux, bytes on macOS
+        peak_rss_mb = peak / 2**20 if sys.platform == 'darwin' else peak / 2**10
+    except ImportError:
+        pass
+    
+    snapshot = snapshot_store.current()
+    return {
+        "startup_ms": round((time.perf_counter() - BOOT_STARTED) * 1000, 1),
+        "data_load_ms": round(snapshot_store.last_reload_seconds * 1000, 1),
+        "storage": inventory_manager.storage,
+        "binary_snapshot": inventory_manager.binary_snapshot,
+        "models": len(snapshot.search_index),
+        "part_names": len(snapshot.part_index),
+        "rss_mb": None if rss_mb is None else round(rss_mb, 1),
+        "peak_rss_mb": None if peak_rss_mb is None else round(peak_rss_mb, 1),
+        "modules_loaded": {name: name in sys.modules for name in ('pandas', 'numpy', 'openpyxl', 'watchdog')}
+    }
+
+# Keep a static copy of the public pages in PRERENDER_DIR, re-rendered after every data change
+if os.environ.get('PRERENDER_DIR'):
+    static_site = StaticSite(app, snapshot_store, os.environ['PRERENDER_DIR']).start()
+
 if __name__ == '__main__':
-    import os
+    if '--startup-report' in sys.argv[1:]:
+        print(json.dumps(startup_report(), indent=2))
+        sys.exit(0)
+    
+    if '--prerender' in sys.argv[1:]:
+        # python app/main.py --prerender [DIR]: write the public pages once and exit
+        args = sys.argv[sys.argv.index('--prerender') + 1:]
+        out_dir = args[0] if args else 'site'
+        snapshot = snapshot_store.current()
+        counts = prerender(app, snapshot, out_dir)
+        print(f"Pre-rendered data version {snapshot.version} to {out_dir}: {counts['written']} written, "
+              f"{counts['unchanged']} unchanged, {counts['removed']} removed")
+        sys.exit(0)
+    
     port = int(os.environ.get('PORT', 5001))
     app.run(debug=False, host='0.0.0.0', port=port)
\ No newline at end of file
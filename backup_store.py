@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Content-addressed backups of the inventory and parts data
+Each distinct version of a document is stored once, gzip compressed, as
+objects/<sha256>.json.gz; a backup is an entry in index.json naming one
+object per document. A backup identical to the latest one is skipped and
+only the newest `keep` backups (and the objects they use) are retained.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+import logging
+
+try:
+    import fcntl
+except ImportError:  # Windows has no flock; fall back to in-process locking only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Number of backups kept; older ones are deleted when a new one is made
+DEFAULT_KEEP = 20
+
+
+class BackupStore:
+    def __init__(self, inventory_manager, backup_dir, keep=DEFAULT_KEEP):
+        self.inventory_manager = inventory_manager
+        self.backup_dir = backup_dir
+        self.objects_dir = os.path.join(backup_dir, 'objects')
+        self.index_file = os.path.join(backup_dir, 'index.json')
+        self.keep = keep
+        self._lock = threading.Lock()
+
+    def _documents(self):
+        manager = self.inventory_manager
+        return {'inventory': manager.inventory_file, 'parts': manager.parts_file}
+
+    @contextmanager
+    def _locked(self):
+        """Serialize index updates across threads and worker processes"""
+        with self._lock:
+            os.makedirs(self.objects_dir, exist_ok=True)
+            if fcntl is None:
+                yield
+                return
+            with open(f'{self.index_file}.lock', 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read_index(self):
+        try:
+            with open(self.index_file, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {'backups': []}
+
+    def _write_index(self, index):
+        tmp_file = f'{self.index_file}.tmp'
+        with open(tmp_file, 'w') as f:
+            json.dump(index, f, indent=2)
+        os.replace(tmp_file, self.index_file)
+
+    def _object_path(self, digest):
+        return os.path.join(self.objects_dir, f'{digest}.json.gz')
+
+    def _store_object(self, payload):
+        """Save payload under its digest unless an identical object exists; returns (digest, stored size)"""
+        digest = hashlib.sha256(payload).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            tmp_file = f'{path}.tmp'
+            with open(tmp_file, 'wb') as f:
+                f.write(gzip.compress(payload, compresslevel=6))
+            os.replace(tmp_file, path)
+        return digest, os.path.getsize(path)
+
+    def create(self, reason='manual'):
+        """Back up both documents; returns (backup, created), created is False if nothing changed"""
+        payloads = {}
+        for name, file_path in self._documents().items():
+            data = self.inventory_manager.load_json(file_path)
+            payloads[name] = json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+        with self._locked():
+            index = self._read_index()
+            objects = {}
+            size = {'raw': 0, 'stored': 0}
+            for name, payload in payloads.items():
+                digest, stored = self._store_object(payload)
+                objects[name] = digest
+                size['raw'] += len(payload)
+                size['stored'] += stored
+
+            backups = index['backups']
+            if backups and backups[-1]['objects'] == objects:
+                return backups[-1], False
+
+            created_at = datetime.now()
+            combined = hashlib.sha256(''.join(objects[name] for name in sorted(objects)).encode('ascii')).hexdigest()
+            backup_id = base_id = f"{created_at:%Y%m%d-%H%M%S}-{combined[:8]}"
+            # The same content can come back within a second (A, B, A); number repeats so ids stay unique
+            taken = {backup['id'] for backup in backups}
+            sequence = 1
+            while backup_id in taken:
+                sequence += 1
+                backup_id = f"{base_id}-{sequence}"
+            backup = {
+                'id': backup_id,
+                'created_at': created_at.isoformat(timespec='seconds'),
+                'reason': reason,
+                'objects': objects,
+                'size': size
+            }
+            backups.append(backup)
+            removed = backups[:-self.keep] if self.keep else []
+            index['backups'] = backups[len(removed):]
+            self._write_index(index)
+            if removed:
+                self._collect_garbage(index)
+
+        logger.info(f"Created backup {backup['id']} ({reason})")
+        return backup, True
+
+    def _collect_garbage(self, index):
+        """Delete objects no retained backup refers to"""
+        used = {digest for backup in index['backups'] for digest in backup['objects'].values()}
+        for filename in os.listdir(self.objects_dir):
+            if filename.endswith('.json.gz') and filename[:-len('.json.gz')] not in used:
+                os.remove(os.path.join(self.objects_dir, filename))
+
+    def list(self):
+        """Backups, newest first"""
+        with self._lock:
+            return list(reversed(self._read_index()['backups']))
+
+    def get(self, backup_id):
+        for backup in self.list():
+            if backup['id'] == backup_id:
+                return backup
+        raise ValueError(f"Unknown backup: {backup_id}")
+
+    def load(self, backup_id):
+        """{document name: data} stored in a backup, checked against the object digests"""
+        backup = self.get(backup_id)
+        documents = {}
+        for name, digest in backup['objects'].items():
+            with open(self._object_path(digest), 'rb') as f:
+                payload = gzip.decompress(f.read())
+            if hashlib.sha256(payload).hexdigest() != digest:
+                raise ValueError(f"Backup {backup_id} is corrupt: {name} does not match its digest")
+            documents[name] = json.loads(payload)
+        return documents
+
+    def restore(self, backup_id):
+        """Replace the live data with a backup; the current data is backed up first"""
+        backup = self.get(backup_id)
+        documents = self.load(backup_id)
+        self.create(reason=f'before restoring {backup_id}')
+        for name, file_path in self._documents().items():
+            self.inventory_manager.save_json(documents[name], file_path)
+        logger.info(f"Restored backup {backup_id}")
+        return backup
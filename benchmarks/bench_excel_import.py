@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark InventoryManager.import_from_excel on synthetic workbooks
+Usage: python benchmarks/bench_excel_import.py --rows 10000 100000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from inventory_manager import InventoryManager
+
+MAKES = ['Ford', 'Lincoln', 'Jeep']
+CATEGORIES = ['SUV', 'Truck', 'Sedan', 'Coupe']
+FEATURES = ['Navigation', 'Sunroof', 'Tow Package', 'AWD', 'Leather Seats', 'Apple CarPlay']
+PART_CATEGORIES = ['Engine', 'Transmission', 'Brakes', 'Suspension', 'Electrical']
+
+
+def write_workbook(path, rows, seed=0):
+    """Write a workbook with `rows` vehicle rows split across the make sheets plus as many part rows"""
+    rng = random.Random(seed)
+    models_per_make = max(1, rows // 300)
+
+    with pd.ExcelWriter(path, engine='openpyxl') as writer:
+        for make in MAKES:
+            vehicles = []
+            for _ in range(rows // len(MAKES)):
+                model = f'{make} Model {rng.randrange(models_per_make)}'
+                vehicles.append({
+                    'Make': make,
+                    'Model': model,
+                    'Year': rng.randint(1990, 2025),
+                    'Category': rng.choice(CATEGORIES),
+                    'Description': f'{make} {model}',
+                    'Features': ', '.join(rng.sample(FEATURES, 3)),
+                    'Price_Range': '$30,000 - $50,000',
+                    'Status': 'Available'
+                })
+            pd.DataFrame(vehicles).to_excel(writer, sheet_name=f'{make}_Vehicles', index=False)
+
+        parts = []
+        for _ in range(rows):
+            make = rng.choice(MAKES)
+            parts.append({
+                'Make': make,
+                'Model': f'{make} Model {rng.randrange(models_per_make)}',
+                'Category': rng.choice(PART_CATEGORIES),
+                'Part': f'Part {rng.randrange(rows // 10 or 1)}',
+                'Status': 'Available',
+                'Price': '',
+                'Notes': ''
+            })
+        pd.DataFrame(parts).to_excel(writer, sheet_name='Parts', index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Excel import')
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000], help='Vehicle rows per workbook')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per size (best is reported)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            excel_file = os.path.join(tmp, f'inventory_{rows}.xlsx')
+            write_workbook(excel_file, rows)
+
+            manager = InventoryManager(excel_file=excel_file, json_dir=os.path.join(tmp, f'data_{rows}'))
+            # Keep import backups out of the working directory
+            manager.create_backup = lambda: None
+
+            timings = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                if not manager.import_from_excel():
+                    raise SystemExit(f'Import failed for {rows} rows')
+                timings.append(time.perf_counter() - started)
+
+            print(f'{rows:>8} rows: best {min(timings):.3f}s  mean {sum(timings) / len(timings):.3f}s')
+
+
+if __name__ == '__main__':
+    main()
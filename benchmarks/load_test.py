@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Load tester for the API and webhook routes
+Replays a recorded JSONL trace, or a weighted synthetic mix of /api/* and
+/webhook/* calls, with concurrent clients. Reports p50/p95/p99 latency,
+throughput and error rate per route.
+
+Usage:
+    python benchmarks/load_test.py --requests 5000 --concurrency 16
+    python benchmarks/load_test.py --trace trace.jsonl --mode process --concurrency 8 --output load.json
+    python benchmarks/load_test.py --url http://127.0.0.1:5001 --concurrency 32
+
+Trace lines are JSON objects with "method", "path" (including any query
+string) and optionally "json" (request body), "route" (label used in the
+report) and "ts" (seconds since the start of the capture, honoured with
+--speed).
+"""
+
+import argparse
+import http.client
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.parse import quote, urlsplit
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# (weight, route label) of the synthetic mix, roughly the voice agent's traffic
+SYNTHETIC_MIX = [
+    (30, 'POST /webhook/check-vehicle'),
+    (15, 'POST /webhook/search-vehicles'),
+    (10, 'POST /webhook/search-parts'),
+    (5, 'POST /webhook/business-info'),
+    (10, 'GET /api/inventory/<make>/<model>'),
+    (8, 'GET /api/search'),
+    (5, 'GET /api/vehicles'),
+    (5, 'GET /api/parts/search'),
+    (4, 'GET /api/parts/<make>/<model>'),
+    (3, 'GET /api/inventory/<make>'),
+    (3, 'GET /api/business-info'),
+    (2, 'GET /api/inventory')
+]
+
+# Public, API and webhook route templates of app/main.py used to label trace
+# entries; kept static so labelling never imports (and starts) the app
+ROUTE_TEMPLATES = [
+    ('GET', '/'),
+    ('GET', '/ford'),
+    ('GET', '/lincoln'),
+    ('GET', '/jeep'),
+    ('GET', '/model/<make>/<model_name>'),
+    ('GET', '/services'),
+    ('GET', '/api/inventory'),
+    ('GET', '/api/inventory/<make>'),
+    ('GET', '/api/inventory/<make>/<model>'),
+    ('GET', '/api/search'),
+    ('GET', '/api/vehicles'),
+    ('GET', '/api/parts'),
+    ('GET', '/api/parts/search'),
+    ('GET', '/api/parts/<make>'),
+    ('GET', '/api/parts/<make>/<model>'),
+    ('GET', '/api/business-info'),
+    ('GET', '/api/data-version'),
+    ('GET', '/metrics'),
+    ('POST', '/webhook/check-vehicle'),
+    ('POST', '/webhook/business-info'),
+    ('POST', '/webhook/search-vehicles'),
+    ('POST', '/webhook/search-parts'),
+    ('POST', '/webhook/batch'),
+    ('POST', '/webhook/get-inventory')
+]
+
+SEARCH_TERMS = ['suv', 'truck', 'sunroof', 'tow package', 'awd', 'navigation', 'sedan', 'leather']
+PART_TERMS = ['brake rotors', 'oil filter', 'spark plugs', 'clutch kit', 'battery', 'struts', 'air filtr']
+
+
+def load_trace(path):
+    requests = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line)
+            requests.append({
+                'method': entry.get('method', 'GET').upper(),
+                'path': entry['path'],
+                'json': entry.get('json'),
+                'route': entry.get('route'),
+                'ts': entry.get('ts')
+            })
+    return requests
+
+
+def fetch_json(base_url, path):
+    url = urlsplit(base_url)
+    connection = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=30)
+    try:
+        connection.request('GET', path)
+        response = connection.getresponse()
+        return json.loads(response.read())
+    finally:
+        connection.close()
+
+
+def synthetic_requests(base_url, count, seed=0):
+    """Weighted random requests built from the inventory the server is serving"""
+    rng = random.Random(seed)
+    inventory = fetch_json(base_url, '/api/inventory?format=compact')
+    models = [(make, model) for make, make_models in inventory.items() for model in make_models]
+    if not models:
+        raise SystemExit('The server has no inventory to build requests from')
+    weights = [weight for weight, _ in SYNTHETIC_MIX]
+    routes = [route for _, route in SYNTHETIC_MIX]
+
+    requests = []
+    for route in rng.choices(routes, weights, k=count):
+        make, model = rng.choice(models)
+        method = route.split(' ', 1)[0]
+        body = None
+        if route == 'POST /webhook/check-vehicle':
+            # Voice input arrives lower-cased and sometimes without the make
+            body = {'make': make.lower() if rng.random() < 0.7 else None, 'model': model.lower()}
+            path = '/webhook/check-vehicle'
+        elif route == 'POST /webhook/search-vehicles':
+            body = {'query': rng.choice(SEARCH_TERMS + [make.lower(), model.lower()])}
+            path = '/webhook/search-vehicles'
+        elif route == 'POST /webhook/search-parts':
+            body = {'query': rng.choice(PART_TERMS), 'make': make}
+            path = '/webhook/search-parts'
+        elif route == 'POST /webhook/business-info':
+            body = {}
+            path = '/webhook/business-info'
+        elif route == 'GET /api/inventory/<make>/<model>':
+            path = f'/api/inventory/{quote(make)}/{quote(model)}'
+        elif route == 'GET /api/search':
+            path = f'/api/search?q={quote(rng.choice(SEARCH_TERMS))}'
+        elif route == 'GET /api/vehicles':
+            path = f'/api/vehicles?make={quote(make)}&year_min={rng.randint(1995, 2020)}&limit=20'
+        elif route == 'GET /api/parts/search':
+            path = f'/api/parts/search?q={quote(rng.choice(PART_TERMS))}&limit=10'
+        elif route == 'GET /api/parts/<make>/<model>':
+            path = f'/api/parts/{quote(make)}/{quote(model)}'
+        elif route == 'GET /api/inventory/<make>':
+            path = f'/api/inventory/{quote(make)}'
+        elif route == 'GET /api/business-info':
+            path = '/api/business-info'
+        else:
+            path = '/api/inventory'
+        requests.append({'method': method, 'path': path, 'json': body, 'route': route, 'ts': None})
+    return requests
+
+
+def route_labeler(templates=ROUTE_TEMPLATES):
+    """Function mapping (method, path) to a route template from `templates`
+
+    Paths that match no template (or all paths, without werkzeug) are
+    labelled with the path itself, query string removed.
+    """
+    def fallback(method, path):
+        return f"{method} {path.split('?', 1)[0]}"
+
+    try:
+        from werkzeug.exceptions import HTTPException
+        from werkzeug.routing import Map, Rule
+    except ImportError:
+        return fallback
+    adapter = Map([Rule(rule, methods=[method]) for method, rule in templates]).bind('localhost')
+
+    def label(method, path):
+        try:
+            rule, _ = adapter.match(path.split('?', 1)[0], method, return_rule=True)
+            return f'{method} {rule.rule}'
+        except HTTPException:
+            return fallback(method, path)
+    return label
+
+
+def run_client(base_url, requests, timeout=30, speed=None, started=None):
+    """Send requests over one keep-alive connection; returns [(route, seconds, status)]
+
+    status is 0 when the request failed at the connection level.
+    """
+    url = urlsplit(base_url)
+    connection = None
+    samples = []
+    for request in requests:
+        if speed and request['ts'] is not None and started is not None:
+            delay = started + request['ts'] / speed - time.time()
+            if delay > 0:
+                time.sleep(delay)
+
+        body = None
+        headers = {'Accept-Encoding': 'gzip'}
+        if request['json'] is not None:
+            body = json.dumps(request['json'])
+            headers['Content-Type'] = 'application/json'
+
+        begin = time.perf_counter()
+        try:
+            if connection is None:
+                connection = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=timeout)
+            connection.request(request['method'], request['path'], body=body, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            status = response.status
+            if response.getheader('Connection', '').lower() == 'close':
+                connection.close()
+                connection = None
+        except (OSError, http.client.HTTPException):
+            status = 0
+            if connection is not None:
+                connection.close()
+            connection = None
+        samples.append((request['route'], time.perf_counter() - begin, status))
+
+    if connection is not None:
+        connection.close()
+    return samples
+
+
+def run_load(base_url, requests, concurrency, mode='thread', speed=None):
+    """Spread requests over `concurrency` clients; returns (samples, wall seconds)"""
+    chunks = [requests[i::concurrency] for i in range(concurrency)]
+    chunks = [chunk for chunk in chunks if chunk]
+    executor_class = ProcessPoolExecutor if mode == 'process' else ThreadPoolExecutor
+    started = time.time()
+    begin = time.perf_counter()
+    with executor_class(max_workers=len(chunks)) as executor:
+        futures = [executor.submit(run_client, base_url, chunk, 30, speed, started) for chunk in chunks]
+        samples = [sample for future in futures for sample in future.result()]
+    return samples, time.perf_counter() - begin
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    # Rounded before ceil so float noise (0.7 * 10 == 7.000000000000001) does not skip a rank
+    rank = math.ceil(round(fraction * len(sorted_values), 9))
+    index = max(0, min(len(sorted_values) - 1, rank - 1))
+    return sorted_values[index]
+
+
+def summarize(samples, elapsed):
+    """Per-route and overall latency percentiles (ms), throughput and error rates"""
+    by_route = {}
+    for route, seconds, status in samples:
+        by_route.setdefault(route, []).append((seconds, status))
+    by_route['ALL'] = [(seconds, status) for _, seconds, status in samples]
+
+    report = {}
+    for route, values in by_route.items():
+        latencies = sorted(seconds for seconds, _ in values)
+        statuses = {}
+        for _, status in values:
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+        errors = sum(1 for _, status in values if status == 0 or status >= 500)
+        report[route] = {
+            'requests': len(values),
+            'throughput_rps': round(len(values) / elapsed, 2) if elapsed else 0.0,
+            'error_rate': round(errors / len(values), 4),
+            'client_errors': sum(1 for _, status in values if 400 <= status < 500),
+            'statuses': statuses,
+            'p50_ms': round(percentile(latencies, 0.50) * 1000, 3),
+            'p95_ms': round(percentile(latencies, 0.95) * 1000, 3),
+            'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+            'max_ms': round(latencies[-1] * 1000, 3),
+            'mean_ms': round(sum(latencies) / len(latencies) * 1000, 3)
+        }
+    return report
+
+
+def start_server(port, command=None):
+    """Start app.main on port in a subprocess and wait until it answers"""
+    env = dict(os.environ, PORT=str(port))
+    if command is None:
+        command = [sys.executable, os.path.join('app', 'main.py')]
+    process = subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    base_url = f'http://127.0.0.1:{port}'
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f'Server exited with status {process.returncode}')
+        try:
+            fetch_json(base_url, '/api/data-version')
+            return process, base_url
+        except (OSError, http.client.HTTPException, ValueError):
+            time.sleep(0.2)
+    process.terminate()
+    raise SystemExit('Server did not start within 30 seconds')
+
+
+def print_report(report, elapsed):
+    print(f"{'route':<44} {'reqs':>7} {'rps':>9} {'err%':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for route in sorted(report, key=lambda route: (route == 'ALL', route)):
+        row = report[route]
+        print(f"{route:<44} {row['requests']:>7} {row['throughput_rps']:>9.1f} {row['error_rate'] * 100:>5.1f}% "
+              f"{row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f} {row['p99_ms']:>9.2f}")
+    print(f'{report["ALL"]["requests"]} requests in {elapsed:.2f}s')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay traces or a synthetic request mix against the app')
+    parser.add_argument('--url', help='Base URL of a running server (default: start app/main.py locally)')
+    parser.add_argument('--port', type=int, default=5099, help='Port for the locally started server')
+    parser.add_argument('--server-command', help='Command to start the server instead of python app/main.py '
+                                                 '(run from the repository root with PORT set)')
+    parser.add_argument('--trace', help='JSONL trace to replay (default: synthetic mix)')
+    parser.add_argument('--requests', type=int, default=2000, help='Synthetic requests to send')
+    parser.add_argument('--loops', type=int, default=1, help='Times to replay the trace')
+    parser.add_argument('--speed', type=float, help="Honour trace 'ts' offsets at this speed-up factor")
+    parser.add_argument('--concurrency', type=int, default=8, help='Concurrent clients')
+    parser.add_argument('--mode', choices=('thread', 'process'), default='thread', help='Run clients as threads or processes')
+    parser.add_argument('--warmup', type=int, default=50, help='Untimed requests sent first')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for the synthetic mix')
+    parser.add_argument('--output', help='Write the report as JSON here')
+    args = parser.parse_args()
+
+    process = None
+    base_url = args.url
+    if base_url is None:
+        command = args.server_command.split() if args.server_command else None
+        process, base_url = start_server(args.port, command)
+
+    try:
+        if args.trace:
+            requests = load_trace(args.trace) * args.loops
+            label = route_labeler()
+            for request in requests:
+                if not request['route']:
+                    request['route'] = label(request['method'], request['path'])
+        else:
+            requests = synthetic_requests(base_url, args.requests, args.seed)
+
+        if args.warmup:
+            run_client(base_url, [dict(request, ts=None) for request in requests[:args.warmup]])
+
+        samples, elapsed = run_load(base_url, requests, args.concurrency, args.mode, args.speed)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    report = summarize(samples, elapsed)
+    print_report(report, elapsed)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'base_url': base_url,
+                'concurrency': args.concurrency,
+                'mode': args.mode,
+                'elapsed_seconds': round(elapsed, 3),
+                'routes': report
+            }, f, indent=2)
+        print(f'Wrote report to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
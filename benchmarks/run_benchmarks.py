@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark suite on a synthetic catalog
+Times Excel import/export, JSON load/save, index builds and searches, the
+stats aggregations and every API route, writes the results as JSON and
+optionally compares them against a stored baseline.
+
+Usage:
+    python benchmarks/run_benchmarks.py --makes 10 --parts 100000 --output results.json
+    python benchmarks/run_benchmarks.py --baseline results.json --threshold 0.2
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'app'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_catalog import write_catalog
+
+GROUPS = ('excel', 'storage', 'indexes', 'search', 'stats', 'routes')
+
+SEARCH_QUERIES = ['ford', 'sunroof', 'suv', 'tow package', 'ar', 'zzz', '2020']
+PART_QUERIES = ['brake rotors', 'oil filtr', 'clutch', 'heavy duty struts', 'battery 3']
+
+
+def measure(fn, repeat, number=1, setup=None):
+    """Time fn() `number` times per run over `repeat` runs; seconds per call"""
+    runs = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        runs.append((time.perf_counter() - started) / number)
+    return {
+        'best': min(runs),
+        'median': statistics.median(runs),
+        'mean': statistics.mean(runs),
+        'runs': repeat,
+        'calls_per_run': number
+    }
+
+
+def bench_excel(manager, repeat):
+    # Keep backups made by imports out of the timings
+    manager.create_backup = lambda: None
+    results = {}
+    results['excel.export'] = measure(manager.export_to_excel, repeat)
+    results['excel.export_stream'] = measure(lambda: manager.export_to_excel(stream=True), repeat)
+    results['excel.import_full'] = measure(manager.import_from_excel, repeat)
+    results['excel.import_unchanged'] = measure(manager.import_changes_from_excel, repeat)
+    return results
+
+
+def bench_storage(manager, repeat):
+    results = {}
+    for name, file_path in (('inventory', manager.inventory_file), ('parts', manager.parts_file)):
+        data = manager.load_json(file_path)
+        results[f'storage.load_json.{name}'] = measure(lambda: manager.load_json(file_path), repeat)
+        results[f'storage.save_json.{name}'] = measure(lambda: manager.save_json(data, file_path), repeat)
+    return results
+
+
+def bench_indexes(snapshot, repeat):
+    from facet_index import FacetIndex
+    from part_index import PartIndex
+    from search_index import SearchIndex
+    from vehicle_resolver import VehicleResolver
+
+    return {
+        'indexes.search_index': measure(lambda: SearchIndex(snapshot.inventory), repeat),
+        'indexes.facet_index': measure(lambda: FacetIndex(snapshot.inventory), repeat),
+        'indexes.vehicle_resolver': measure(lambda: VehicleResolver(snapshot.inventory), repeat),
+        'indexes.part_index': measure(lambda: PartIndex(snapshot.parts_catalog), repeat)
+    }
+
+
+def bench_search(snapshot, repeat, number):
+    make, models = next(iter(snapshot.inventory.items()))
+    model = next(iter(models))
+
+    def search_all():
+        for query in SEARCH_QUERIES:
+            snapshot.search_index.search(query)
+
+    def search_ranked():
+        for query in SEARCH_QUERIES:
+            snapshot.search_index.search(query, match='all', ranked=True, limit=10)
+
+    def facets():
+        bits = snapshot.facet_index.query(categories=['SUV'], year_min=2010, year_max=2020, price_max=60000)
+        snapshot.facet_index.facet_counts(bits)
+
+    def parts():
+        for query in PART_QUERIES:
+            snapshot.part_index.search(query, limit=10)
+
+    def resolve():
+        snapshot.vehicle_resolver.resolve(make.lower(), model.lower())
+        snapshot.vehicle_resolver.resolve(None, model[:-1])
+
+    return {
+        'search.vehicles': measure(search_all, repeat, number),
+        'search.vehicles_ranked': measure(search_ranked, repeat, number),
+        'search.facets': measure(facets, repeat, number),
+        'search.parts': measure(parts, repeat, number),
+        'search.resolve_vehicle': measure(resolve, repeat, number)
+    }
+
+
+def route_requests(snapshot):
+    """(name, method, path, json body, admin) for every API route"""
+    make, models = next(iter(snapshot.inventory.items()))
+    model = next(iter(models))
+    return [
+        ('GET /api/inventory', 'GET', '/api/inventory', None, False),
+        ('GET /api/inventory?format=compact', 'GET', '/api/inventory?format=compact', None, False),
+        ('GET /api/inventory/<make>', 'GET', f'/api/inventory/{make}', None, False),
+        ('GET /api/inventory/<make>/<model>', 'GET', f'/api/inventory/{make}/{model}', None, False),
+        ('GET /api/search', 'GET', '/api/search?q=suv', None, False),
+        ('GET /api/vehicles', 'GET', '/api/vehicles?category=SUV&year_min=2010&limit=20', None, False),
+        ('GET /api/parts', 'GET', '/api/parts', None, False),
+        ('GET /api/parts/<make>', 'GET', f'/api/parts/{make}', None, False),
+        ('GET /api/parts/<make>/<model>', 'GET', f'/api/parts/{make}/{model}', None, False),
+        ('GET /api/parts/search', 'GET', '/api/parts/search?q=brake+rotors&limit=10', None, False),
+        ('GET /api/business-info', 'GET', '/api/business-info', None, False),
+        ('GET /api/data-version', 'GET', '/api/data-version', None, False),
+        ('GET /metrics', 'GET', '/metrics', None, False),
+        ('POST /webhook/check-vehicle', 'POST', '/webhook/check-vehicle', {'make': make, 'model': model}, False),
+        ('POST /webhook/business-info', 'POST', '/webhook/business-info', {}, False),
+        ('POST /webhook/search-vehicles', 'POST', '/webhook/search-vehicles', {'query': 'suv', 'limit': 10}, False),
+        ('POST /webhook/search-parts', 'POST', '/webhook/search-parts', {'query': 'oil filter', 'make': make}, False),
+        ('GET /admin/stats', 'GET', '/admin/stats', None, True)
+    ]
+
+
+def bench_routes(main, repeat, number, stats_only=False):
+    client = main.app.test_client()
+    with client.session_transaction() as session:
+        session['admin_logged_in'] = True
+
+    results = {}
+    snapshot = main.snapshot_store.current()
+    for name, method, path, body, admin in route_requests(snapshot):
+        if stats_only != admin:
+            continue
+
+        def call():
+            response = client.open(path, method=method, json=body)
+            if response.status_code >= 400:
+                raise RuntimeError(f'{name} returned {response.status_code}')
+
+        # Cold: response cache emptied before every call; warm: served from the cache when the route uses it
+        results[f'routes.{name}'] = measure(lambda: (main.response_cache.clear(), call()), repeat, number)
+        if not admin:
+            results[f'routes.{name} (cached)'] = measure(call, repeat, number)
+    return results
+
+
+def run_groups(args):
+    import main
+
+    results = {}
+    manager = main.inventory_manager
+    groups = [group for group in GROUPS if group in args.only and group not in args.skip]
+    if 'storage' in groups:
+        results.update(bench_storage(manager, args.repeat))
+
+    snapshot = main.reload_data(force=True)
+    if 'indexes' in groups:
+        results.update(bench_indexes(snapshot, args.repeat))
+    if 'search' in groups:
+        results.update(bench_search(snapshot, args.repeat, args.number))
+    if 'stats' in groups:
+        results.update(bench_routes(main, args.repeat, args.number, stats_only=True))
+    if 'routes' in groups:
+        results.update(bench_routes(main, args.repeat, args.number))
+    # Last: the workbook only carries the Ford/Lincoln/Jeep sheets, so importing it drops other makes
+    if 'excel' in groups:
+        results.update(bench_excel(manager, args.repeat))
+    return results
+
+
+def run(args):
+    results = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        write_catalog(os.path.join(tmp, 'data'), args.makes, args.models_per_make, args.parts, args.seed)
+        # app.main reads data/ relative to the working directory
+        os.chdir(tmp)
+        try:
+            results.update(run_groups(args))
+        finally:
+            os.chdir(cwd)
+
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'scale': {
+            'makes': args.makes,
+            'models_per_make': args.models_per_make,
+            'parts': args.parts,
+            'seed': args.seed
+        },
+        'results': results
+    }
+
+
+def compare(report, baseline, threshold):
+    """Print current vs baseline medians; returns the names that slowed down by more than threshold"""
+    if baseline.get('scale') != report['scale']:
+        print(f"Warning: baseline scale {baseline.get('scale')} differs from {report['scale']}")
+
+    regressions = []
+    print(f"{'benchmark':<52} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, result in report['results'].items():
+        previous = baseline.get('results', {}).get(name)
+        if previous is None:
+            print(f"{name:<52} {'-':>12} {result['median'] * 1000:>10.3f}ms {'new':>8}")
+            continue
+        change = result['median'] / previous['median'] - 1 if previous['median'] else 0.0
+        flag = ''
+        if change > threshold:
+            regressions.append(name)
+            flag = '  SLOWER'
+        print(f"{name:<52} {previous['median'] * 1000:>10.3f}ms {result['median'] * 1000:>10.3f}ms "
+              f"{change:>+7.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the benchmark suite on a synthetic catalog')
+    parser.add_argument('--makes', type=int, default=10, help='Number of makes')
+    parser.add_argument('--models-per-make', type=int, default=20, help='Models per make')
+    parser.add_argument('--parts', type=int, default=100000, help='Approximate total number of parts')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for the catalog')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per benchmark (median is compared)')
+    parser.add_argument('--number', type=int, default=20, help='Calls per run for search and route benchmarks')
+    parser.add_argument('--only', nargs='+', choices=GROUPS, default=list(GROUPS), help='Benchmark groups to run')
+    parser.add_argument('--skip', nargs='+', choices=GROUPS, default=[], help='Benchmark groups to skip')
+    parser.add_argument('--output', help='Write results JSON here')
+    parser.add_argument('--baseline', help='Results JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='Allowed slowdown of the median before a benchmark counts as a regression')
+    args = parser.parse_args()
+
+    report = run(args)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f'Wrote {len(report["results"])} results to {args.output}')
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f'{len(regressions)} benchmark(s) slower than baseline by more than {args.threshold:.0%}')
+            sys.exit(1)
+    elif not args.output:
+        for name, result in report['results'].items():
+            print(f"{name:<52} median {result['median'] * 1000:>10.3f}ms  best {result['best'] * 1000:>10.3f}ms")
+
+
+if __name__ == '__main__':
+    main()
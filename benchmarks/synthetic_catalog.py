@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Synthetic inventory and parts catalogs at configurable scale
+Usage: python benchmarks/synthetic_catalog.py --makes 100 --models-per-make 20 --parts 1000000 --out /tmp/data
+"""
+
+import argparse
+import json
+import os
+import random
+
+CATEGORIES = ['SUV', 'Truck', 'Sedan', 'Coupe', 'Crossover', 'Van']
+FEATURES = ['Navigation', 'Sunroof', 'Tow Package', 'AWD', 'Leather Seats', 'Apple CarPlay',
+            'Heated Seats', 'Third Row', 'Adaptive Cruise', 'Blind Spot Monitor']
+STATUSES = ['Available', 'Available', 'Available', 'Limited', 'Sold Out']
+PRICE_RANGES = ['Under $30,000', '$30,000 - $50,000', '$45k+', '$50,000 - $80,000', '$80,000 - $100,000']
+PART_CATEGORIES = ['Engine', 'Transmission', 'Brakes', 'Suspension', 'Electrical']
+PART_PREFIXES = ['Front', 'Rear', 'Upper', 'Lower', 'Heavy Duty', 'Performance', 'OEM', 'High-Flow', 'Ceramic']
+PART_NAMES = {
+    'Engine': ['Air Filter', 'Oil Filter', 'Spark Plugs', 'Fuel Filter', 'Timing Belt', 'Water Pump', 'Gasket Set'],
+    'Transmission': ['Transmission Fluid', 'Transmission Filter', 'Clutch Kit', 'Flywheel', 'Shift Solenoid'],
+    'Brakes': ['Brake Pads', 'Brake Rotors', 'Brake Fluid', 'Brake Lines', 'Caliper', 'Master Cylinder'],
+    'Suspension': ['Shock Absorbers', 'Struts', 'Springs', 'Ball Joints', 'Control Arm', 'Sway Bar Link'],
+    'Electrical': ['Battery', 'Alternator', 'Starter', 'Headlight Bulb', 'Fuse Kit', 'Ignition Coil']
+}
+SERVICES = {
+    'Maintenance': ['Oil Change Service', 'Brake Inspection', 'Tire Rotation', 'Multi-Point Inspection'],
+    'Repairs': ['Engine Diagnostics', 'Transmission Repair', 'Brake System Repair']
+}
+# The Excel workbook has sheets for these makes only, so they come first
+WORKBOOK_MAKES = ['Ford', 'Lincoln', 'Jeep']
+SYLLABLES = ['ar', 'bo', 'ca', 'del', 'ex', 'for', 'gra', 'hal', 'in', 'jet', 'ka', 'lo', 'mar',
+             'no', 'or', 'pe', 'quo', 'ra', 'sta', 'tor', 'ul', 'ven', 'wa', 'xo', 'ze']
+
+
+def _name(rng, syllables=3):
+    return ''.join(rng.choice(SYLLABLES) for _ in range(syllables)).capitalize()
+
+
+def generate_inventory(makes=10, models_per_make=20, seed=0):
+    """Inventory in the data/inventory.json layout (make -> model -> data, years as ranges)"""
+    rng = random.Random(seed)
+    inventory = {}
+    while len(inventory) < makes:
+        make = WORKBOOK_MAKES[len(inventory)] if len(inventory) < len(WORKBOOK_MAKES) else _name(rng, 2)
+        if make in inventory:
+            continue
+        models = {}
+        while len(models) < models_per_make:
+            model = rng.choice([_name(rng), f'{_name(rng, 1).upper()}-{rng.randrange(100, 999)}', f'{_name(rng)} {_name(rng, 2)}'])
+            start = rng.randint(1980, 2020)
+            ranges = [[start, min(2025, start + rng.randint(0, 15))]]
+            if rng.random() < 0.3 and ranges[0][1] < 2022:
+                ranges.append([ranges[0][1] + 2, 2025])
+            models[model] = {
+                'category': rng.choice(CATEGORIES),
+                'description': f'{ranges[-1][1]} {make} {model}',
+                'features': rng.sample(FEATURES, rng.randint(0, 4)),
+                'price_range': rng.choice(PRICE_RANGES),
+                'status': rng.choice(STATUSES),
+                'years': ranges
+            }
+        inventory[make] = models
+    return inventory
+
+
+def generate_parts_catalog(inventory, parts=100000, seed=0):
+    """Parts catalog in the data/parts_catalog.json layout with about `parts` entries in total"""
+    rng = random.Random(seed)
+    models = [(make, model) for make, make_models in inventory.items() for model in make_models]
+    per_model = max(1, parts // max(1, len(models)))
+
+    catalog = {}
+    for make, model in models:
+        categories = {}
+        for i in range(per_model):
+            category = PART_CATEGORIES[i % len(PART_CATEGORIES)]
+            name = rng.choice(PART_NAMES[category])
+            if i >= len(PART_CATEGORIES):
+                name = f'{rng.choice(PART_PREFIXES)} {name} {rng.randrange(per_model)}'
+            categories.setdefault(category, set()).add(name)
+        catalog.setdefault(make, {})[model] = {category: sorted(names) for category, names in categories.items()}
+    catalog['Services'] = SERVICES
+    return catalog
+
+
+def write_catalog(json_dir, makes=10, models_per_make=20, parts=100000, seed=0):
+    """Write inventory.json and parts_catalog.json to json_dir; returns (inventory, parts_catalog)"""
+    inventory = generate_inventory(makes, models_per_make, seed)
+    parts_catalog = generate_parts_catalog(inventory, parts, seed)
+    os.makedirs(json_dir, exist_ok=True)
+    with open(os.path.join(json_dir, 'inventory.json'), 'w') as f:
+        json.dump(inventory, f, indent=2)
+    with open(os.path.join(json_dir, 'parts_catalog.json'), 'w') as f:
+        json.dump(parts_catalog, f, indent=2)
+    return inventory, parts_catalog
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic inventory and parts catalog')
+    parser.add_argument('--makes', type=int, default=10, help='Number of makes')
+    parser.add_argument('--models-per-make', type=int, default=20, help='Models per make')
+    parser.add_argument('--parts', type=int, default=100000, help='Approximate total number of parts')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    parser.add_argument('--out', required=True, help='Directory for inventory.json and parts_catalog.json')
+    args = parser.parse_args()
+
+    inventory, parts_catalog = write_catalog(args.out, args.makes, args.models_per_make, args.parts, args.seed)
+    total_parts = sum(len(parts) for make, models in parts_catalog.items() if make != 'Services'
+                      for categories in models.values() for parts in categories.values())
+    print(f'Wrote {len(inventory)} makes, {sum(len(m) for m in inventory.values())} models, '
+          f'{total_parts} parts to {args.out}')
+
+
+if __name__ == '__main__':
+    main()
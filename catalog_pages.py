@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Cursor pagination over the inventory and parts catalog
+Models are paged in (make, model) order; a cursor names the last model of
+the previous page, so pages stay consistent when models are added or
+removed between requests
+"""
+
+import base64
+import json
+from bisect import bisect_right
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(key):
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    """(make, model) from a cursor; ValueError if it was not produced by encode_cursor"""
+    try:
+        key = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid 'cursor'")
+    if not (isinstance(key, list) and len(key) == 2 and all(isinstance(part, str) for part in key)):
+        raise ValueError("Invalid 'cursor'")
+    return tuple(key)
+
+
+def parse_fields(value):
+    """Set of requested field names from a comma separated ?fields= value, or None for all fields"""
+    if value is None:
+        return None
+    fields = {field.strip() for field in value.split(',') if field.strip()}
+    return fields or None
+
+
+class CatalogPages:
+    def __init__(self, document):
+        self.document = document
+        self.keys = sorted(
+            (make, model)
+            for make, models in document.items() if isinstance(models, dict)
+            for model in models
+        )
+
+    def __len__(self):
+        return len(self.keys)
+
+    def page(self, cursor=None, limit=None):
+        """Keys after cursor (at most limit of them) and the cursor of the next page, None on the last page"""
+        start = bisect_right(self.keys, cursor) if cursor is not None else 0
+        end = len(self.keys) if limit is None else min(len(self.keys), start + limit)
+        keys = self.keys[start:end]
+        next_cursor = encode_cursor(keys[-1]) if keys and end < len(self.keys) else None
+        return keys, next_cursor
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Versioned, immutable snapshots of inventory and parts data
+Each worker process swaps in a new snapshot only when the data files change
+"""
+
+import hashlib
+import os
+import threading
+import time
+from contextlib import contextmanager
+import logging
+
+from catalog_pages import CatalogPages
+from facet_index import FacetIndex
+from part_index import PartIndex
+from search_index import SearchIndex
+from vehicle_resolver import VehicleResolver
+
+logger = logging.getLogger(__name__)
+
+
+def version_for_stamp(stamp):
+    """Short version id shared by every worker that sees the same files"""
+    return hashlib.sha1(repr(stamp).encode('utf-8')).hexdigest()[:12]
+
+
+class DataSnapshot:
+    def __init__(self, stamp, inventory, parts_catalog, generation, previous=None, part_changes=None):
+        self.stamp = stamp
+        self.version = version_for_stamp(stamp)
+        self.generation = generation
+        self.inventory = inventory
+        self.parts_catalog = parts_catalog
+        self.loaded_at = time.time()
+
+        # Derived indexes are built once per snapshot and carried over
+        # from the previous snapshot when their source data is unchanged
+        if previous is not None and previous.inventory is inventory:
+            self.search_index = previous.search_index
+            self.facet_index = previous.facet_index
+            self.vehicle_resolver = previous.vehicle_resolver
+            self.inventory_pages = previous.inventory_pages
+        else:
+            self.search_index = SearchIndex(inventory)
+            self.facet_index = FacetIndex(inventory)
+            self.vehicle_resolver = VehicleResolver(inventory)
+            self.inventory_pages = CatalogPages(inventory)
+
+        if previous is not None and previous.parts_catalog is parts_catalog:
+            self.part_index = previous.part_index
+            self.parts_pages = previous.parts_pages
+        else:
+            if previous is not None and part_changes is not None:
+                self.part_index = previous.part_index.apply_changes(part_changes)
+            else:
+                self.part_index = PartIndex(parts_catalog)
+            self.parts_pages = CatalogPages(parts_catalog)
+
+
+class SnapshotStore:
+    def __init__(self, repository, on_reload=None):
+        self.repository = repository
+        # Called with the load time in seconds after every new snapshot
+        self.on_reload = on_reload
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._holds = 0
+        # Refresh requested while reloads were held: None, 'changed' or 'force'
+        self._pending = None
+        self.reloads = 0
+        self.checks = 0
+        self.last_reload_seconds = 0.0
+
+    def current(self):
+        """Most recently loaded snapshot, loading one if needed"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self.refresh()
+        return snapshot
+
+    def refresh(self, force=False, wait=True):
+        """Swap in a new snapshot if the data files changed (or when forced)
+
+        With wait=False the current snapshot is returned while another
+        thread is loading the next one, so requests never queue behind a
+        reload. While reloads are held every caller gets the current
+        snapshot and the refresh runs when the last hold is released.
+        """
+        self.checks += 1
+        if force:
+            self.repository.invalidate()
+        else:
+            # Fast path without the lock: a few stat calls when nothing changed
+            manager = self.repository.inventory_manager
+            stamp = (manager.file_stamp(manager.inventory_file), manager.file_stamp(manager.parts_file))
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot.stamp == stamp:
+                return snapshot
+            if snapshot is not None and not wait:
+                if not self._lock.acquire(blocking=False):
+                    return snapshot
+                self._lock.release()
+
+        with self._lock:
+            if self._holds and self._snapshot is not None:
+                if force or self._pending is None:
+                    self._pending = 'force' if force else 'changed'
+                return self._snapshot
+
+            started = time.perf_counter()
+            # Fetch again under the lock so a slower thread never swaps in older data
+            inventory_stamp, inventory = self.repository.inventory()
+            parts_stamp, parts_catalog = self.repository.parts()
+            stamp = (inventory_stamp, parts_stamp)
+
+            snapshot = self._snapshot
+            if not force and snapshot is not None and snapshot.stamp == stamp:
+                return snapshot
+
+            part_changes = None
+            if snapshot is not None and not force and snapshot.stamp[1] != parts_stamp:
+                part_changes = self.repository.changes_between(
+                    self.repository.inventory_manager.parts_file, snapshot.stamp[1], parts_stamp)
+
+            self.reloads += 1
+            snapshot = DataSnapshot(stamp, inventory, parts_catalog, self.reloads,
+                                    previous=None if force else snapshot, part_changes=part_changes)
+            self._snapshot = snapshot
+            self.last_reload_seconds = time.perf_counter() - started
+
+        if self.on_reload is not None:
+            self.on_reload(self.last_reload_seconds)
+        logger.info(f"Loaded data version {snapshot.version} in {self.last_reload_seconds * 1000:.1f} ms")
+        return snapshot
+
+    @contextmanager
+    def hold_reloads(self):
+        """Keep serving the current snapshot while a multi-file write is in progress
+
+        Refreshes requested meanwhile (including forced and waiting ones)
+        are deferred and run once when the last hold is released.
+        """
+        with self._lock:
+            self._holds += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._holds -= 1
+                pending = self._pending if not self._holds else None
+                if pending is not None:
+                    self._pending = None
+            if pending is not None:
+                self.refresh(force=pending == 'force')
+
+    def describe(self):
+        """Diagnostics for the snapshot this worker is serving"""
+        snapshot = self.current()
+        return {
+            "pid": os.getpid(),
+            "version": snapshot.version,
+            "generation": snapshot.generation,
+            "loaded_at": snapshot.loaded_at,
+            "reloads": self.reloads,
+            "checks": self.checks,
+            "last_reload_ms": round(self.last_reload_seconds * 1000, 3),
+            "makes": len(snapshot.inventory),
+            "models": len(snapshot.search_index),
+            "part_names": len(snapshot.part_index),
+            "repository": self.repository.stats()
+        }
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Fingerprints for differential Excel imports
+Raw sheet digests come straight from the .xlsx archive (no parsing); content
+digests are computed from parsed sheets with pandas' vectorized row hashing
+"""
+
+import hashlib
+import posixpath
+import zipfile
+import xml.etree.ElementTree as ET
+
+# pandas is imported inside the functions that need it, so importing this module stays cheap
+
+MAIN_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+REL_ID = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id'
+
+
+def _digest(data):
+    return hashlib.sha1(data).hexdigest()
+
+
+def raw_sheet_digests(excel_file):
+    """Return ({sheet_name: digest of its XML part}, digest of the shared strings table)
+
+    Cells holding text only reference the shared strings table, so a sheet is
+    unchanged only if both its own XML and the shared strings are unchanged.
+    """
+    with zipfile.ZipFile(excel_file) as archive:
+        workbook = ET.fromstring(archive.read('xl/workbook.xml'))
+        rels = ET.fromstring(archive.read('xl/_rels/workbook.xml.rels'))
+        targets = {rel.get('Id'): rel.get('Target') for rel in rels.iter(f'{REL_NS}Relationship')}
+
+        digests = {}
+        for sheet in workbook.iter(f'{MAIN_NS}sheet'):
+            target = targets.get(sheet.get(REL_ID))
+            if target is None:
+                continue
+            if target.startswith('/'):
+                part = target.lstrip('/')
+            else:
+                part = posixpath.normpath(posixpath.join('xl', target))
+            digests[sheet.get('name')] = _digest(archive.read(part))
+
+        try:
+            shared_strings = _digest(archive.read('xl/sharedStrings.xml'))
+        except KeyError:
+            shared_strings = None
+
+    return digests, shared_strings
+
+
+def row_hashes(df):
+    """One 64-bit hash per row, computed column-wise by pandas"""
+    import pandas as pd
+    return pd.util.hash_pandas_object(df.astype(object), index=False)
+
+
+def frame_digest(df, hashes=None):
+    """Digest of a whole parsed sheet (column names and every cell)"""
+    if hashes is None:
+        hashes = row_hashes(df)
+    return _digest(repr(list(df.columns)).encode('utf-8') + hashes.to_numpy().tobytes())
+
+
+def group_digests(keys, hashes):
+    """Digest of the rows belonging to each key, in sheet order"""
+    import pandas as pd
+    grouped = pd.Series(hashes.to_numpy(), index=keys.to_numpy()).groupby(level=0, sort=False)
+    return {key: _digest(group.to_numpy().tobytes()) for key, group in grouped}
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Debounced watcher for the Excel workbook
+File system events only mark the workbook as changed; a single worker
+thread waits for a burst of saves to settle, runs the differential import
+and hands the report to a callback (the app uses it to swap in the new
+snapshot). Without watchdog the worker falls back to polling the file.
+
+Only one process watches at a time: the watcher holds an exclusive lock
+file while it watches, and watchers in other worker processes stand by,
+retrying the lock so one of them takes over if the watching process exits.
+"""
+
+import os
+import threading
+import time
+import logging
+
+try:
+    import fcntl
+except ImportError:  # Windows has no flock; every watcher watches
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Seconds without new events before an import starts
+DEBOUNCE_SECONDS = 1.0
+
+# Seconds between checks of the workbook's stamp (catches missed events and works without watchdog)
+POLL_SECONDS = 2.0
+
+
+class _EventHandler:
+    """watchdog handler that forwards events for the workbook without blocking the observer"""
+
+    def __init__(self, watcher):
+        self.watcher = watcher
+
+    def dispatch(self, event):
+        if event.is_directory:
+            return
+        # Excel and most editors save through a temporary file renamed over the workbook
+        self.watcher.notify(event.src_path)
+        dest_path = getattr(event, 'dest_path', None)
+        if dest_path:
+            self.watcher.notify(dest_path)
+
+
+class ExcelWatcher:
+    def __init__(self, inventory_manager, on_import=None, guard=None, debounce=DEBOUNCE_SECONDS,
+                 poll_interval=POLL_SECONDS, lock_file=None):
+        self.inventory_manager = inventory_manager
+        self.excel_file = os.path.abspath(inventory_manager.excel_file)
+        # Held by the one process that watches the workbook
+        self.lock_file = lock_file or os.path.join(inventory_manager.json_dir, 'excel_watcher.lock')
+        self._lock_handle = None
+        # Called on the worker thread with the report of every successful import
+        self.on_import = on_import
+        # Context manager factory wrapped around the import (the app holds snapshot reloads with it)
+        self.guard = guard
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self._changed = threading.Event()
+        self._stopped = threading.Event()
+        self._last_event = 0.0
+        self._stamp = None
+        self._observer = None
+        self._thread = None
+        self.watching = False
+        self.events = 0
+        self.imports = 0
+        self.failures = 0
+        self.last_import_at = None
+        self.last_import_seconds = None
+        self.last_report = None
+        self.last_error = None
+
+    def start(self):
+        """Start the worker thread; it watches now if no other process does, otherwise stands by"""
+        self._stamp = self._file_stamp()
+        if self._acquire():
+            self._watch()
+        else:
+            logger.info(f"Another process is watching {self.excel_file}, standing by")
+        self._thread = threading.Thread(target=self._run, name='excel-watcher', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        self._changed.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+        if self._thread is not None:
+            self._thread.join()
+        if self._lock_handle is not None:
+            self._lock_handle.close()
+            self._lock_handle = None
+        self.watching = False
+
+    def _acquire(self):
+        """Take the watcher lock without waiting; True if this process may watch"""
+        if fcntl is None:
+            return True
+        handle = open(self.lock_file, 'a')
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            handle.close()
+            return False
+        # The lock lasts as long as the handle stays open (released by the OS if the process dies)
+        self._lock_handle = handle
+        return True
+
+    def _watch(self):
+        """Start watching (a watchdog observer when available, polling otherwise)"""
+        try:
+            from watchdog.observers import Observer
+        except ImportError:
+            logger.info("watchdog is not installed, polling the Excel file instead")
+        else:
+            self._observer = Observer()
+            self._observer.schedule(_EventHandler(self), os.path.dirname(self.excel_file), recursive=False)
+            self._observer.daemon = True
+            self._observer.start()
+        self.watching = True
+        logger.info(f"Watching {self.excel_file} for changes")
+
+    def notify(self, path=None):
+        """Record a change to the workbook; returns immediately"""
+        if path is not None and os.path.abspath(path) != self.excel_file:
+            return
+        self.events += 1
+        self._last_event = time.monotonic()
+        self._changed.set()
+
+    def _file_stamp(self):
+        try:
+            stat = os.stat(self.excel_file)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _run(self):
+        while not self.watching:
+            if self._stopped.wait(self.poll_interval):
+                return
+            if self._acquire():
+                logger.info("The watching process is gone, taking over")
+                self._watch()
+
+        while not self._stopped.is_set():
+            if not self._changed.wait(self.poll_interval):
+                if self._file_stamp() != self._stamp:
+                    self.notify()
+                continue
+            self._changed.clear()
+            if self._settle():
+                self._import()
+
+    def _settle(self):
+        """Wait until events stop for `debounce` seconds and the file stops changing; False when stopped"""
+        stamp = self._file_stamp()
+        while not self._stopped.is_set():
+            remaining = self._last_event + self.debounce - time.monotonic()
+            if remaining > 0:
+                self._stopped.wait(remaining)
+                continue
+            current = self._file_stamp()
+            if current == stamp:
+                return True
+            # Still being written without events reaching us; wait another round
+            stamp = current
+            self._last_event = time.monotonic()
+        return False
+
+    def _import(self):
+        stamp = self._file_stamp()
+        if stamp is None or stamp == self._stamp:
+            return
+        # Remember the stamp even if the import fails, so a broken workbook is retried on its next save
+        self._stamp = stamp
+
+        logger.info(f"Excel file changed, importing {self.excel_file}")
+        started = time.perf_counter()
+        if self.guard is not None:
+            with self.guard():
+                report = self.inventory_manager.import_changes_from_excel()
+        else:
+            report = self.inventory_manager.import_changes_from_excel()
+        self.last_import_seconds = time.perf_counter() - started
+        self.last_import_at = time.time()
+        if report is None:
+            # The JSON files are only written after the workbook parsed, so the old data keeps serving
+            self.failures += 1
+            self.last_error = "Import failed, see the log for details"
+            logger.error("Excel import failed, keeping the current data")
+            return
+
+        self.imports += 1
+        self.last_report = report
+        self.last_error = None
+        if self.on_import is not None:
+            try:
+                self.on_import(report)
+            except Exception as e:
+                self.last_error = f"Reload after import failed: {e}"
+                logger.exception("Reload after Excel import failed")
+
+    def stats(self):
+        return {
+            "file": self.excel_file,
+            "mode": "standby" if not self.watching else "watchdog" if self._observer is not None else "polling",
+            "events": self.events,
+            "imports": self.imports,
+            "failures": self.failures,
+            "last_import_at": self.last_import_at,
+            "last_import_ms": None if self.last_import_seconds is None else round(self.last_import_seconds * 1000, 3),
+            "last_report": self.last_report,
+            "last_error": self.last_error
+        }
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Faceted vehicle filtering
+Each attribute value maps to a bitset (a Python int, one bit per model) so
+filters are combined with AND/OR on integers instead of scanning models
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+
+PRICE_RE = re.compile(r'(\d[\d,]*(?:\.\d+)?)\s*([kKmM])?')
+
+
+def parse_price_range(text):
+    """Parse strings like '$30,000 - $50,000', '$45k+' or 'Under $30,000' into (low, high)"""
+    if not text:
+        return None
+    values = []
+    for number, suffix in PRICE_RE.findall(text):
+        value = float(number.replace(',', ''))
+        if suffix:
+            value *= 1000 if suffix.lower() == 'k' else 1000000
+        values.append(value)
+    if not values:
+        return None
+
+    lowered = text.lower()
+    if len(values) >= 2:
+        return min(values), max(values)
+    if 'under' in lowered or 'below' in lowered or '<' in lowered:
+        return 0.0, values[0]
+    if '+' in lowered or 'from' in lowered or 'starting' in lowered:
+        return values[0], float('inf')
+    return values[0], values[0]
+
+
+def iter_bits(bits):
+    """Set bit positions in ascending order"""
+    return [i for i, bit in enumerate(reversed(bin(bits))) if bit == '1']
+
+
+class FacetIndex:
+    FACETS = ('make', 'category', 'status', 'feature')
+
+    def __init__(self, inventory):
+        self.documents = []
+        # facet -> normalized value -> bitset
+        self.bitsets = {facet: {} for facet in self.FACETS}
+        # normalized value -> display value
+        self.labels = {facet: {} for facet in self.FACETS}
+        self.year_bitsets = {}
+        prices = []
+
+        for make, models in inventory.items():
+            if not isinstance(models, dict):
+                continue
+            for model, data in models.items():
+                if not isinstance(data, dict):
+                    continue
+                doc_id = len(self.documents)
+                self.documents.append((make, model, data))
+                bit = 1 << doc_id
+
+                self._add(bit, 'make', make)
+                self._add(bit, 'category', data.get('category', ''))
+                self._add(bit, 'status', data.get('status', 'Available'))
+                for feature in data.get('features', []):
+                    self._add(bit, 'feature', feature)
+
+                for start, end in data.get('years', []):
+                    for year in range(start, end + 1):
+                        self.year_bitsets[year] = self.year_bitsets.get(year, 0) | bit
+
+                price = parse_price_range(data.get('price_range', ''))
+                if price is not None:
+                    prices.append((price[0], price[1], doc_id))
+
+        self.all_bits = (1 << len(self.documents)) - 1
+        self.years = sorted(self.year_bitsets)
+
+        # Sorted price bounds with cumulative bitsets answer price filters with one bisect
+        by_low = sorted(prices)
+        self.price_lows = [low for low, _, _ in by_low]
+        self.low_prefix = [0]
+        for _, _, doc_id in by_low:
+            self.low_prefix.append(self.low_prefix[-1] | (1 << doc_id))
+
+        by_high = sorted(prices, key=lambda price: price[1])
+        self.price_highs = [high for _, high, _ in by_high]
+        self.high_suffix = [0] * (len(by_high) + 1)
+        for i in range(len(by_high) - 1, -1, -1):
+            self.high_suffix[i] = self.high_suffix[i + 1] | (1 << by_high[i][2])
+
+    def __len__(self):
+        return len(self.documents)
+
+    def _add(self, bit, facet, value):
+        if not value:
+            return
+        key = str(value).strip().lower()
+        self.bitsets[facet][key] = self.bitsets[facet].get(key, 0) | bit
+        self.labels[facet].setdefault(key, str(value).strip())
+
+    def _any_of(self, facet, values):
+        bits = 0
+        for value in values:
+            bits |= self.bitsets[facet].get(str(value).strip().lower(), 0)
+        return bits
+
+    def _year_bits(self, year_min, year_max):
+        lo = bisect_left(self.years, year_min) if year_min is not None else 0
+        hi = bisect_right(self.years, year_max) if year_max is not None else len(self.years)
+        bits = 0
+        for year in self.years[lo:hi]:
+            bits |= self.year_bitsets[year]
+        return bits
+
+    def query(self, makes=(), categories=(), statuses=(), features=(), year_min=None, year_max=None,
+              price_min=None, price_max=None):
+        """Bitset of models matching every given filter
+
+        Values within makes/categories/statuses are OR'ed, features are
+        AND'ed, and a model matches the year filter if it is available in
+        any year of [year_min, year_max]. Price filters keep models whose
+        price range overlaps [price_min, price_max].
+        """
+        bits = self.all_bits
+        if makes:
+            bits &= self._any_of('make', makes)
+        if categories:
+            bits &= self._any_of('category', categories)
+        if statuses:
+            bits &= self._any_of('status', statuses)
+        for feature in features:
+            bits &= self._any_of('feature', [feature])
+        if year_min is not None or year_max is not None:
+            bits &= self._year_bits(year_min, year_max)
+        if price_max is not None:
+            bits &= self.low_prefix[bisect_right(self.price_lows, price_max)]
+        if price_min is not None:
+            bits &= self.high_suffix[bisect_left(self.price_highs, price_min)]
+        return bits
+
+    def facet_counts(self, bits):
+        """Number of matching models per facet value (and per model year)"""
+        counts = {}
+        for facet in self.FACETS:
+            counts[facet] = {
+                self.labels[facet][key]: (bits & value_bits).bit_count()
+                for key, value_bits in self.bitsets[facet].items()
+                if bits & value_bits
+            }
+        counts['year'] = {
+            str(year): (bits & self.year_bitsets[year]).bit_count()
+            for year in self.years
+            if bits & self.year_bitsets[year]
+        }
+        return counts
+
+    def documents_for(self, bits):
+        """(make, model, data) for every set bit, in inventory order"""
+        return [self.documents[doc_id] for doc_id in iter_bits(bits)]
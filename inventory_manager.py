@@ -4,28 +4,407 @@ Inventory Management System for Premium Auto Dealership
 Handles Excel import/export and automatic website updates
 """
 
-import pandas as pd
+import copy
+import gc
+import excel_diff
+from excel_watcher import ExcelWatcher
+from facet_index import parse_price_range
+from backup_store import BackupStore
+from sqlite_backend import SQLiteBackend
+from year_ranges import add_year, compact_inventory, compress_years, expand_years, normalize_years
+import importlib.util
 import json
+import marshal
 import os
-from datetime import datetime
+import sys
+import threading
+import time
+from contextlib import contextmanager
 import logging
 
+try:
+    import fcntl
+except ImportError:  # Windows has no flock; fall back to in-process locking only
+    fcntl = None
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+STORAGE_MODES = ('json', 'journal', 'sqlite')
+
+# Header of binary snapshots; marshal data is only readable by the same Python version
+BINARY_SNAPSHOT_HEADER = f'inventory-snapshot 1 python {sys.version_info[0]}.{sys.version_info[1]}\n'.encode('ascii')
+
+VEHICLE_COLUMNS = ['Make', 'Model', 'Year', 'Category', 'Description', 'Features', 'Price_Range', 'Status']
+PART_COLUMNS = ['Make', 'Model', 'Category', 'Part', 'Status', 'Price', 'Notes']
+SERVICE_COLUMNS = ['Service_Category', 'Service_Name', 'Price', 'Duration']
+
+SERVICES = [
+    {'Service_Category': 'Maintenance', 'Service_Name': 'Oil Change', 'Price': '$39.95-$69.95', 'Duration': '30 min'},
+    {'Service_Category': 'Maintenance', 'Service_Name': 'Tire Rotation', 'Price': '$29.95', 'Duration': '20 min'},
+    {'Service_Category': 'Maintenance', 'Service_Name': 'Brake Inspection', 'Price': '$49.95', 'Duration': '45 min'},
+    {'Service_Category': 'Maintenance', 'Service_Name': 'Multi-Point Inspection', 'Price': '$79.95', 'Duration': '60 min'},
+    {'Service_Category': 'Repair', 'Service_Name': 'Brake Repair', 'Price': '$199.95+', 'Duration': '2-3 hours'},
+    {'Service_Category': 'Repair', 'Service_Name': 'Engine Diagnostics', 'Price': '$129.95', 'Duration': '1 hour'},
+    {'Service_Category': 'Repair', 'Service_Name': 'Transmission Service', 'Price': '$299.95+', 'Duration': '3-4 hours'},
+    {'Service_Category': 'Tire Services', 'Service_Name': 'Tire Installation', 'Price': '$25 per tire', 'Duration': '45 min'},
+    {'Service_Category': 'Tire Services', 'Service_Name': 'Wheel Alignment', 'Price': '$99.95', 'Duration': '1 hour'},
+    {'Service_Category': 'Specialty', 'Service_Name': 'State Inspection', 'Price': '$25.00', 'Duration': '30 min'},
+    {'Service_Category': 'Specialty', 'Service_Name': 'Emissions Testing', 'Price': '$35.00', 'Duration': '20 min'},
+    {'Service_Category': 'Detailing', 'Service_Name': 'Basic Wash', 'Price': '$29.95', 'Duration': '30 min'},
+    {'Service_Category': 'Detailing', 'Service_Name': 'Full Detail', 'Price': '$149.95', 'Duration': '3 hours'}
+]
+
+# The Rust based calamine reader parses workbooks several times faster than openpyxl
+EXCEL_READ_ENGINE = 'calamine' if importlib.util.find_spec('python_calamine') else 'openpyxl'
+
+# pandas and openpyxl are imported inside the Excel import/export methods, so
+# the web app (which only reads and writes JSON) starts without loading them
+
+def _vehicle_rows(inventory_data, make):
+    """Yield one Excel row per model year for make"""
+    for model, data in inventory_data.get(make, {}).items():
+        for year in expand_years(data['years']):
+            yield {
+                'Make': make,
+                'Model': model,
+                'Year': year,
+                'Category': data.get('category', ''),
+                'Description': data.get('description', f'{year} {make} {model}'),
+                'Features': ', '.join(data.get('features', [])),
+                'Price_Range': data.get('price_range', ''),
+                'Status': data.get('status', 'Available')
+            }
+
+def _part_rows(parts_data):
+    """Yield one Excel row per part across all makes"""
+    for make in ['Ford', 'Lincoln', 'Jeep']:
+        for model, categories in parts_data.get(make, {}).items():
+            for category, parts in categories.items():
+                for part in parts:
+                    yield {
+                        'Make': make,
+                        'Model': model,
+                        'Category': category,
+                        'Part': part,
+                        'Status': 'Available',
+                        'Price': '',
+                        'Notes': ''
+                    }
+
+def _clean_column(series):
+    """Vectorized equivalent of str(value).strip() for every cell (blank cells become '')"""
+    return series.astype(object).fillna('').map(str).str.strip()
+
+def _column_or_default(df, column, default):
+    if column in df:
+        return _clean_column(df[column]).tolist()
+    return [default] * len(df)
+
+def apply_mutation(data, op):
+    """Apply a single mutation to inventory or parts data in place.
+
+    Returns False when the target of an update/delete does not exist. Every
+    operation is idempotent so replaying a journal over a snapshot that
+    already contains some of its entries converges to the same data.
+    """
+    kind = op['op']
+    if kind == 'batch':
+        # Several mutations journaled as one line so they replay all-or-nothing
+        for item in op['ops']:
+            apply_mutation(data, item)
+        return True
+    
+    make = op['make']
+    model = op['model']
+    
+    if kind == 'put_vehicle':
+        data.setdefault(make, {})[model] = op['data']
+        return True
+    
+    if kind == 'add_vehicle':
+        models = data.setdefault(make, {})
+        if model not in models:
+            models[model] = {
+                'years': [],
+                'category': op['attributes'].get('category', ''),
+                'description': op['attributes'].get('description', f'{make} {model}'),
+                'features': op['attributes'].get('features', []),
+                'price_range': op['attributes'].get('price_range', ''),
+                'status': op['attributes'].get('status', 'Available')
+            }
+        models[model]['years'] = add_year(normalize_years(models[model]['years']), op['year'])
+        return True
+    
+    if kind == 'update_vehicle':
+        if make in data and model in data[make]:
+            fields = dict(op['fields'])
+            if 'years' in fields:
+                fields['years'] = normalize_years(fields['years'])
+            data[make][model].update(fields)
+            return True
+        return False
+    
+    if kind == 'delete_vehicle':
+        if make in data and model in data[make]:
+            del data[make][model]
+            # Remove make if no models left
+            if not data[make]:
+                del data[make]
+            return True
+        return False
+    
+    if kind == 'add_part':
+        parts = data.setdefault(make, {}).setdefault(model, {}).setdefault(op['category'], [])
+        if op['part'] not in parts:
+            if 'position' in op:
+                # Imports put the part where the sheet has it
+                parts.insert(op['position'], op['part'])
+            else:
+                parts.append(op['part'])
+                parts.sort()
+        return True
+    
+    if kind == 'delete_part':
+        category = op['category']
+        try:
+            data[make][model][category].remove(op['part'])
+        except (KeyError, ValueError):
+            return False
+        # Clean up empty categories/models/makes
+        if not data[make][model][category]:
+            del data[make][model][category]
+        if not data[make][model]:
+            del data[make][model]
+        if not data[make]:
+            del data[make]
+        return True
+    
+    raise ValueError(f"Unknown mutation: {kind}")
+
+# Vehicle fields admins may set (admin edit form and bulk update_vehicle)
+VEHICLE_FIELDS = ('category', 'description', 'features', 'price_range', 'status', 'years')
+
+# Model years accepted from admins
+MIN_MODEL_YEAR = 1900
+MAX_MODEL_YEAR = 2100
+
+# Longest text accepted for a vehicle field or feature
+MAX_FIELD_CHARS = 2000
+
+class InvalidField(ValueError):
+    """Rejected input; field names the offending field"""
+    
+    def __init__(self, field, message):
+        super().__init__(message)
+        self.field = field
+
+def check_model_year(value, field='year'):
+    """Return value as a model year; raises InvalidField"""
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise InvalidField(field, f"'{field}' must be a year")
+    try:
+        year = int(value)
+    except ValueError:
+        raise InvalidField(field, f"'{field}' must be a year")
+    if not MIN_MODEL_YEAR <= year <= MAX_MODEL_YEAR:
+        raise InvalidField(field, f"'{field}' must be between {MIN_MODEL_YEAR} and {MAX_MODEL_YEAR}")
+    return year
+
+def clean_vehicle_fields(fields):
+    """Validate vehicle fields for an update or new vehicle; returns them with years normalized
+
+    Only VEHICLE_FIELDS are accepted. Text fields must be strings (or null),
+    features a list of strings, price_range empty or a recognisable price
+    ('$30,000 - $50,000', '$45k+', ...) and years a list of years or
+    [start, end] ranges. Raises InvalidField.
+    """
+    if not isinstance(fields, dict):
+        raise InvalidField('fields', "'fields' must be an object")
+    for field in fields:
+        if field not in VEHICLE_FIELDS:
+            raise InvalidField(field, f"Unknown vehicle field '{field}', expected one of: {', '.join(VEHICLE_FIELDS)}")
+    
+    cleaned = {}
+    for field, value in fields.items():
+        if field == 'features':
+            if not isinstance(value, list) or not all(isinstance(feature, str) for feature in value):
+                raise InvalidField(field, "'features' must be a list of strings")
+            if any(len(feature) > MAX_FIELD_CHARS for feature in value):
+                raise InvalidField(field, f"Features must be at most {MAX_FIELD_CHARS} characters")
+        elif field == 'years':
+            if not isinstance(value, list):
+                raise InvalidField(field, "'years' must be a list of years or [start, end] ranges")
+            years = []
+            for item in value:
+                if isinstance(item, list) and len(item) == 2:
+                    start, end = (check_model_year(year, 'years') for year in item)
+                    if start > end:
+                        raise InvalidField(field, f"Year range {start}-{end} ends before it starts")
+                    years.append([start, end])
+                else:
+                    year = check_model_year(item, 'years')
+                    years.append([year, year])
+            value = normalize_years(years)
+        elif value is not None:
+            if not isinstance(value, str):
+                raise InvalidField(field, f"'{field}' must be a string")
+            if len(value) > MAX_FIELD_CHARS:
+                raise InvalidField(field, f"'{field}' must be at most {MAX_FIELD_CHARS} characters")
+            if field == 'price_range' and value.strip() and parse_price_range(value) is None:
+                raise InvalidField(field, f"'price_range' is not a price or price range: {value}")
+        cleaned[field] = value
+    return cleaned
+
+# Operations accepted by InventoryManager.apply_bulk and the fields each one requires
+BULK_OPERATIONS = {
+    'add_vehicle': ('make', 'model', 'year'),
+    'update_vehicle': ('make', 'model', 'fields'),
+    'delete_vehicle': ('make', 'model'),
+    'add_part': ('make', 'model', 'category', 'part'),
+    'delete_part': ('make', 'model', 'category', 'part')
+}
+
+def bulk_mutation(item):
+    """Validate one bulk operation and return it as a mutation; raises InvalidField"""
+    if not isinstance(item, dict) or item.get('op') not in BULK_OPERATIONS:
+        raise InvalidField('op', f"'op' must be one of: {', '.join(BULK_OPERATIONS)}")
+    
+    kind = item['op']
+    op = {'op': kind}
+    for field in BULK_OPERATIONS[kind]:
+        value = item.get(field)
+        if field == 'year':
+            value = check_model_year(value)
+        elif field == 'fields':
+            if not isinstance(value, dict) or not value:
+                raise InvalidField(field, "'fields' must be a non-empty object")
+            value = clean_vehicle_fields(value)
+        elif not isinstance(value, str) or not value.strip():
+            raise InvalidField(field, f"'{field}' is required")
+        op[field] = value
+    
+    if kind == 'add_vehicle':
+        attributes = item.get('attributes') or {}
+        if not isinstance(attributes, dict):
+            raise InvalidField('attributes', "'attributes' must be an object")
+        if 'years' in attributes:
+            raise InvalidField('years', "New vehicles take a single 'year', not 'years'")
+        op['attributes'] = clean_vehicle_fields(attributes)
+    return op
+
+def _bulk_error(op, outcome):
+    """Error for an operation that did not apply: outcome is False (target missing) or the exception raised"""
+    if outcome is False:
+        if op['op'].endswith('_part'):
+            message = f"Part not found: {op['part']} ({op['make']} {op['model']}, {op['category']})"
+        else:
+            message = f"Vehicle not found: {op['make']} {op['model']}"
+        return {'code': 'not_found', 'message': message}
+    logger.error(f"Bulk {op['op']} failed: {outcome!r}")
+    return {'code': 'failed', 'message': 'The operation could not be applied'}
+
+def _category_lists(rows):
+    """(make, model, category) -> parts in sheet order"""
+    lists = {}
+    for make, model, category, part in rows:
+        lists.setdefault((make, model, category), []).append(part)
+    return lists
+
+def _category_ops(key, before, after):
+    """Mutations turning one category's part list from before into after, order included
+
+    Removed parts are deleted and new ones inserted at their sheet position,
+    so the result matches a full import of the same sheet. If rows were
+    reordered the whole category is rebuilt.
+    """
+    if before == after:
+        return []
+    make, model, category = key
+    before_set = set(before)
+    after_set = set(after)
+    kept = [part for part in before if part in after_set]
+    if kept == [part for part in after if part in before_set]:
+        removed = [part for part in before if part not in after_set]
+    else:
+        # Rows were reordered: rebuild the category
+        removed = before
+    removed_set = set(removed)
+    
+    ops = [{'op': 'delete_part', 'make': make, 'model': model, 'category': category, 'part': part}
+           for part in removed]
+    ops.extend({'op': 'add_part', 'make': make, 'model': model, 'category': category, 'part': part,
+                'position': position}
+               for position, part in enumerate(after) if part not in before_set or part in removed_set)
+    return ops
+
 class InventoryManager:
-    def __init__(self, excel_file='inventory.xlsx', json_dir='data'):
+    def __init__(self, excel_file='inventory.xlsx', json_dir='data', storage='json', compact_threshold=500,
+                 binary_snapshot=False, backend=None):
+        if storage not in STORAGE_MODES:
+            raise ValueError(f"Unknown storage mode: {storage}")
+        
         self.excel_file = excel_file
         self.json_dir = json_dir
         self.inventory_file = os.path.join(json_dir, 'inventory.json')
         self.parts_file = os.path.join(json_dir, 'parts_catalog.json')
+        # Fingerprints of the last imported workbook, used by differential imports
+        self.import_state_file = os.path.join(json_dir, 'import_state.json')
+        
+        # 'json' rewrites the whole file per change, 'journal' appends each
+        # change to <file>.journal and compacts into the file in the background,
+        # 'sqlite' keeps both documents as indexed rows in data/inventory.db
+        self.storage = storage
+        self.compact_threshold = compact_threshold
+        self._lock = threading.RLock()
+        self._journals = {}
+        self._compacting = set()
+        # Keep a marshal copy of each JSON file (<file>.bin) that loads faster than parsing it
+        self.binary_snapshot = binary_snapshot
         
         # Create data directory if it doesn't exist
         os.makedirs(json_dir, exist_ok=True)
+        
+        # A backend object takes over load_json, save_json, mutate_many and
+        # file_stamp; without one the JSON files are used directly
+        self.backend = backend
+        if backend is None and storage == 'sqlite':
+            self.backend = SQLiteBackend(os.path.join(json_dir, 'inventory.db'), self.inventory_file, self.parts_file)
+            if self.backend.is_new():
+                self._seed_backend()
+        
+        # Compressed, deduplicated backups taken before imports and restores
+        self.backups = BackupStore(self, os.path.join(json_dir, 'backups'))
+    
+    def _seed_backend(self):
+        """Fill a new database from the JSON files; refuses to start with an empty catalog"""
+        source = InventoryManager(json_dir=self.json_dir, storage='journal')
+        if not source.load_json(self.inventory_file):
+            raise RuntimeError(
+                f"The SQLite database {self.backend.db_file} is empty and there is no inventory in "
+                f"{self.inventory_file} to seed it from. Restore the JSON files (or a backup) and start again.")
+        logger.warning(f"SQLite database {self.backend.db_file} is empty, seeding it from the JSON files")
+        _copy_documents(source, self, 'json', 'sqlite')
     
-    def export_to_excel(self):
-        """Export JSON data to Excel with 5 separate sheets"""
+    def worker_settings(self):
+        """Keyword arguments that recreate this manager in another process"""
+        return {
+            'excel_file': self.excel_file,
+            'json_dir': self.json_dir,
+            'storage': self.storage,
+            'compact_threshold': self.compact_threshold,
+            'binary_snapshot': self.binary_snapshot
+        }
+    
+    def export_to_excel(self, stream=False):
+        """Export JSON data to Excel with 5 separate sheets
+
+        stream=True writes rows straight from generators into write-only
+        worksheets, so memory stays flat however large the catalog is.
+        """
+        import pandas as pd
+        
         try:
             logger.info("Exporting inventory data to Excel...")
             
@@ -33,70 +412,28 @@ class InventoryManager:
             inventory_data = self.load_json(self.inventory_file)
             parts_data = self.load_json(self.parts_file)
             
-            # Create Excel writer
-            with pd.ExcelWriter(self.excel_file, engine='openpyxl') as writer:
-                
-                # Create separate sheets for each make
-                for make in ['Ford', 'Lincoln', 'Jeep']:
-                    if make in inventory_data:
-                        make_vehicles = []
-                        for model, data in inventory_data[make].items():
-                            for year in data['years']:
-                                make_vehicles.append({
-                                    'Make': make,
-                                    'Model': model,
-                                    'Year': year,
-                                    'Category': data.get('category', ''),
-                                    'Description': data.get('description', f'{year} {make} {model}'),
-                                    'Features': ', '.join(data.get('features', [])),
-                                    'Price_Range': data.get('price_range', ''),
-                                    'Status': data.get('status', 'Available')
-                                })
-                        
+            if stream:
+                self._export_streaming(inventory_data, parts_data)
+            else:
+                # Create Excel writer
+                with pd.ExcelWriter(self.excel_file, engine='openpyxl') as writer:
+                    
+                    # Create separate sheets for each make
+                    for make in ['Ford', 'Lincoln', 'Jeep']:
+                        make_vehicles = list(_vehicle_rows(inventory_data, make))
                         if make_vehicles:
-                            df = pd.DataFrame(make_vehicles)
+                            df = pd.DataFrame(make_vehicles, columns=VEHICLE_COLUMNS)
                             df.to_excel(writer, sheet_name=f'{make}_Vehicles', index=False)
-                
-                # Create Parts sheet (combined from all makes)
-                all_parts = []
-                for make in ['Ford', 'Lincoln', 'Jeep']:
-                    if make in parts_data:
-                        for model, categories in parts_data[make].items():
-                            for category, parts in categories.items():
-                                for part in parts:
-                                    all_parts.append({
-                                        'Make': make,
-                                        'Model': model,
-                                        'Category': category,
-                                        'Part': part,
-                                        'Status': 'Available',
-                                        'Price': '',
-                                        'Notes': ''
-                                    })
-                
-                if all_parts:
-                    parts_df = pd.DataFrame(all_parts)
-                    parts_df.to_excel(writer, sheet_name='Parts', index=False)
-                
-                # Create Services sheet
-                services_data = [
-                    {'Service_Category': 'Maintenance', 'Service_Name': 'Oil Change', 'Price': '$39.95-$69.95', 'Duration': '30 min'},
-                    {'Service_Category': 'Maintenance', 'Service_Name': 'Tire Rotation', 'Price': '$29.95', 'Duration': '20 min'},
-                    {'Service_Category': 'Maintenance', 'Service_Name': 'Brake Inspection', 'Price': '$49.95', 'Duration': '45 min'},
-                    {'Service_Category': 'Maintenance', 'Service_Name': 'Multi-Point Inspection', 'Price': '$79.95', 'Duration': '60 min'},
-                    {'Service_Category': 'Repair', 'Service_Name': 'Brake Repair', 'Price': '$199.95+', 'Duration': '2-3 hours'},
-                    {'Service_Category': 'Repair', 'Service_Name': 'Engine Diagnostics', 'Price': '$129.95', 'Duration': '1 hour'},
-                    {'Service_Category': 'Repair', 'Service_Name': 'Transmission Service', 'Price': '$299.95+', 'Duration': '3-4 hours'},
-                    {'Service_Category': 'Tire Services', 'Service_Name': 'Tire Installation', 'Price': '$25 per tire', 'Duration': '45 min'},
-                    {'Service_Category': 'Tire Services', 'Service_Name': 'Wheel Alignment', 'Price': '$99.95', 'Duration': '1 hour'},
-                    {'Service_Category': 'Specialty', 'Service_Name': 'State Inspection', 'Price': '$25.00', 'Duration': '30 min'},
-                    {'Service_Category': 'Specialty', 'Service_Name': 'Emissions Testing', 'Price': '$35.00', 'Duration': '20 min'},
-                    {'Service_Category': 'Detailing', 'Service_Name': 'Basic Wash', 'Price': '$29.95', 'Duration': '30 min'},
-                    {'Service_Category': 'Detailing', 'Service_Name': 'Full Detail', 'Price': '$149.95', 'Duration': '3 hours'}
-                ]
-                
-                services_df = pd.DataFrame(services_data)
-                services_df.to_excel(writer, sheet_name='Services', index=False)
+                    
+                    # Create Parts sheet (combined from all makes)
+                    all_parts = list(_part_rows(parts_data))
+                    if all_parts:
+                        parts_df = pd.DataFrame(all_parts, columns=PART_COLUMNS)
+                        parts_df.to_excel(writer, sheet_name='Parts', index=False)
+                    
+                    # Create Services sheet
+                    services_df = pd.DataFrame(SERVICES, columns=SERVICE_COLUMNS)
+                    services_df.to_excel(writer, sheet_name='Services', index=False)
             
             logger.info(f"Successfully exported inventory to {self.excel_file}")
             return True
@@ -105,79 +442,74 @@ class InventoryManager:
             logger.error(f"Error exporting to Excel: {e}")
             return False
     
+    def _export_streaming(self, inventory_data, parts_data):
+        """Write the workbook row by row through openpyxl's write-only mode"""
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font
+        
+        workbook = Workbook(write_only=True)
+        header_font = Font(bold=True)
+        
+        def write_sheet(title, columns, rows):
+            rows = iter(rows)
+            first = next(rows, None)
+            if first is None:
+                return
+            sheet = workbook.create_sheet(title)
+            header = []
+            for column in columns:
+                cell = WriteOnlyCell(sheet, value=column)
+                cell.font = header_font
+                header.append(cell)
+            sheet.append(header)
+            sheet.append([first[column] for column in columns])
+            for row in rows:
+                sheet.append([row[column] for column in columns])
+        
+        for make in ['Ford', 'Lincoln', 'Jeep']:
+            write_sheet(f'{make}_Vehicles', VEHICLE_COLUMNS, _vehicle_rows(inventory_data, make))
+        write_sheet('Parts', PART_COLUMNS, _part_rows(parts_data))
+        write_sheet('Services', SERVICE_COLUMNS, SERVICES)
+        
+        # Save next to the target and swap in, so a failed export keeps the old workbook
+        tmp_file = f'{self.excel_file}.tmp'
+        workbook.save(tmp_file)
+        os.replace(tmp_file, self.excel_file)
+    
     def import_from_excel(self):
         """Import data from Excel with 5 separate sheets"""
+        import pandas as pd
+        
         try:
             logger.info("Importing inventory data from Excel...")
             
             # Create backup
             self.create_backup()
             
-            excel_file = pd.ExcelFile(self.excel_file)
-            
-            # Initialize data structures
-            inventory = {}
-            parts_catalog = {}
-            
-            # Process vehicle sheets
-            for make in ['Ford', 'Lincoln', 'Jeep']:
-                sheet_name = f'{make}_Vehicles'
-                if sheet_name in excel_file.sheet_names:
-                    df = pd.read_excel(self.excel_file, sheet_name=sheet_name)
-                    
-                    if make not in inventory:
-                        inventory[make] = {}
-                    
-                    for _, row in df.iterrows():
-                        model = str(row['Model']).strip()
-                        year = int(row['Year'])
-                        
-                        if model not in inventory[make]:
-                            inventory[make][model] = {
-                                'years': [],
-                                'category': str(row.get('Category', '')).strip(),
-                                'description': str(row.get('Description', f'{make} {model}')).strip(),
-                                'features': [],
-                                'price_range': str(row.get('Price_Range', '')).strip(),
-                                'status': str(row.get('Status', 'Available')).strip()
-                            }
-                        
-                        if year not in inventory[make][model]['years']:
-                            inventory[make][model]['years'].append(year)
-                        
-                        # Handle features
-                        features = str(row.get('Features', ''))
-                        if features and features != 'nan':
-                            feature_list = [f.strip() for f in features.split(',') if f.strip()]
-                            inventory[make][model]['features'] = list(set(inventory[make][model]['features'] + feature_list))
-                    
-                    # Sort years for each model
-                    for model in inventory[make]:
-                        inventory[make][model]['years'].sort()
+            raw_digests, shared_strings = excel_diff.raw_sheet_digests(self.excel_file)
+            import_state = {'shared_strings': shared_strings, 'sheets': {}}
             
-            # Process Parts sheet
-            if 'Parts' in excel_file.sheet_names:
-                parts_df = pd.read_excel(self.excel_file, sheet_name='Parts')
+            # Parse the workbook once and reuse it for every sheet
+            with pd.ExcelFile(self.excel_file, engine=EXCEL_READ_ENGINE) as excel_file:
+                inventory = {}
+                for make in ['Ford', 'Lincoln', 'Jeep']:
+                    sheet_name = f'{make}_Vehicles'
+                    if sheet_name in excel_file.sheet_names:
+                        df = excel_file.parse(sheet_name)
+                        inventory[make] = self._build_vehicle_models(df, make)
+                        import_state['sheets'][sheet_name] = self._vehicle_sheet_state(df, raw_digests[sheet_name])
                 
-                for _, row in parts_df.iterrows():
-                    make = str(row['Make']).strip()
-                    model = str(row['Model']).strip()
-                    category = str(row['Category']).strip()
-                    part = str(row['Part']).strip()
-                    
-                    if make not in parts_catalog:
-                        parts_catalog[make] = {}
-                    if model not in parts_catalog[make]:
-                        parts_catalog[make][model] = {}
-                    if category not in parts_catalog[make][model]:
-                        parts_catalog[make][model][category] = []
-                    
-                    if part not in parts_catalog[make][model][category]:
-                        parts_catalog[make][model][category].append(part)
+                parts_catalog = {}
+                if 'Parts' in excel_file.sheet_names:
+                    df = excel_file.parse('Parts')
+                    parts_catalog = self._build_parts_catalog(df)
+                    import_state['sheets']['Parts'] = self._parts_sheet_state(df, raw_digests['Parts'])
             
             # Save to JSON files
             self.save_json(inventory, self.inventory_file)
             self.save_json(parts_catalog, self.parts_file)
+            self._write_bytes(json.dumps(import_state).encode('utf-8'), self.import_state_file)
             
             logger.info("Successfully updated inventory.json")
             logger.info("Successfully updated parts_catalog.json")
@@ -188,103 +520,792 @@ class InventoryManager:
             logger.error(f"Error importing from Excel: {e}")
             return False
     
-    def load_json(self, file_path):
-        """Load JSON data from file"""
+    def import_changes_from_excel(self):
+        """Apply only the sheets and rows that changed since the last import
+
+        Returns a diff report, or None if the import failed. Without a
+        previous import state this falls back to a full import.
+        """
+        import pandas as pd
+        
         try:
-            with open(file_path, 'r') as f:
+            import_state = self._load_import_state()
+            if import_state is None:
+                logger.info("No previous import state, running a full import")
+                if not self.import_from_excel():
+                    return None
+                return {'mode': 'full', 'sheets': {}, 'operations': 0}
+            
+            logger.info("Importing changed rows from Excel...")
+            raw_digests, shared_strings = excel_diff.raw_sheet_digests(self.excel_file)
+            strings_unchanged = shared_strings == import_state.get('shared_strings')
+            previous_sheets = import_state.get('sheets', {})
+            
+            new_state = {'shared_strings': shared_strings, 'sheets': {}}
+            report = {'mode': 'incremental', 'sheets': {}, 'operations': 0}
+            vehicle_ops = []
+            part_ops = []
+            
+            with pd.ExcelFile(self.excel_file, engine=EXCEL_READ_ENGINE) as excel_file:
+                for sheet_name in ['Ford_Vehicles', 'Lincoln_Vehicles', 'Jeep_Vehicles', 'Parts']:
+                    previous = previous_sheets.get(sheet_name)
+                    
+                    if sheet_name not in excel_file.sheet_names:
+                        if previous is not None:
+                            # Sheet removed: drop everything it contributed
+                            empty = {'models': {}, 'rows': []}
+                            report['sheets'][sheet_name] = self._diff_sheet(sheet_name, None, previous, empty, vehicle_ops, part_ops)
+                        continue
+                    
+                    if previous is not None and strings_unchanged and previous['raw'] == raw_digests[sheet_name]:
+                        # Byte-identical sheet: skip parsing entirely
+                        new_state['sheets'][sheet_name] = previous
+                        report['sheets'][sheet_name] = {'status': 'unchanged'}
+                        continue
+                    
+                    df = excel_file.parse(sheet_name)
+                    if sheet_name == 'Parts':
+                        sheet_state = self._parts_sheet_state(df, raw_digests[sheet_name])
+                    else:
+                        sheet_state = self._vehicle_sheet_state(df, raw_digests[sheet_name])
+                    new_state['sheets'][sheet_name] = sheet_state
+                    
+                    if previous is not None and previous['content'] == sheet_state['content']:
+                        report['sheets'][sheet_name] = {'status': 'unchanged'}
+                        continue
+                    
+                    report['sheets'][sheet_name] = self._diff_sheet(sheet_name, df, previous or {'models': {}, 'rows': []},
+                                                                    sheet_state, vehicle_ops, part_ops)
+            
+            report['operations'] = len(vehicle_ops) + len(part_ops)
+            if report['operations']:
+                self.create_backup()
+            if vehicle_ops:
+                self.mutate_many(self.inventory_file, vehicle_ops)
+            if part_ops:
+                self.mutate_many(self.parts_file, part_ops)
+            self._write_bytes(json.dumps(new_state).encode('utf-8'), self.import_state_file)
+            
+            logger.info(f"Applied {report['operations']} changes from Excel")
+            return report
+            
+        except Exception as e:
+            logger.error(f"Error importing changes from Excel: {e}")
+            return None
+    
+    def _diff_sheet(self, sheet_name, df, previous, current, vehicle_ops, part_ops):
+        """Turn the difference between two sheet states into mutations"""
+        if sheet_name == 'Parts':
+            previous_rows = [tuple(row) for row in previous['rows']]
+            current_rows = [tuple(row) for row in current['rows']]
+            previous_set = set(previous_rows)
+            current_set = set(current_rows)
+            added = [row for row in current_rows if row not in previous_set]
+            deleted = [row for row in previous_rows if row not in current_set]
+            
+            previous_lists = _category_lists(previous_rows)
+            current_lists = _category_lists(current_rows)
+            for key in list(previous_lists) + [key for key in current_lists if key not in previous_lists]:
+                part_ops.extend(_category_ops(key, previous_lists.get(key, []), current_lists.get(key, [])))
+            
+            return {
+                'status': 'changed' if df is not None else 'removed',
+                'added': [' / '.join(row) for row in added],
+                'updated': [],
+                'deleted': [' / '.join(row) for row in deleted]
+            }
+        
+        make = sheet_name[:-len('_Vehicles')]
+        previous_models = previous['models']
+        current_models = current['models']
+        added = [model for model in current_models if model not in previous_models]
+        updated = [model for model in current_models
+                   if model in previous_models and previous_models[model] != current_models[model]]
+        deleted = [model for model in previous_models if model not in current_models]
+        
+        changed = added + updated
+        if changed:
+            rows = df[_clean_column(df['Model']).isin(changed)]
+            for model, data in self._build_vehicle_models(rows, make).items():
+                vehicle_ops.append({'op': 'put_vehicle', 'make': make, 'model': model, 'data': data})
+        for model in deleted:
+            vehicle_ops.append({'op': 'delete_vehicle', 'make': make, 'model': model})
+        
+        return {
+            'status': 'changed' if df is not None else 'removed',
+            'added': added,
+            'updated': updated,
+            'deleted': deleted
+        }
+    
+    def _vehicle_sheet_state(self, df, raw_digest):
+        import pandas as pd
+        
+        hashes = excel_diff.row_hashes(df)
+        models = _clean_column(df['Model']) if not df.empty else pd.Series([], dtype=object)
+        return {
+            'raw': raw_digest,
+            'content': excel_diff.frame_digest(df, hashes),
+            'models': excel_diff.group_digests(models, hashes)
+        }
+    
+    def _parts_sheet_state(self, df, raw_digest):
+        import pandas as pd
+        
+        columns = ['Make', 'Model', 'Category', 'Part']
+        rows = pd.DataFrame({column: _clean_column(df[column]) for column in columns}).drop_duplicates()
+        return {
+            'raw': raw_digest,
+            'content': excel_diff.frame_digest(df),
+            'rows': rows.values.tolist()
+        }
+    
+    def _load_import_state(self):
+        if not os.path.exists(self.import_state_file):
+            return None
+        try:
+            with open(self.import_state_file, 'r') as f:
                 return json.load(f)
-        except FileNotFoundError:
-            logger.warning(f"File {file_path} not found, returning empty dict")
-            return {}
         except json.JSONDecodeError:
-            logger.error(f"Invalid JSON in {file_path}")
+            logger.warning(f"Invalid import state in {self.import_state_file}, ignoring it")
+            return None
+    
+    def _build_vehicle_models(self, df, make):
+        """Build {model: data} for one vehicle sheet using grouped column operations"""
+        import pandas as pd
+        
+        if df.empty:
             return {}
+        
+        models = _clean_column(df['Model'])
+        years = df['Year'].astype(int)
+        
+        # Attributes come from the first row of each model, in sheet order
+        first_rows = df.assign(_model=models).drop_duplicates('_model')
+        model_names = first_rows['_model'].tolist()
+        categories = _column_or_default(first_rows, 'Category', '')
+        prices = _column_or_default(first_rows, 'Price_Range', '')
+        statuses = _column_or_default(first_rows, 'Status', 'Available')
+        if 'Description' in first_rows:
+            descriptions = _clean_column(first_rows['Description']).tolist()
+        else:
+            descriptions = [f'{make} {model}' for model in model_names]
+        
+        model_years = years.groupby(models, sort=False).unique()
+        
+        model_features = {}
+        if 'Features' in df:
+            features = _clean_column(df['Features'])
+            has_features = features != ''
+            exploded = pd.DataFrame({
+                'model': models[has_features],
+                'feature': features[has_features].str.split(',')
+            }).explode('feature')
+            exploded['feature'] = exploded['feature'].str.strip()
+            exploded = exploded[exploded['feature'] != ''].drop_duplicates()
+            model_features = exploded.groupby('model', sort=False)['feature'].agg(list).to_dict()
+        
+        result = {}
+        for model, category, description, price, status in zip(model_names, categories, descriptions, prices, statuses):
+            result[model] = {
+                'years': compress_years(model_years[model]),
+                'category': category,
+                'description': description,
+                'features': model_features.get(model, []),
+                'price_range': price,
+                'status': status
+            }
+        return result
+    
+    def _build_parts_catalog(self, df):
+        """Build make -> model -> category -> [parts] from the Parts sheet"""
+        import pandas as pd
+        
+        columns = ['Make', 'Model', 'Category', 'Part']
+        rows = pd.DataFrame({column: _clean_column(df[column]) for column in columns}).drop_duplicates()
+        
+        parts_catalog = {}
+        for make, model, category, part in rows.itertuples(index=False, name=None):
+            parts_catalog.setdefault(make, {}).setdefault(model, {}).setdefault(category, []).append(part)
+        return parts_catalog
+    
+    def load_json(self, file_path):
+        """Load JSON data from file (base snapshot plus journal in journal mode)"""
+        if self.backend is not None:
+            return self.backend.load(file_path)
+        if self.storage == 'journal':
+            with self._locked(file_path):
+                return copy.deepcopy(self._journal_state(file_path)['data'])
+        return self._read_snapshot(file_path)
     
     def save_json(self, data, file_path):
         """Save data to JSON file"""
-        with open(file_path, 'w') as f:
-            json.dump(data, f, indent=2)
-    
-    def create_backup(self):
-        """Create backup of current JSON files"""
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        
-        if os.path.exists(self.inventory_file):
-            backup_file = f'backup_inventory_{timestamp}.json'
-            with open(self.inventory_file, 'r') as src, open(backup_file, 'w') as dst:
-                dst.write(src.read())
-            logger.info(f"Created backup: {backup_file}")
-
-class ExcelFileHandler:
-    def __init__(self, inventory_manager):
-        self.inventory_manager = inventory_manager
-        self.last_modified = 0
-        
-    def on_modified(self, event):
-        if event.is_directory:
-            return
+        if self.backend is not None:
+            return self.backend.save(data, file_path)
+        if self.storage == 'journal':
+            with self._locked(file_path):
+                # Drop the journal first: its entries describe the data being
+                # replaced and must never be replayed on top of the new file
+                self._rewrite_journal(file_path, b'')
+                self._write_snapshot(data, file_path)
+                self._journals.pop(file_path, None)
+        else:
+            self._write_snapshot(data, file_path)
+    
+    # Single-record mutations used by the admin routes
+    def add_vehicle(self, make, model, year, attributes=None):
+        """Add a model year, creating the model with attributes if needed"""
+        return self.mutate(self.inventory_file, {
+            'op': 'add_vehicle', 'make': make, 'model': model,
+            'year': year, 'attributes': attributes or {}
+        })
+    
+    def update_vehicle(self, make, model, fields):
+        """Update fields of an existing model; False if it does not exist"""
+        return self.mutate(self.inventory_file, {
+            'op': 'update_vehicle', 'make': make, 'model': model, 'fields': fields
+        })
+    
+    def delete_vehicle(self, make, model):
+        """Delete a model; False if it does not exist"""
+        return self.mutate(self.inventory_file, {
+            'op': 'delete_vehicle', 'make': make, 'model': model
+        })
+    
+    def add_part(self, make, model, category, part, changes=None):
+        """Add a part to a model's category"""
+        return self.mutate(self.parts_file, {
+            'op': 'add_part', 'make': make, 'model': model,
+            'category': category, 'part': part
+        }, changes)
+    
+    def delete_part(self, make, model, category, part, changes=None):
+        """Delete a part; False if it does not exist"""
+        return self.mutate(self.parts_file, {
+            'op': 'delete_part', 'make': make, 'model': model,
+            'category': category, 'part': part
+        }, changes)
+    
+    def mutate(self, file_path, op, changes=None):
+        """Apply one mutation and persist it using the configured storage mode"""
+        return self.mutate_many(file_path, [op], changes)[0]
+    
+    def mutate_many(self, file_path, ops, changes=None):
+        """Apply mutations in order with a single write; returns a result per op
+
+        If a changes list is given, (stamp before, stamp after, applied ops)
+        is appended to it, with both stamps taken under the file lock so
+        callers can update derived data without re-reading the file.
+        """
+        if self.backend is not None:
+            return self.backend.mutate_many(file_path, ops, changes)
+        
+        if self.storage == 'json':
+            with self._locked(file_path):
+                before = self.file_stamp(file_path)
+                data = self._read_snapshot(file_path)
+                results = [apply_mutation(data, op) for op in ops]
+                if any(results):
+                    self._write_snapshot(data, file_path)
+                if changes is not None:
+                    applied = [op for op, result in zip(ops, results) if result]
+                    changes.append((before, self.file_stamp(file_path), applied))
+            return results
+        
+        with self._locked(file_path):
+            before = self.file_stamp(file_path)
+            state = self._journal_state(file_path)
+            results = [apply_mutation(state['data'], op) for op in ops]
+            applied = [op for op, result in zip(ops, results) if result]
+            if len(applied) == 1:
+                self._append_journal(file_path, state, applied[0])
+            elif applied:
+                self._append_journal(file_path, state, {'op': 'batch', 'ops': applied})
+            if changes is not None:
+                changes.append((before, self.file_stamp(file_path), applied))
+            pending = state['entries']
+        
+        if pending >= self.compact_threshold:
+            self._start_compaction(file_path)
+        return results
+    
+    def apply_bulk(self, operations, changes=None):
+        """Apply vehicle and part operations all-or-nothing with one write per file
+
+        Returns (committed, results) with {'index', 'op', 'ok', 'error'} per
+        operation, error being None or {'code', 'message'} plus 'field' for
+        invalid input; code is 'invalid', 'not_found' or 'failed'. Nothing is written unless every operation is valid and its
+        target exists. If a changes dict is given, it collects the
+        mutate_many style (stamp before, stamp after, applied ops) per file.
+        """
+        results = []
+        batch = []
+        for index, item in enumerate(operations):
+            try:
+                op = bulk_mutation(item)
+            except InvalidField as e:
+                kind = item.get('op') if isinstance(item, dict) else None
+                error = {'code': 'invalid', 'message': str(e), 'field': e.field}
+                results.append({'index': index, 'op': kind, 'ok': False, 'error': error})
+                continue
+            file_path = self.parts_file if op['op'].endswith('_part') else self.inventory_file
+            batch.append((index, file_path, op))
+            results.append({'index': index, 'op': op['op'], 'ok': True, 'error': None})
+        
+        if not batch or len(batch) < len(results):
+            return False, results
+        
+        pairs = [(file_path, op) for index, file_path, op in batch]
+        if self.backend is not None:
+            outcomes = self.backend.apply_all(pairs, changes)
+        else:
+            outcomes = self._apply_all(pairs, changes)
+        
+        for (index, file_path, op), outcome in zip(batch, outcomes):
+            if outcome is not True:
+                results[index]['ok'] = False
+                results[index]['error'] = _bulk_error(op, outcome)
+        return all(outcome is True for outcome in outcomes), results
+    
+    def _apply_all(self, pairs, changes):
+        """JSON and journal side of apply_bulk; returns an outcome per (file_path, op) pair
+
+        Both files are locked for the whole batch and the operations run on
+        copies, so a failing operation leaves the files untouched. The files
+        are then written one after the other; only a crash in between can
+        leave the inventory written without the parts.
+        """
+        file_paths = [path for path in (self.inventory_file, self.parts_file)
+                      if any(file_path == path for file_path, op in pairs)]
+        with self._locked(self.inventory_file), self._locked(self.parts_file):
+            before = {}
+            working = {}
+            for file_path in file_paths:
+                before[file_path] = self.file_stamp(file_path)
+                if self.storage == 'json':
+                    working[file_path] = self._read_snapshot(file_path)
+                else:
+                    working[file_path] = copy.deepcopy(self._journal_state(file_path)['data'])
             
-        if event.src_path.endswith('.xlsx') and 'inventory' in event.src_path.lower():
-            # Prevent multiple rapid fire updates
-            current_time = time.time()
-            if current_time - self.last_modified < 2:  # 2 second cooldown
-                return
+            outcomes = []
+            for file_path, op in pairs:
+                try:
+                    outcomes.append(apply_mutation(working[file_path], op))
+                except (TypeError, ValueError) as e:
+                    outcomes.append(e)
+            if not all(outcome is True for outcome in outcomes):
+                return outcomes
             
-            self.last_modified = current_time
-            logger.info(f"Excel file modified: {event.src_path}")
+            pending = {}
+            for file_path in file_paths:
+                applied = [op for path, op in pairs if path == file_path]
+                if self.storage == 'json':
+                    self._write_snapshot(working[file_path], file_path)
+                else:
+                    state = self._journal_state(file_path)
+                    self._append_journal(file_path, state,
+                                         applied[0] if len(applied) == 1 else {'op': 'batch', 'ops': applied})
+                    state['data'] = working[file_path]
+                    pending[file_path] = state['entries']
+                if changes is not None:
+                    changes.setdefault(file_path, []).append((before[file_path], self.file_stamp(file_path), applied))
+        
+        for file_path, entries in pending.items():
+            if entries >= self.compact_threshold:
+                self._start_compaction(file_path)
+        return outcomes
+    
+    def file_stamp(self, file_path):
+        """Cheap change detector for one data file (inode, mtime and size)
+
+        Every write either replaces the file (new inode) or appends to its
+        journal (new size), so any change produces a different stamp.
+        """
+        if self.backend is not None:
+            return self.backend.file_stamp(file_path)
+        return (self._stat_stamp(file_path), self._stat_stamp(self._journal_path(file_path)))
+    
+    def data_stamp(self):
+        """Combined stamp of the inventory and parts files"""
+        return (self.file_stamp(self.inventory_file), self.file_stamp(self.parts_file))
+    
+    def compact_journal(self, file_path):
+        """Fold the journal for file_path into its base snapshot"""
+        with self._locked(file_path):
+            state = self._journal_state(file_path)
+            if not state['entries']:
+                return False
+            data = copy.deepcopy(state['data'])
+            base_stamp = state['base_stamp']
+            offset = state['offset']
+        
+        # Serialize outside the lock so admin writes are not blocked meanwhile
+        payload = json.dumps(data, indent=2).encode('utf-8')
+        
+        with self._locked(file_path):
+            state = self._journal_state(file_path)
+            if state['base_stamp'] != base_stamp or state['offset'] < offset:
+                # Another worker compacted or replaced the file in the meantime
+                return False
             
-            # Wait a moment for file to be fully written
-            time.sleep(1)
+            journal_file = self._journal_path(file_path)
+            with open(journal_file, 'rb') as f:
+                f.seek(offset)
+                tail = f.read(state['offset'] - offset)
             
-            if self.inventory_manager.import_from_excel():
-                logger.info("Website data updated successfully!")
-            else:
-                logger.error("Failed to update website data")
+            # Replace the snapshot before trimming the journal; a crash in
+            # between only replays entries that are already in the snapshot
+            self._write_bytes(payload, file_path)
+            self._rewrite_journal(file_path, tail)
+            self._journals.pop(file_path, None)
+        
+        logger.info(f"Compacted journal for {file_path}")
+        return True
+    
+    def _start_compaction(self, file_path):
+        with self._lock:
+            if file_path in self._compacting:
+                return
+            self._compacting.add(file_path)
+        
+        def run():
+            try:
+                self.compact_journal(file_path)
+            except Exception as e:
+                logger.error(f"Error compacting journal for {file_path}: {e}")
+            finally:
+                with self._lock:
+                    self._compacting.discard(file_path)
+        
+        threading.Thread(target=run, name='journal-compaction', daemon=True).start()
+    
+    @contextmanager
+    def _locked(self, file_path):
+        """Serialize access to file_path across threads and worker processes"""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(f'{file_path}.lock', 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
+    def _journal_path(self, file_path):
+        return f'{file_path}.journal'
+    
+    def _journal_state(self, file_path):
+        """Return the replayed data for file_path, reading only new journal entries"""
+        base_stamp = self._stat_stamp(file_path)
+        journal_file = self._journal_path(file_path)
+        journal_size = os.path.getsize(journal_file) if os.path.exists(journal_file) else 0
+        
+        state = self._journals.get(file_path)
+        if state is None or state['base_stamp'] != base_stamp or journal_size < state['offset']:
+            # Base snapshot replaced (import/compaction) or journal rewritten: replay from scratch
+            state = {
+                'data': self._read_snapshot(file_path),
+                'base_stamp': base_stamp,
+                'offset': 0,
+                'entries': 0
+            }
+            self._journals[file_path] = state
+        
+        if journal_size > state['offset']:
+            with open(journal_file, 'rb') as f:
+                f.seek(state['offset'])
+                chunk = f.read(journal_size - state['offset'])
+            
+            # A crash mid-append can leave a partial last line; stop before it
+            end = chunk.rfind(b'\n') + 1
+            for line in chunk[:end].splitlines():
+                if line.strip():
+                    apply_mutation(state['data'], json.loads(line))
+                    state['entries'] += 1
+            state['offset'] += end
+        
+        return state
+    
+    def _append_journal(self, file_path, state, op):
+        line = json.dumps(op, separators=(',', ':')).encode('utf-8') + b'\n'
+        journal_file = self._journal_path(file_path)
+        fd = os.open(journal_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            if os.fstat(fd).st_size > state['offset']:
+                # Discard a torn write left behind by a crashed writer
+                os.ftruncate(fd, state['offset'])
+            os.write(fd, line)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        state['offset'] += len(line)
+        state['entries'] += 1
+    
+    def _rewrite_journal(self, file_path, content):
+        journal_file = self._journal_path(file_path)
+        if not content and not os.path.exists(journal_file):
+            return
+        self._write_bytes(content, journal_file)
+    
+    def _read_snapshot(self, file_path):
+        if self.binary_snapshot:
+            data = self._read_binary_snapshot(file_path)
+            if data is not None:
+                return data
+        try:
+            with open(file_path, 'r') as f:
+                stamp = self._fd_stamp(f.fileno())
+                data = json.load(f)
+            if file_path == self.inventory_file and isinstance(data, dict):
+                # Older files list every year; keep ranges in memory either way
+                compact_inventory(data)
+            if self.binary_snapshot:
+                self._write_binary_snapshot(data, file_path, stamp)
+            return data
+        except FileNotFoundError:
+            logger.warning(f"File {file_path} not found, returning empty dict")
+            return {}
+        except json.JSONDecodeError:
+            logger.error(f"Invalid JSON in {file_path}")
+            return {}
+    
+    def _binary_path(self, file_path):
+        return f'{file_path}.bin'
+    
+    def _read_binary_snapshot(self, file_path):
+        """Data from the binary snapshot of file_path, or None if it is missing or stale"""
+        stamp = self._stat_stamp(file_path)
+        if stamp is None:
+            return None
+        try:
+            with open(self._binary_path(file_path), 'rb') as f:
+                content = f.read()
+        except FileNotFoundError:
+            return None
+        if not content.startswith(BINARY_SNAPSHOT_HEADER):
+            return None
+        
+        # Millions of new containers would otherwise trigger repeated, useless GC passes
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            source_stamp, data = marshal.loads(memoryview(content)[len(BINARY_SNAPSHOT_HEADER):])
+        except (EOFError, ValueError, TypeError):
+            logger.warning(f"Ignoring unreadable binary snapshot of {file_path}")
+            return None
+        finally:
+            if gc_enabled:
+                gc.enable()
+        return data if source_stamp == stamp else None
+    
+    def _write_binary_snapshot(self, data, file_path, stamp):
+        """Save data with the stamp of the JSON file it came from; a cache, so failures only log"""
+        binary_file = self._binary_path(file_path)
+        tmp_file = f'{binary_file}.tmp'
+        try:
+            with open(tmp_file, 'wb') as f:
+                f.write(BINARY_SNAPSHOT_HEADER)
+                f.write(marshal.dumps((stamp, data)))
+            os.replace(tmp_file, binary_file)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not write binary snapshot of {file_path}: {e}")
+    
+    def compile_binary_snapshots(self):
+        """Write fresh binary snapshots of the inventory and parts files; returns their paths"""
+        paths = []
+        for file_path in (self.inventory_file, self.parts_file):
+            try:
+                with open(file_path, 'r') as f:
+                    stamp = self._fd_stamp(f.fileno())
+                    data = json.load(f)
+            except FileNotFoundError:
+                continue
+            if file_path == self.inventory_file and isinstance(data, dict):
+                compact_inventory(data)
+            self._write_binary_snapshot(data, file_path, stamp)
+            paths.append(self._binary_path(file_path))
+        return paths
+    
+    def _write_snapshot(self, data, file_path):
+        self._write_bytes(json.dumps(data, indent=2).encode('utf-8'), file_path)
+    
+    def _write_bytes(self, content, file_path):
+        """Atomically replace file_path so readers never see a half-written file"""
+        tmp_file = f'{file_path}.tmp'
+        with open(tmp_file, 'wb') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, file_path)
+        
+        # Persist the rename itself; not supported on every platform
+        try:
+            dir_fd = os.open(os.path.dirname(file_path) or '.', os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(dir_fd)
+        except OSError:
+            pass
+        finally:
+            os.close(dir_fd)
+    
+    def _stat_stamp(self, file_path):
+        try:
+            st = os.stat(file_path)
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+    
+    def _fd_stamp(self, fd):
+        """Stamp of an open file, matching _stat_stamp for the same file"""
+        st = os.fstat(fd)
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+    
+    def create_backup(self, reason='import'):
+        """Back up the inventory and parts data (skipped if identical to the latest backup)"""
+        backup, created = self.backups.create(reason)
+        if not created:
+            logger.info(f"Data unchanged since backup {backup['id']}, no new backup needed")
+        return backup
+
+def run_excel_job(kind, settings):
+    """Background job entry point: 'import' or 'export' with a fresh InventoryManager(**settings)
+
+    Returns the import report or export details; raises RuntimeError when
+    the work fails so the job is marked failed.
+    """
+    manager = InventoryManager(**settings)
+    if kind == 'import':
+        report = manager.import_changes_from_excel()
+        if report is None:
+            raise RuntimeError("Import failed, see the log for details")
+        return report
+    if kind == 'export':
+        if not manager.export_to_excel():
+            raise RuntimeError("Export failed, see the log for details")
+        return {'file': manager.excel_file, 'size': os.path.getsize(manager.excel_file)}
+    raise ValueError(f"Unknown Excel job: {kind}")
+
+def format_import_report(report):
+    """Human readable lines summarizing a differential import report"""
+    if report['mode'] == 'full':
+        return ['Full import (no previous import state)']
+    
+    lines = []
+    for sheet_name, sheet in report['sheets'].items():
+        if sheet['status'] == 'unchanged':
+            lines.append(f"{sheet_name}: unchanged")
+        else:
+            lines.append(f"{sheet_name}: {sheet['status']} "
+                         f"(+{len(sheet['added'])} ~{len(sheet['updated'])} -{len(sheet['deleted'])})")
+    lines.append(f"{report['operations']} changes applied")
+    return lines
+
+def migrate_storage(source, target, json_dir='data'):
+    """Copy inventory and parts from one storage mode to another; returns the number of documents copied
+
+    JSON files are read and written through journal mode, so pending
+    journal entries are included and cleared along the way.
+    """
+    source_manager = InventoryManager(json_dir=json_dir, storage='journal' if source == 'json' else source)
+    target_manager = InventoryManager(json_dir=json_dir, storage='journal' if target == 'json' else target)
+    return _copy_documents(source_manager, target_manager, source, target)
+
+def _copy_documents(source_manager, target_manager, source, target):
+    copied = 0
+    for file_path in (source_manager.inventory_file, source_manager.parts_file):
+        data = source_manager.load_json(file_path)
+        target_manager.save_json(data, file_path)
+        copied += 1
+        logger.info(f"Migrated {file_path} from {source} to {target}")
+    return copied
 
 def start_file_monitor(inventory_manager):
-    """Start monitoring Excel file for changes"""
-    event_handler = ExcelFileHandler(inventory_manager)
-    observer = Observer()
-    observer.schedule(event_handler, path='.', recursive=False)
-    observer.start()
+    """Import changes from the Excel file whenever it is saved, until Ctrl+C"""
+    def report_import(report):
+        for line in format_import_report(report):
+            logger.info(line)
+        logger.info("Website data updated successfully!")
     
+    watcher = ExcelWatcher(inventory_manager, on_import=report_import).start()
     logger.info("Started file monitoring. Press Ctrl+C to stop.")
     
     try:
         while True:
             time.sleep(1)
     except KeyboardInterrupt:
-        observer.stop()
         logger.info("File monitoring stopped.")
     
-    observer.join()
+    watcher.stop()
 
 def main():
     import argparse
-    import time
-    from watchdog.observers import Observer
     
     parser = argparse.ArgumentParser(description='Premium Auto Dealership Inventory Manager')
     parser.add_argument('--export', action='store_true', help='Export JSON to Excel')
-    parser.add_argument('--import', action='store_true', help='Import Excel to JSON')
+    parser.add_argument('--import', action='store_true', help='Import Excel to JSON (only changed sheets and rows)')
+    parser.add_argument('--full', action='store_true', help='With --import, rebuild the JSON files from the whole workbook')
     parser.add_argument('--monitor', action='store_true', help='Monitor Excel file for changes')
     parser.add_argument('--excel-file', default='inventory.xlsx', help='Excel file name')
+    parser.add_argument('--stream', action='store_true', help='With --export, stream rows into write-only sheets (constant memory)')
+    parser.add_argument('--storage', choices=STORAGE_MODES, default=os.environ.get('INVENTORY_STORAGE', 'json'), help='Storage mode the data is read from and written to')
+    parser.add_argument('--migrate', choices=['json-to-sqlite', 'sqlite-to-json'], help='Copy the data between the JSON files and data/inventory.db')
+    parser.add_argument('--backup', action='store_true', help='Back up the inventory and parts data')
+    parser.add_argument('--list-backups', action='store_true', help='List backups, newest first')
+    parser.add_argument('--restore', metavar='BACKUP_ID', help='Restore a backup (the current data is backed up first)')
+    parser.add_argument('--compile-snapshot', action='store_true', help='Write binary snapshots of the JSON files for faster loading')
     
     args = parser.parse_args()
     
-    manager = InventoryManager(excel_file=args.excel_file)
+    manager = InventoryManager(excel_file=args.excel_file, storage=args.storage)
     
     if args.export:
-        if manager.export_to_excel():
+        if manager.export_to_excel(stream=args.stream):
             print(f"✅ Successfully exported to {args.excel_file}")
         else:
             print("❌ Export failed")
     
     elif getattr(args, 'import'):
-        if manager.import_from_excel():
-            print("✅ Successfully imported from Excel")
+        if args.full:
+            if manager.import_from_excel():
+                print("✅ Successfully imported from Excel")
+            else:
+                print("❌ Import failed")
         else:
-            print("❌ Import failed")
+            report = manager.import_changes_from_excel()
+            if report is not None:
+                print("✅ Successfully imported from Excel")
+                for line in format_import_report(report):
+                    print(f"   {line}")
+            else:
+                print("❌ Import failed")
+    
+    elif args.migrate:
+        source, target = args.migrate.split('-to-')
+        migrate_storage(source, target)
+        print(f"✅ Migrated inventory and parts from {source} to {target}")
+    
+    elif args.backup:
+        backup = manager.create_backup(reason='manual')
+        print(f"✅ Backup {backup['id']}")
+    
+    elif args.list_backups:
+        for backup in manager.backups.list():
+            print(f"{backup['id']}  {backup['created_at']}  {backup['size']['stored'] / 1024:.0f} KB  {backup['reason']}")
+    
+    elif args.restore:
+        try:
+            manager.backups.restore(args.restore)
+            print(f"✅ Restored backup {args.restore}")
+        except ValueError as e:
+            print(f"❌ {e}")
+    
+    elif args.compile_snapshot:
+        for path in manager.compile_binary_snapshots():
+            print(f"✅ Wrote {path}")
     
     elif args.monitor:
         # Create Excel file if it doesn't exist
@@ -292,7 +1313,7 @@ def main():
         start_file_monitor(manager)
     
     else:
-        print("Please specify an action: --export, --import, or --monitor")
+        print("Please specify an action: --export, --import, --backup, --list-backups, --restore, --migrate, --compile-snapshot or --monitor")
         print("Example: python inventory_manager.py --export")
 
 if __name__ == "__main__":
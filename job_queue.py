@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Background job queue for slow admin work (Excel import and export)
+Jobs run one at a time off the request path, by default in a worker
+process, so pandas and openpyxl neither hold the web worker's GIL nor load
+into its memory. Each job's state and timings are kept for the status
+endpoint the admin dashboard polls.
+"""
+
+import os
+import pickle
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Number of finished jobs kept for the status endpoint
+DEFAULT_KEEP = 50
+
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+
+
+class JobQueue:
+    def __init__(self, use_processes=True, keep=DEFAULT_KEEP):
+        # False runs jobs on the queue's own thread (for platforms without process support)
+        self.use_processes = use_processes
+        self.keep = keep
+        self._lock = threading.Lock()
+        self._jobs = OrderedDict()
+        self._pending = deque()
+        # (function, args, guard, on_done) of each queued job
+        self._tasks = {}
+        self._wakeup = threading.Condition(self._lock)
+        self._thread = None
+        self.succeeded = 0
+        self.failed = 0
+
+    def submit(self, kind, function, args=(), guard=None, on_done=None):
+        """Queue function(*args) and return the job; a job of the same kind still queued is reused
+
+        function and args must be picklable when jobs run in a process.
+        guard is a context manager factory held while the job runs, and
+        on_done(result) is called on the queue's thread after a success.
+        """
+        with self._lock:
+            for job_id in self._pending:
+                job = self._jobs[job_id]
+                if job['kind'] == kind:
+                    return dict(job)
+
+            job = {
+                'id': uuid.uuid4().hex[:12],
+                'kind': kind,
+                'state': QUEUED,
+                'submitted_at': time.time(),
+                'started_at': None,
+                'finished_at': None,
+                'wait_ms': None,
+                'duration_ms': None,
+                'result': None,
+                'error': None
+            }
+            self._jobs[job['id']] = job
+            self._pending.append(job['id'])
+            self._tasks[job['id']] = (function, args, guard, on_done)
+            self._prune()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='job-queue', daemon=True)
+                self._thread.start()
+            self._wakeup.notify()
+            logger.info(f"Queued {kind} job {job['id']}")
+            return dict(job)
+
+    def _prune(self):
+        """Forget the oldest finished jobs beyond `keep`"""
+        finished = [job_id for job_id, job in self._jobs.items() if job['state'] in (SUCCEEDED, FAILED)]
+        for job_id in finished[:max(0, len(finished) - self.keep)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                raise ValueError(f"Unknown job: {job_id}")
+            return dict(job)
+
+    def list(self):
+        """Jobs, newest first"""
+        with self._lock:
+            return [dict(job) for job in reversed(self._jobs.values())]
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while not self._pending:
+                    self._wakeup.wait()
+                job_id = self._pending.popleft()
+                job = self._jobs[job_id]
+                function, args, guard, on_done = self._tasks.pop(job_id)
+                job['state'] = RUNNING
+                job['started_at'] = time.time()
+                job['wait_ms'] = round((job['started_at'] - job['submitted_at']) * 1000, 3)
+
+            logger.info(f"Running {job['kind']} job {job_id}")
+            started = time.perf_counter()
+            try:
+                if guard is not None:
+                    with guard():
+                        result = self._execute(function, args)
+                else:
+                    result = self._execute(function, args)
+                if on_done is not None:
+                    on_done(result)
+            except Exception as e:
+                logger.exception(f"{job['kind']} job {job_id} failed")
+                state, result, error = FAILED, None, str(e) or type(e).__name__
+            else:
+                state, error = SUCCEEDED, None
+
+            with self._lock:
+                job['state'] = state
+                job['result'] = result
+                job['error'] = error
+                job['finished_at'] = time.time()
+                job['duration_ms'] = round((time.perf_counter() - started) * 1000, 3)
+                if state == SUCCEEDED:
+                    self.succeeded += 1
+                else:
+                    self.failed += 1
+            logger.info(f"{job['kind']} job {job_id} {state} in {job['duration_ms']:.0f} ms")
+
+    def _execute(self, function, args):
+        if not self.use_processes:
+            return function(*args)
+        # A fresh interpreter running this file, rather than multiprocessing: spawn would
+        # re-import the app's __main__ in the child and fork is unsafe with the app's threads
+        completed = subprocess.run([sys.executable, os.path.abspath(__file__)],
+                                   input=pickle.dumps((function, args)), stdout=subprocess.PIPE)
+        if completed.returncode != 0 or not completed.stdout:
+            raise RuntimeError(f"Job process exited with status {completed.returncode}")
+        succeeded, value = pickle.loads(completed.stdout)
+        if not succeeded:
+            raise value
+        return value
+
+    def stats(self):
+        with self._lock:
+            return {
+                "mode": "process" if self.use_processes else "thread",
+                "queued": len(self._pending),
+                "running": sum(1 for job in self._jobs.values() if job['state'] == RUNNING),
+                "succeeded": self.succeeded,
+                "failed": self.failed
+            }
+
+
+def _run_job_process():
+    """Job process: run the pickled (function, args) from stdin, pickle (succeeded, result or error) to stdout"""
+    output = sys.stdout.buffer
+    # Anything the job prints goes to stderr so it cannot corrupt the result
+    sys.stdout = sys.stderr
+    function, args = pickle.load(sys.stdin.buffer)
+    try:
+        outcome = (True, function(*args))
+    except Exception as e:
+        outcome = (False, e)
+    try:
+        payload = pickle.dumps(outcome)
+    except Exception as e:
+        payload = pickle.dumps((False, RuntimeError(f"Job outcome could not be returned: {e}")))
+    output.write(payload)
+    output.flush()
+
+
+if __name__ == '__main__':
+    _run_job_process()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Request and data-reload metrics in Prometheus text format
+Recording is a couple of dict lookups and a bisect under one lock, cheap
+enough to leave on in production; metrics are per worker process
+"""
+
+import threading
+import time
+from bisect import bisect_left
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Upper bounds (bytes) of the response size histogram buckets
+SIZE_BUCKETS = (128, 512, 2048, 8192, 32768, 131072, 524288, 2097152, 8388608)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values, extra=''):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_bound(bound):
+    return '+Inf' if bound == float('inf') else repr(float(bound))
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name, label_names, label_values):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            cumulative += count
+            le = f'le="{_format_bound(bound)}"'
+            lines.append(f'{name}_bucket{_labels(label_names, label_values, le)} {cumulative}')
+        lines.append(f'{name}_sum{_labels(label_names, label_values)} {self.sum!r}')
+        lines.append(f'{name}_count{_labels(label_names, label_values)} {self.count}')
+        return lines
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.time()
+        # (method, route) -> Histogram
+        self.latency = {}
+        self.sizes = {}
+        # (method, route, status) -> count
+        self.requests = {}
+        # (method, route, kind) -> count; kind is the exception type or '5xx'
+        self.errors = {}
+        self.reloads = Histogram(LATENCY_BUCKETS)
+
+    def observe_request(self, method, route, status, seconds, size=None, exception=None):
+        """Record one finished request; size is None for streamed bodies"""
+        key = (method, route)
+        with self._lock:
+            histogram = self.latency.get(key)
+            if histogram is None:
+                histogram = self.latency[key] = Histogram(LATENCY_BUCKETS)
+            histogram.observe(seconds)
+
+            if size is not None:
+                histogram = self.sizes.get(key)
+                if histogram is None:
+                    histogram = self.sizes[key] = Histogram(SIZE_BUCKETS)
+                histogram.observe(size)
+
+            status_key = (method, route, str(status))
+            self.requests[status_key] = self.requests.get(status_key, 0) + 1
+
+            if exception is not None or status >= 500:
+                error_key = (method, route, exception or '5xx')
+                self.errors[error_key] = self.errors.get(error_key, 0) + 1
+
+    def observe_reload(self, seconds):
+        with self._lock:
+            self.reloads.observe(seconds)
+
+    def render(self, extra=()):
+        """Prometheus text exposition; extra is a sequence of (name, type, help, value) to append"""
+        lines = []
+        with self._lock:
+            lines += ['# HELP http_request_duration_seconds Request latency by route',
+                      '# TYPE http_request_duration_seconds histogram']
+            for (method, route), histogram in sorted(self.latency.items()):
+                lines += histogram.render('http_request_duration_seconds', ('method', 'route'), (method, route))
+
+            lines += ['# HELP http_response_size_bytes Response body size by route',
+                      '# TYPE http_response_size_bytes histogram']
+            for (method, route), histogram in sorted(self.sizes.items()):
+                lines += histogram.render('http_response_size_bytes', ('method', 'route'), (method, route))
+
+            lines += ['# HELP http_requests_total Requests by route and status code',
+                      '# TYPE http_requests_total counter']
+            for key, count in sorted(self.requests.items()):
+                lines.append(f'http_requests_total{_labels(("method", "route", "status"), key)} {count}')
+
+            lines += ['# HELP http_request_errors_total Server errors by route and exception type',
+                      '# TYPE http_request_errors_total counter']
+            for key, count in sorted(self.errors.items()):
+                lines.append(f'http_request_errors_total{_labels(("method", "route", "error"), key)} {count}')
+
+            lines += ['# HELP data_reload_duration_seconds Time to load a new data snapshot',
+                      '# TYPE data_reload_duration_seconds histogram']
+            lines += self.reloads.render('data_reload_duration_seconds', (), ())
+
+        lines += ['# HELP process_start_time_seconds Start time of the worker process',
+                  '# TYPE process_start_time_seconds gauge',
+                  f'process_start_time_seconds {self.started!r}']
+        for name, kind, help_text, value in extra:
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} {kind}', f'{name} {value}']
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Reverse index over the parts catalog
+Maps normalized part names to every (make, model, category) that carries
+them. Lookups are fuzzy per word: each query word is matched against the
+(small) word vocabulary by exact, prefix or trigram similarity, and the
+candidate parts are found by intersecting the word postings.
+"""
+
+import re
+from bisect import bisect_left
+from collections import Counter
+
+TOKEN_RE = re.compile(r'[^\W_]+')
+
+# Minimum score for a part to be returned
+MIN_SCORE = 0.35
+
+# Minimum trigram similarity for a vocabulary word to count as a misspelling of a query word
+MIN_WORD_SIMILARITY = 0.4
+
+
+def normalize_part_name(name):
+    """Lowercase alphanumeric tokens with simple plural folding ('Rotors' -> 'rotor')"""
+    tokens = []
+    for token in TOKEN_RE.findall(str(name).lower()):
+        if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+            token = token[:-1]
+        tokens.append(token)
+    return ' '.join(tokens)
+
+
+def trigrams(word):
+    padded = f'  {word}  '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def iter_parts(parts_catalog):
+    """Yield (make, model, category, part) for every part; non-part sections like Services are skipped"""
+    for make, models in parts_catalog.items():
+        if not isinstance(models, dict):
+            continue
+        for model, categories in models.items():
+            if not isinstance(categories, dict):
+                continue
+            for category, parts in categories.items():
+                if isinstance(parts, list):
+                    for part in parts:
+                        yield make, model, category, part
+
+
+class PartIndex:
+    def __init__(self, parts_catalog=None):
+        # normalized name -> {'name': display name, 'words': tuple, 'locations': set of (make, model, category)}
+        self.entries = {}
+        # word -> set of normalized names containing it
+        self.words = {}
+        # trigram -> set of words, for misspelled query words
+        self.word_grams = {}
+        self._sorted_words = None
+
+        keys = {}
+        for make, model, category, part in iter_parts(parts_catalog or {}):
+            key = keys.get(part)
+            if key is None:
+                key = keys[part] = normalize_part_name(part)
+            self._add(make, model, category, part, key, copy_on_write=False)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _add(self, make, model, category, part, key=None, copy_on_write=True):
+        if key is None:
+            key = normalize_part_name(part)
+        if not key:
+            return
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = {'name': str(part), 'words': tuple(key.split()), 'locations': set()}
+            for word in set(entry['words']):
+                names = self.words.get(word)
+                if names is None:
+                    self.words[word] = {key}
+                    self._add_word(word, copy_on_write)
+                elif copy_on_write:
+                    self.words[word] = names | {key}
+                else:
+                    names.add(key)
+        elif copy_on_write:
+            entry = dict(entry, locations=set(entry['locations']))
+        entry['locations'].add((make, model, category))
+        self.entries[key] = entry
+
+    def _add_word(self, word, copy_on_write):
+        self._sorted_words = None
+        for gram in trigrams(word):
+            words = self.word_grams.get(gram)
+            if words is None:
+                self.word_grams[gram] = {word}
+            elif copy_on_write:
+                self.word_grams[gram] = words | {word}
+            else:
+                words.add(word)
+
+    def _remove(self, make, model, category, part):
+        key = normalize_part_name(part)
+        entry = self.entries.get(key)
+        if entry is None or (make, model, category) not in entry['locations']:
+            return
+        locations = entry['locations'] - {(make, model, category)}
+        if locations:
+            self.entries[key] = dict(entry, locations=locations)
+            return
+        del self.entries[key]
+        for word in set(entry['words']):
+            names = self.words.get(word, set()) - {key}
+            if names:
+                self.words[word] = names
+                continue
+            self.words.pop(word, None)
+            self._sorted_words = None
+            for gram in trigrams(word):
+                words = self.word_grams.get(gram, set()) - {word}
+                if words:
+                    self.word_grams[gram] = words
+                else:
+                    self.word_grams.pop(gram, None)
+
+    def apply_changes(self, ops):
+        """New index with add_part/delete_part mutations applied; self is left untouched"""
+        index = PartIndex()
+        index.entries = dict(self.entries)
+        index.words = dict(self.words)
+        index.word_grams = dict(self.word_grams)
+        for op in ops:
+            if op['op'] == 'batch':
+                index = index.apply_changes(op['ops'])
+            elif op['op'] == 'add_part':
+                index._add(op['make'], op['model'], op['category'], op['part'])
+            elif op['op'] == 'delete_part':
+                index._remove(op['make'], op['model'], op['category'], op['part'])
+        return index
+
+    def _similar_words(self, word):
+        """{vocabulary word: similarity} for one query word"""
+        matches = {}
+        sorted_words = self._sorted_words
+        if sorted_words is None:
+            sorted_words = self._sorted_words = sorted(self.words)
+
+        # Exact and prefix matches ('rotor', 'rot' -> 'rotor')
+        i = bisect_left(sorted_words, word)
+        while i < len(sorted_words) and sorted_words[i].startswith(word):
+            candidate = sorted_words[i]
+            matches[candidate] = 1.0 if candidate == word else 0.9
+            i += 1
+
+        # Misspellings ('filtr' -> 'filter'); numbers only match exactly or by prefix
+        if not word.isdigit():
+            grams = trigrams(word)
+            shared = Counter()
+            for gram in grams:
+                for candidate in self.word_grams.get(gram, ()):
+                    shared[candidate] += 1
+            for candidate, count in shared.items():
+                if candidate in matches:
+                    continue
+                similarity = count / (len(grams) + len(trigrams(candidate)) - count)
+                if similarity >= MIN_WORD_SIMILARITY:
+                    matches[candidate] = 0.85 * similarity
+        return matches
+
+    def search(self, query, make=None, model=None, category=None, limit=None, min_score=MIN_SCORE):
+        """Fuzzy part lookup, best matches first
+
+        A part scores the mean similarity of its best matching word for each
+        query word, slightly favouring names without extra words.
+        """
+        query_words = normalize_part_name(query).split()
+        if not query_words:
+            return []
+
+        word_matches = [self._similar_words(word) for word in query_words]
+        candidates = None
+        for matches in word_matches:
+            if not matches:
+                # An unknown word lowers the score but does not rule parts out
+                continue
+            names = set().union(*(self.words[word] for word in matches))
+            candidates = names if candidates is None else candidates & names
+        if not candidates:
+            return []
+
+        results = []
+        for name in candidates:
+            entry = self.entries[name]
+            words = entry['words']
+            total = 0.0
+            for matches in word_matches:
+                total += max((matches.get(word, 0.0) for word in words), default=0.0)
+            coverage = min(1.0, len(query_words) / len(words))
+            score = total / len(query_words) * (0.8 + 0.2 * coverage)
+            if score < min_score:
+                continue
+
+            locations = entry['locations']
+            if make is not None or model is not None or category is not None:
+                locations = [
+                    location for location in locations
+                    if (make is None or location[0].lower() == make.lower())
+                    and (model is None or location[1].lower() == model.lower())
+                    and (category is None or location[2].lower() == category.lower())
+                ]
+            if locations:
+                results.append((score, entry['name'], locations))
+
+        results.sort(key=lambda result: (-result[0], result[1]))
+        if limit is not None:
+            results = results[:limit]
+        return [
+            {
+                'part': part,
+                'score': round(score, 3),
+                'locations': [{'make': mk, 'model': md, 'category': cat} for mk, md, cat in sorted(locations)]
+            }
+            for score, part, locations in results
+        ]
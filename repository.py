@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+In-memory repository over InventoryManager
+Keeps parsed inventory and parts data and only re-reads a file after it changes
+"""
+
+import threading
+import logging
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class InventoryRepository:
+    def __init__(self, inventory_manager):
+        self.inventory_manager = inventory_manager
+        self._lock = threading.Lock()
+        self._documents = {}
+        # Recent (stamp before, stamp after, ops) per file for incremental index updates
+        self._changes = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, file_path):
+        """Return (stamp, data) for file_path, reading from disk only after a change"""
+        stamp = self.inventory_manager.file_stamp(file_path)
+        cached = self._documents.get(file_path)
+        if cached is not None and cached[0] == stamp:
+            self.hits += 1
+            return cached
+
+        with self._lock:
+            cached = self._documents.get(file_path)
+            if cached is not None and cached[0] == stamp:
+                self.hits += 1
+                return cached
+
+            # Stamp is taken before reading so a concurrent write is seen on the next call
+            data = self.inventory_manager.load_json(file_path)
+            if not isinstance(data, dict):
+                data = {}
+            cached = (stamp, data)
+            self._documents[file_path] = cached
+            self.misses += 1
+            return cached
+
+    def inventory(self):
+        return self.get(self.inventory_manager.inventory_file)
+
+    def parts(self):
+        return self.get(self.inventory_manager.parts_file)
+
+    def changes_between(self, file_path, from_stamp, to_stamp):
+        """Ops that turned file_path from from_stamp into to_stamp, or None if unknown
+
+        Only writes made through this repository are recorded; a gap in the
+        chain (another worker, an import or a journal compaction) means the
+        caller has to rebuild from the full document.
+        """
+        ops = []
+        stamp = from_stamp
+        for before, after, applied in list(self._changes.get(file_path, ())):
+            if stamp == to_stamp:
+                break
+            if before == stamp:
+                ops.extend(applied)
+                stamp = after
+        return ops if stamp == to_stamp else None
+
+    def _record(self, file_path, changes):
+        log = self._changes.setdefault(file_path, deque(maxlen=64))
+        log.extend(changes)
+
+    def invalidate(self, file_path=None):
+        """Drop cached data for file_path (or everything)"""
+        with self._lock:
+            if file_path is None:
+                self._documents.clear()
+            else:
+                self._documents.pop(file_path, None)
+            self.invalidations += 1
+
+    # Writes go through the manager and invalidate the affected document
+    def add_vehicle(self, make, model, year, attributes=None):
+        result = self.inventory_manager.add_vehicle(make, model, year, attributes)
+        self.invalidate(self.inventory_manager.inventory_file)
+        return result
+
+    def update_vehicle(self, make, model, fields):
+        result = self.inventory_manager.update_vehicle(make, model, fields)
+        self.invalidate(self.inventory_manager.inventory_file)
+        return result
+
+    def delete_vehicle(self, make, model):
+        result = self.inventory_manager.delete_vehicle(make, model)
+        self.invalidate(self.inventory_manager.inventory_file)
+        return result
+
+    def add_part(self, make, model, category, part):
+        changes = []
+        result = self.inventory_manager.add_part(make, model, category, part, changes)
+        self._record(self.inventory_manager.parts_file, changes)
+        self.invalidate(self.inventory_manager.parts_file)
+        return result
+
+    def delete_part(self, make, model, category, part):
+        changes = []
+        result = self.inventory_manager.delete_part(make, model, category, part, changes)
+        self._record(self.inventory_manager.parts_file, changes)
+        self.invalidate(self.inventory_manager.parts_file)
+        return result
+
+    def apply_bulk(self, operations):
+        """All-or-nothing batch of vehicle and part operations; returns (committed, results)"""
+        changes = {}
+        result = self.inventory_manager.apply_bulk(operations, changes)
+        for file_path, file_changes in changes.items():
+            self._record(file_path, file_changes)
+            self.invalidate(file_path)
+        return result
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "cached_documents": len(self._documents)
+        }
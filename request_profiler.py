@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Request profiling for the admin panel
+Two kinds of capture end up in one ring buffer:
+
+- 'profile': cProfile output for requests an admin asked to profile (the
+  next N requests under a path prefix), downloadable as a .prof file.
+- 'slow': any request slower than a threshold, once slow capture is
+  switched on. While requests are in flight a sampler thread records
+  their stacks every few milliseconds; the samples are kept as a stack
+  profile (folded stacks, the format flame graph tools read) only when
+  the request turns out to be slow.
+
+The sampler thread only runs while slow capture is on or a profiling
+session is active, and exits once both are off and no sampled request is
+still running.
+
+Captures are per process; each worker keeps its own.
+"""
+
+import cProfile
+import io
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Suggested threshold when slow-request capture is switched on
+DEFAULT_SLOW_MS = 1000
+
+# Seconds between stack samples of in-flight requests
+SAMPLE_INTERVAL = 0.005
+
+# Captures kept (oldest dropped first)
+DEFAULT_CAPACITY = 50
+
+# Deepest stack recorded per sample
+MAX_STACK_DEPTH = 64
+
+# Longest request body kept with a capture
+MAX_BODY_CHARS = 2000
+
+
+def _folded_stack(frame):
+    """One sample as 'outer;...;inner' with function (file:line) entries"""
+    entries = []
+    while frame is not None and len(entries) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        entries.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ';'.join(reversed(entries))
+
+
+class _InFlight:
+    """Bookkeeping for one request while it runs"""
+
+    def __init__(self, profile):
+        self.started = time.perf_counter()
+        self.cpu_started = time.thread_time()
+        self.started_at = time.time()
+        self.profile = profile
+        self.samples = Counter()
+
+
+class RequestProfiler:
+    def __init__(self, slow_ms=None, capacity=DEFAULT_CAPACITY, sample_interval=SAMPLE_INTERVAL):
+        # Requests at least this slow are captured; None (or 0) leaves slow-request capture off
+        self.slow_ms = slow_ms or None
+        self.sample_interval = sample_interval
+        self.captures = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        # Requests being sampled, by thread ident
+        self._in_flight = {}
+        # Set while there are requests to sample, or to wake an idle sampler so it can exit
+        self._busy = threading.Event()
+        self._sampler = None
+        # On-demand profiling switch: profile the next profile_remaining requests under profile_prefix
+        self.profile_prefix = None
+        self.profile_remaining = 0
+        self.slow_captured = 0
+        self.profiled = 0
+
+    def enable_profiling(self, prefix='/', count=10):
+        """Profile the next count requests whose path starts with prefix"""
+        if count < 1:
+            raise ValueError("'count' must be a positive integer")
+        if not prefix.startswith('/'):
+            raise ValueError("'prefix' must start with /")
+        with self._lock:
+            self.profile_prefix = prefix
+            self.profile_remaining = count
+        logger.info(f"Profiling the next {count} requests under {prefix}")
+
+    def disable_profiling(self):
+        with self._lock:
+            self.profile_prefix = None
+            self.profile_remaining = 0
+            self._wake_idle_sampler()
+
+    def set_slow_ms(self, slow_ms):
+        """Capture requests at least slow_ms long; None or 0 switches slow-request capture off"""
+        if slow_ms is not None and slow_ms < 0:
+            raise ValueError("'slow_ms' must not be negative")
+        with self._lock:
+            self.slow_ms = slow_ms or None
+            self._wake_idle_sampler()
+        if slow_ms:
+            logger.info(f"Capturing requests slower than {slow_ms} ms")
+        else:
+            logger.info("Slow-request capture switched off")
+
+    def _sampling(self):
+        """True while slow capture is on or a profiling session is active (caller holds the lock)"""
+        return self.slow_ms is not None or self.profile_remaining > 0
+
+    def _wake_idle_sampler(self):
+        """Let a sampler with nothing left to do notice and exit (caller holds the lock)"""
+        if not self._in_flight and not self._sampling():
+            self._busy.set()
+
+    def start(self, path):
+        """Begin tracking the current thread's request; returns a token for finish(), or None when nothing is captured"""
+        profile = None
+        with self._lock:
+            if self.profile_remaining and path.startswith(self.profile_prefix):
+                self.profile_remaining -= 1
+                profile = cProfile.Profile()
+            elif self.slow_ms is None:
+                # Neither profiled nor a candidate slow capture
+                return None
+            request = _InFlight(profile)
+            self._in_flight[threading.get_ident()] = request
+            if self._sampler is None:
+                self._sampler = threading.Thread(target=self._sample, name='request-sampler', daemon=True)
+                self._sampler.start()
+            self._busy.set()
+        if profile is not None:
+            profile.enable()
+        return request
+
+    def finish(self, request, details):
+        """Stop tracking; keeps a capture if the request was profiled or slow
+
+        details describes the request (method, path, endpoint, status,
+        arguments) and is stored with the capture as is.
+        """
+        if request.profile is not None:
+            request.profile.disable()
+        duration_ms = (time.perf_counter() - request.started) * 1000
+        cpu_ms = (time.thread_time() - request.cpu_started) * 1000
+        with self._lock:
+            if self._in_flight.pop(threading.get_ident(), None) is not None and not self._in_flight:
+                self._busy.clear()
+                self._wake_idle_sampler()
+
+        slow = self.slow_ms is not None and duration_ms >= self.slow_ms
+        if request.profile is None and not slow:
+            return None
+
+        capture = dict(details)
+        capture.update({
+            'id': uuid.uuid4().hex[:12],
+            'kind': 'profile' if request.profile is not None else 'slow',
+            'pid': os.getpid(),
+            'started_at': request.started_at,
+            'duration_ms': round(duration_ms, 3),
+            'cpu_ms': round(cpu_ms, 3),
+            'samples': sum(request.samples.values()),
+            'stacks': dict(request.samples)
+        })
+        if request.profile is not None:
+            request.profile.create_stats()
+            # Same bytes as Profile.dump_stats, readable with pstats.Stats(path)
+            capture['pstats'] = marshal.dumps(request.profile.stats)
+
+        with self._lock:
+            self.captures.append(capture)
+            if request.profile is not None:
+                self.profiled += 1
+            else:
+                self.slow_captured += 1
+        if slow:
+            logger.warning(f"Slow request {capture.get('method')} {capture.get('path')}: {duration_ms:.0f} ms")
+        return capture
+
+    def _sample(self):
+        """Record the stack of every in-flight request; idles while none are running and exits once sampling is off
+
+        Stacks are built without the lock, which is only taken to list the
+        requests and to merge the counts, so start() and finish() never
+        wait on a stack walk.
+        """
+        own_ident = threading.get_ident()
+        while True:
+            self._busy.wait()
+            with self._lock:
+                if not self._in_flight:
+                    self._busy.clear()
+                    if not self._sampling():
+                        self._sampler = None
+                        return
+                    continue
+                requests = list(self._in_flight.items())
+
+            frames = sys._current_frames()
+            stacks = []
+            for ident, request in requests:
+                frame = frames.get(ident)
+                if frame is not None and ident != own_ident:
+                    stacks.append((request, _folded_stack(frame)))
+            # Drop the frame references before sleeping
+            frames = frame = None
+
+            with self._lock:
+                for request, stack in stacks:
+                    request.samples[stack] += 1
+            time.sleep(self.sample_interval)
+
+    def list(self):
+        """Captures, newest first"""
+        with self._lock:
+            return list(reversed(self.captures))
+
+    def get(self, capture_id):
+        for capture in self.list():
+            if capture['id'] == capture_id:
+                return capture
+        raise ValueError(f"Unknown capture: {capture_id}")
+
+    def stats(self):
+        return {
+            "slow_ms": self.slow_ms,
+            "profile_prefix": self.profile_prefix,
+            "profile_remaining": self.profile_remaining,
+            "captures": len(self.captures),
+            "profiled": self.profiled,
+            "slow_captured": self.slow_captured,
+            "sampler_running": self._sampler is not None
+        }
+
+
+class _SavedProfile:
+    """Stands in for a finished Profile so pstats can read stored stats"""
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+
+def top_functions(capture, sort='cumulative', limit=30):
+    """pstats report of a profiled capture, as text"""
+    output = io.StringIO()
+    stats = pstats.Stats(_SavedProfile(marshal.loads(capture['pstats'])), stream=output)
+    stats.sort_stats(sort).print_stats(limit)
+    return output.getvalue()
+
+
+def folded_stacks(capture):
+    """Stack samples in folded format ('outer;...;inner count' per line), heaviest first"""
+    stacks = sorted(capture['stacks'].items(), key=lambda item: -item[1])
+    return ''.join(f"{stack} {count}\n" for stack, count in stacks)
+
+
+def hot_frames(capture, limit=20):
+    """Innermost frames by share of samples: [(frame, samples, percent)]"""
+    total = capture['samples']
+    leaves = Counter()
+    for stack, count in capture['stacks'].items():
+        leaves[stack.rsplit(';', 1)[-1]] += count
+    return [(frame, count, round(count * 100 / total, 1)) for frame, count in leaves.most_common(limit)] if total else []
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Cache of serialized (and gzip compressed) API responses
+Entries are dropped when the data snapshot changes, so serialization runs once per data change
+"""
+
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+
+from flask import Response
+
+# Bodies smaller than this are not worth compressing
+MIN_GZIP_SIZE = 512
+
+
+class CachedResponse:
+    def __init__(self, body, mimetype):
+        self.body = body
+        self.mimetype = mimetype
+        self.etag = hashlib.sha1(body).hexdigest()
+        self.gzip_body = gzip.compress(body, mtime=0) if len(body) >= MIN_GZIP_SIZE else None
+
+    def to_response(self, request):
+        """Build a response for request, answering conditional GETs with 304"""
+        if request.if_none_match.contains(self.etag):
+            response = Response(status=304)
+        elif self.gzip_body is not None and request.accept_encodings.quality('gzip') > 0:
+            response = Response(self.gzip_body, mimetype=self.mimetype)
+            response.headers['Content-Encoding'] = 'gzip'
+        else:
+            response = Response(self.body, mimetype=self.mimetype)
+
+        response.set_etag(self.etag)
+        response.headers['Vary'] = 'Accept-Encoding'
+        return response
+
+
+class ResponseCache:
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.generation = None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, generation, key, build):
+        """Return the cached response for key, calling build() to create it on a miss
+
+        generation is the snapshot generation the request is served from; a
+        newer generation drops every entry, an older one is never cached.
+        """
+        with self._lock:
+            if self.generation is None or generation > self.generation:
+                self._entries.clear()
+                self.generation = generation
+            entry = self._entries.get(key) if generation == self.generation else None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+
+        response = build()
+        entry = CachedResponse(response.get_data(), response.mimetype)
+
+        with self._lock:
+            self.misses += 1
+            if generation == self.generation:
+                self._entries[key] = entry
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries)
+        }
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Inverted search index for the vehicle inventory
+Built once per data load and shared by the API and Vapi search endpoints
+"""
+
+import re
+from bisect import bisect_left
+
+TOKEN_RE = re.compile(r'[^\W_]+')
+
+MATCH_MODES = ('phrase', 'all')
+
+# Upper bound on cached per-term lookups
+TERM_CACHE_SIZE = 1024
+
+# Longest vocabulary substring indexed for infix lookups
+NGRAM_SIZE = 3
+
+# Relevance weights for how a query term matched a document token
+EXACT_WEIGHT = 3
+PREFIX_WEIGHT = 2
+INFIX_WEIGHT = 1
+NAME_BONUS = 2
+
+
+def tokenize(text):
+    """Split lowercased text into alphanumeric tokens"""
+    return TOKEN_RE.findall(text.lower())
+
+
+def ngrams(token):
+    """Distinct substrings of token up to NGRAM_SIZE characters long"""
+    return {token[i:i + size] for size in range(1, NGRAM_SIZE + 1) for i in range(len(token) - size + 1)}
+
+
+class SearchDocument:
+    def __init__(self, doc_id, make, model, data):
+        self.doc_id = doc_id
+        self.make = make
+        self.model = model
+        self.data = data
+        # Same text the original substring matcher scanned
+        self.text = f"{make} {model} {data.get('description', '')} {data.get('category', '')} {' '.join(data.get('features', []))}".lower()
+        self.tokens = set(tokenize(self.text))
+        self.name_tokens = set(tokenize(f"{make} {model}"))
+
+
+class SearchIndex:
+    def __init__(self, inventory):
+        self.documents = []
+        self.postings = {}
+
+        for make, models in inventory.items():
+            if not isinstance(models, dict):
+                continue
+            for model, data in models.items():
+                if not isinstance(data, dict):
+                    continue
+                doc = SearchDocument(len(self.documents), make, model, data)
+                self.documents.append(doc)
+                for token in doc.tokens:
+                    self.postings.setdefault(token, set()).add(doc.doc_id)
+
+        # Sorted vocabulary for prefix lookups
+        self.vocabulary = sorted(self.postings)
+        # Short substrings -> vocabulary tokens containing them, for infix lookups
+        self.ngrams = {}
+        for token in self.vocabulary:
+            for gram in ngrams(token):
+                self.ngrams.setdefault(gram, set()).add(token)
+        self._term_cache = {}
+
+    def __len__(self):
+        return len(self.documents)
+
+    def _prefix_tokens(self, term):
+        """Vocabulary tokens starting with term"""
+        tokens = []
+        i = bisect_left(self.vocabulary, term)
+        while i < len(self.vocabulary) and self.vocabulary[i].startswith(term):
+            tokens.append(self.vocabulary[i])
+            i += 1
+        return tokens
+
+    def _infix_tokens(self, term):
+        """Vocabulary tokens containing term, narrowed by the term's n-grams"""
+        if len(term) <= NGRAM_SIZE:
+            return self.ngrams.get(term, set())
+        grams = sorted((self.ngrams.get(term[i:i + NGRAM_SIZE], set())
+                        for i in range(len(term) - NGRAM_SIZE + 1)), key=len)
+        tokens = set(grams[0])
+        for gram_tokens in grams[1:]:
+            if not tokens:
+                break
+            tokens &= gram_tokens
+        return {token for token in tokens if term in token}
+
+    def _term_matches(self, term):
+        """Map of doc_id -> best match weight for a single query term"""
+        cached = self._term_cache.get(term)
+        if cached is not None:
+            return cached
+
+        matches = {}
+        prefix_tokens = set(self._prefix_tokens(term))
+        for token in prefix_tokens:
+            weight = EXACT_WEIGHT if token == term else PREFIX_WEIGHT
+            for doc_id in self.postings[token]:
+                if matches.get(doc_id, 0) < weight:
+                    matches[doc_id] = weight
+
+        # Infix matches ("150" inside "f150")
+        for token in self._infix_tokens(term) - prefix_tokens:
+            for doc_id in self.postings[token]:
+                matches.setdefault(doc_id, INFIX_WEIGHT)
+
+        if len(self._term_cache) >= TERM_CACHE_SIZE:
+            self._term_cache.clear()
+        self._term_cache[term] = matches
+        return matches
+
+    def _score(self, doc, term_matches, terms):
+        score = 0
+        for term, matches in zip(terms, term_matches):
+            score += matches.get(doc.doc_id, 0)
+            if any(token.startswith(term) for token in doc.name_tokens):
+                score += NAME_BONUS
+        return score
+
+    def search(self, query, match='phrase', limit=None, ranked=False):
+        """
+        Find documents matching query.
+
+        match='phrase' keeps the original semantics (query is a substring of the
+        searchable text); match='all' requires every whitespace separated term
+        to match somewhere (AND). Results are returned in inventory order unless
+        ranked is set, in which case higher scoring documents come first.
+        """
+        if match not in MATCH_MODES:
+            raise ValueError(f"Unknown match mode: {match}")
+
+        query = query.lower()
+        terms = tokenize(query)
+
+        if not terms:
+            # Nothing to look up (e.g. punctuation only), fall back to a scan
+            candidates = [doc for doc in self.documents if query in doc.text]
+            return candidates[:limit] if limit is not None else candidates
+
+        term_matches = [self._term_matches(term) for term in terms]
+        candidate_ids = set(term_matches[0])
+        for matches in term_matches[1:]:
+            candidate_ids &= matches.keys()
+            if not candidate_ids:
+                return []
+
+        candidates = [self.documents[doc_id] for doc_id in sorted(candidate_ids)]
+
+        if match == 'phrase':
+            candidates = [doc for doc in candidates if query in doc.text]
+        else:
+            words = query.split()
+            candidates = [doc for doc in candidates if all(word in doc.text for word in words)]
+
+        if ranked:
+            scores = {doc.doc_id: self._score(doc, term_matches, terms) for doc in candidates}
+            candidates.sort(key=lambda doc: (-scores[doc.doc_id], doc.doc_id))
+
+        if limit is not None:
+            candidates = candidates[:limit]
+        return candidates
@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""
+SQLite storage for inventory and parts data
+An alternative to the JSON files: vehicles, model-year ranges and parts are
+indexed rows in one WAL-mode database, and every admin mutation is a short
+transaction touching only the affected rows.
+
+Documents are still addressed by their JSON file path (data/inventory.json,
+data/parts_catalog.json) so the rest of the app does not change.
+"""
+
+import copy
+import json
+import sqlite3
+import threading
+import uuid
+from contextlib import contextmanager
+import logging
+
+from year_ranges import add_year, normalize_years
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS documents (name TEXT PRIMARY KEY, version INTEGER NOT NULL);
+
+-- data holds every field as JSON, with years as a null placeholder that keeps
+-- the field order (the ranges live in model_years); the columns are indexed copies
+CREATE TABLE IF NOT EXISTS vehicles (
+    id INTEGER PRIMARY KEY,
+    make TEXT NOT NULL,
+    model TEXT NOT NULL,
+    category TEXT,
+    status TEXT,
+    price_range TEXT,
+    data TEXT NOT NULL,
+    UNIQUE (make, model)
+);
+CREATE INDEX IF NOT EXISTS vehicles_by_category ON vehicles (category);
+CREATE INDEX IF NOT EXISTS vehicles_by_status ON vehicles (status);
+
+CREATE TABLE IF NOT EXISTS model_years (
+    make TEXT NOT NULL,
+    model TEXT NOT NULL,
+    year_from INTEGER NOT NULL,
+    year_to INTEGER NOT NULL,
+    PRIMARY KEY (make, model, year_from)
+);
+CREATE INDEX IF NOT EXISTS model_years_by_year ON model_years (year_from, year_to);
+
+CREATE TABLE IF NOT EXISTS parts (
+    id INTEGER PRIMARY KEY,
+    make TEXT NOT NULL,
+    model TEXT NOT NULL,
+    category TEXT NOT NULL,
+    part TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    UNIQUE (make, model, category, part)
+);
+CREATE INDEX IF NOT EXISTS parts_by_name ON parts (part);
+
+-- Top-level catalog sections that are not make -> model -> category -> parts (Services)
+CREATE TABLE IF NOT EXISTS sections (
+    document TEXT NOT NULL,
+    name TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (document, name)
+);
+
+-- Position (rowid) of every make, model, category and section key. Keys are
+-- added when first created and removed when emptied, which is the insertion
+-- order the JSON files keep.
+CREATE TABLE IF NOT EXISTS key_order (
+    document TEXT NOT NULL,
+    path TEXT NOT NULL,
+    PRIMARY KEY (document, path)
+);
+'''
+
+INVENTORY = 'inventory'
+PARTS = 'parts'
+
+# Sort key for keys without a key_order row; the sort is stable, so they keep their read order
+UNORDERED = float('inf')
+
+
+class _Rollback(Exception):
+    """Raised inside a transaction to discard it"""
+
+
+class SQLiteBackend:
+    """Storage backend: load, save, mutate_many and file_stamp keyed by document path"""
+
+    def __init__(self, db_file, inventory_file, parts_file):
+        self.db_file = db_file
+        self._documents = {inventory_file: INVENTORY, parts_file: PARTS}
+        self._lock = threading.RLock()
+        # Last loaded data per document with its stamp; kept current by our own writes
+        self._cache = {}
+        self._connection = sqlite3.connect(db_file, isolation_level=None, check_same_thread=False)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=FULL')
+        self._connection.execute('PRAGMA busy_timeout=5000')
+        self._connection.executescript(SCHEMA)
+        with self._transaction() as db:
+            db.execute("INSERT OR IGNORE INTO meta VALUES ('database_id', ?)", (uuid.uuid4().hex,))
+            for name in (INVENTORY, PARTS):
+                db.execute('INSERT OR IGNORE INTO documents VALUES (?, 0)', (name,))
+        self._database_id = self._connection.execute("SELECT value FROM meta WHERE key = 'database_id'").fetchone()[0]
+        self._backfill_key_order()
+
+    def _backfill_key_order(self):
+        """Record the current key order of databases written before key_order existed"""
+        with self._transaction() as db:
+            for document in (INVENTORY, PARTS):
+                if db.execute('SELECT version FROM documents WHERE name = ?', (document,)).fetchone()[0] == 0:
+                    continue
+                if db.execute('SELECT 1 FROM key_order WHERE document = ? LIMIT 1', (document,)).fetchone():
+                    continue
+                data = self._read_inventory() if document == INVENTORY else self._read_parts()
+                self._index_keys(db, document, data)
+
+    def is_new(self):
+        """True until either document is first written (a fresh, never migrated database)"""
+        with self._lock:
+            return self._connection.execute('SELECT MAX(version) FROM documents').fetchone()[0] == 0
+
+    @contextmanager
+    def _transaction(self):
+        """BEGIN IMMEDIATE ... COMMIT under the backend lock, rolled back on error"""
+        with self._lock:
+            self._connection.execute('BEGIN IMMEDIATE')
+            try:
+                yield self._connection
+            except BaseException:
+                self._connection.execute('ROLLBACK')
+                raise
+            self._connection.execute('COMMIT')
+
+    def _document(self, file_path):
+        try:
+            return self._documents[file_path]
+        except KeyError:
+            raise ValueError(f"Unknown document: {file_path}")
+
+    def _stamp(self, db, document):
+        version = db.execute('SELECT version FROM documents WHERE name = ?', (document,)).fetchone()[0]
+        return (self._database_id, version)
+
+    def file_stamp(self, file_path):
+        """(database id, document version); bumped by every write from any process"""
+        document = self._document(file_path)
+        with self._lock:
+            return self._stamp(self._connection, document)
+
+    def load(self, file_path):
+        document = self._document(file_path)
+        with self._lock:
+            # Read the stamp and rows in one read transaction so they agree
+            self._connection.execute('BEGIN')
+            try:
+                stamp = self._stamp(self._connection, document)
+                cached = self._cache.get(file_path)
+                if cached is None or cached[0] != stamp:
+                    data = self._read_inventory() if document == INVENTORY else self._read_parts()
+                    cached = self._cache[file_path] = (stamp, data)
+            finally:
+                self._connection.execute('COMMIT')
+            return copy.deepcopy(cached[1])
+
+    def save(self, data, file_path):
+        """Replace the whole document"""
+        document = self._document(file_path)
+        with self._transaction() as db:
+            db.execute('DELETE FROM key_order WHERE document = ?', (document,))
+            self._index_keys(db, document, data)
+            if document == INVENTORY:
+                db.execute('DELETE FROM vehicles')
+                db.execute('DELETE FROM model_years')
+                for make, models in data.items():
+                    for model, vehicle in models.items():
+                        self._put_vehicle(db, make, model, vehicle)
+            else:
+                db.execute('DELETE FROM parts')
+                db.execute('DELETE FROM sections WHERE document = ?', (PARTS,))
+                for make, models in data.items():
+                    if not _is_parts_section(models):
+                        db.execute('INSERT INTO sections VALUES (?, ?, ?)', (PARTS, make, json.dumps(models)))
+                        continue
+                    db.executemany(
+                        'INSERT OR IGNORE INTO parts (make, model, category, part, position) VALUES (?, ?, ?, ?, ?)',
+                        ((make, model, category, part, position)
+                         for model, categories in models.items()
+                         for category, parts in categories.items()
+                         for position, part in enumerate(parts)))
+            self._bump(db, document)
+            self._cache.pop(file_path, None)
+
+    def mutate_many(self, file_path, ops, changes=None):
+        """Apply mutations in one transaction; same results and changes contract as InventoryManager"""
+        from inventory_manager import apply_mutation
+
+        document = self._document(file_path)
+        with self._lock:
+            with self._transaction() as db:
+                before = self._stamp(db, document)
+                results = [self._apply(db, op) for op in ops]
+                applied = [op for op, result in zip(ops, results) if result]
+                after = self._bump(db, document) if applied else before
+
+            cached = self._cache.get(file_path)
+            if cached is not None and cached[0] == before:
+                # Keep the in-memory copy current instead of reading everything back
+                for op in applied:
+                    apply_mutation(cached[1], op)
+                self._cache[file_path] = (after, cached[1])
+            if changes is not None:
+                changes.append((before, after, applied))
+        return results
+
+    def apply_all(self, pairs, changes=None):
+        """Apply (file_path, op) pairs in one transaction, committed only if every op succeeds
+
+        Returns an outcome per pair: True, False (target missing) or the
+        exception raised. changes collects (before, after, applied ops) per file path.
+        """
+        from inventory_manager import apply_mutation
+
+        documents = {file_path: self._document(file_path) for file_path, op in pairs}
+        outcomes = []
+        with self._lock:
+            try:
+                with self._transaction() as db:
+                    before = {file_path: self._stamp(db, document) for file_path, document in documents.items()}
+                    for file_path, op in pairs:
+                        try:
+                            outcomes.append(self._apply(db, op))
+                        except (TypeError, ValueError) as e:
+                            outcomes.append(e)
+                    if not all(outcome is True for outcome in outcomes):
+                        raise _Rollback()
+                    after = {file_path: self._bump(db, document) for file_path, document in documents.items()}
+            except _Rollback:
+                return outcomes
+
+            for file_path in documents:
+                applied = [op for path, op in pairs if path == file_path]
+                cached = self._cache.get(file_path)
+                if cached is not None and cached[0] == before[file_path]:
+                    for op in applied:
+                        apply_mutation(cached[1], op)
+                    self._cache[file_path] = (after[file_path], cached[1])
+                if changes is not None:
+                    changes.setdefault(file_path, []).append((before[file_path], after[file_path], applied))
+        return outcomes
+
+    def _bump(self, db, document):
+        db.execute('UPDATE documents SET version = version + 1 WHERE name = ?', (document,))
+        return self._stamp(db, document)
+
+    def _apply(self, db, op):
+        """Single-row equivalent of apply_mutation"""
+        kind = op['op']
+        if kind == 'batch':
+            for item in op['ops']:
+                self._apply(db, item)
+            return True
+
+        make = op['make']
+        model = op['model']
+
+        if kind == 'put_vehicle':
+            self._add_keys(db, INVENTORY, make, model)
+            self._put_vehicle(db, make, model, op['data'])
+            return True
+
+        if kind == 'add_vehicle':
+            attributes = op['attributes']
+            self._add_keys(db, INVENTORY, make, model)
+            db.execute(
+                'INSERT OR IGNORE INTO vehicles (make, model, category, status, price_range, data) VALUES (?, ?, ?, ?, ?, ?)',
+                (make, model, attributes.get('category', ''), attributes.get('status', 'Available'),
+                 attributes.get('price_range', ''),
+                 json.dumps({
+                     'years': None,
+                     'category': attributes.get('category', ''),
+                     'description': attributes.get('description', f'{make} {model}'),
+                     'features': attributes.get('features', []),
+                     'price_range': attributes.get('price_range', ''),
+                     'status': attributes.get('status', 'Available')
+                 })))
+            self._write_years(db, make, model, add_year(self._read_years(db, make, model), op['year']))
+            return True
+
+        if kind == 'update_vehicle':
+            row = db.execute('SELECT data FROM vehicles WHERE make = ? AND model = ?', (make, model)).fetchone()
+            if row is None:
+                return False
+            data = json.loads(row[0])
+            data.update(op['fields'])
+            if 'years' in op['fields']:
+                self._write_years(db, make, model, normalize_years(data['years']))
+                data['years'] = None
+            self._write_vehicle_row(db, make, model, data)
+            return True
+
+        if kind == 'delete_vehicle':
+            deleted = db.execute('DELETE FROM vehicles WHERE make = ? AND model = ?', (make, model)).rowcount
+            db.execute('DELETE FROM model_years WHERE make = ? AND model = ?', (make, model))
+            if deleted:
+                self._drop_keys(db, INVENTORY, make, model)
+            return deleted > 0
+
+        if kind == 'add_part':
+            key = (make, model, op['category'])
+            self._add_keys(db, PARTS, *key)
+            positions = dict(db.execute(
+                'SELECT part, position FROM parts WHERE make = ? AND model = ? AND category = ?', key))
+            if op['part'] in positions:
+                return True
+            if 'position' in op:
+                ordered = sorted(positions, key=positions.get)
+                ordered.insert(op['position'], op['part'])
+            else:
+                # Admin adds keep the category sorted, as in the JSON files
+                ordered = sorted(list(positions) + [op['part']])
+            db.executemany('UPDATE parts SET position = ? WHERE make = ? AND model = ? AND category = ? AND part = ?',
+                           ((position,) + key + (part,) for position, part in enumerate(ordered)
+                            if part in positions and positions[part] != position))
+            db.execute('INSERT INTO parts (make, model, category, part, position) VALUES (?, ?, ?, ?, ?)',
+                       key + (op['part'], ordered.index(op['part'])))
+            return True
+
+        if kind == 'delete_part':
+            deleted = db.execute('DELETE FROM parts WHERE make = ? AND model = ? AND category = ? AND part = ?',
+                                 (make, model, op['category'], op['part'])).rowcount
+            if deleted:
+                self._drop_keys(db, PARTS, make, model, op['category'])
+            return deleted > 0
+
+        raise ValueError(f"Unknown mutation: {kind}")
+
+    def _add_keys(self, db, document, *keys):
+        """Give each key along the path a position unless it already has one"""
+        db.executemany('INSERT OR IGNORE INTO key_order VALUES (?, ?)',
+                       ((document, _key_path(keys[:depth])) for depth in range(1, len(keys) + 1)))
+
+    def _drop_keys(self, db, document, *keys):
+        """Forget the positions of the keys along the path that no longer hold any rows"""
+        table = 'vehicles' if document == INVENTORY else 'parts'
+        columns = ('make', 'model', 'category')
+        for depth in range(len(keys), 0, -1):
+            where = ' AND '.join(f'{column} = ?' for column in columns[:depth])
+            if db.execute(f'SELECT 1 FROM {table} WHERE {where} LIMIT 1', keys[:depth]).fetchone():
+                break
+            db.execute('DELETE FROM key_order WHERE document = ? AND path = ?', (document, _key_path(keys[:depth])))
+
+    def _index_keys(self, db, document, data):
+        for make, models in data.items():
+            self._add_keys(db, document, make)
+            if document == PARTS and not _is_parts_section(models):
+                continue
+            for model, value in models.items():
+                self._add_keys(db, document, make, model)
+                if document == PARTS:
+                    for category in value:
+                        self._add_keys(db, document, make, model, category)
+
+    def _key_order(self, document):
+        return dict(self._connection.execute('SELECT path, rowid FROM key_order WHERE document = ?', (document,)))
+
+    def _put_vehicle(self, db, make, model, vehicle):
+        data = dict(vehicle)
+        years = normalize_years(data.get('years') or [])
+        if 'years' in data:
+            data['years'] = None
+        self._write_vehicle_row(db, make, model, data)
+        self._write_years(db, make, model, years)
+
+    def _write_vehicle_row(self, db, make, model, data):
+        # Upsert keeps the row id, so the model keeps its position like a dict update would
+        db.execute(
+            'INSERT INTO vehicles (make, model, category, status, price_range, data) VALUES (?, ?, ?, ?, ?, ?) '
+            'ON CONFLICT (make, model) DO UPDATE SET category = excluded.category, status = excluded.status, '
+            'price_range = excluded.price_range, data = excluded.data',
+            (make, model, data.get('category'), data.get('status'), data.get('price_range'), json.dumps(data)))
+
+    def _read_years(self, db, make, model):
+        return [[start, end] for start, end in db.execute(
+            'SELECT year_from, year_to FROM model_years WHERE make = ? AND model = ? ORDER BY year_from',
+            (make, model))]
+
+    def _write_years(self, db, make, model, ranges):
+        db.execute('DELETE FROM model_years WHERE make = ? AND model = ?', (make, model))
+        db.executemany('INSERT INTO model_years VALUES (?, ?, ?, ?)',
+                       ((make, model, start, end) for start, end in ranges))
+
+    def _read_inventory(self):
+        years = {}
+        for make, model, start, end in self._connection.execute(
+                'SELECT make, model, year_from, year_to FROM model_years ORDER BY make, model, year_from'):
+            years.setdefault((make, model), []).append([start, end])
+
+        inventory = {}
+        for make, model, data in self._connection.execute('SELECT make, model, data FROM vehicles ORDER BY id'):
+            vehicle = json.loads(data)
+            vehicle['years'] = years.get((make, model), [])
+            inventory.setdefault(make, {})[model] = vehicle
+        return _ordered(inventory, self._key_order(INVENTORY), depth=2)
+
+    def _read_parts(self):
+        catalog = {}
+        for make, model, category, part, position in self._connection.execute(
+                'SELECT make, model, category, part, position FROM parts ORDER BY id'):
+            catalog.setdefault(make, {}).setdefault(model, {}).setdefault(category, []).append((position, part))
+        for models in catalog.values():
+            for categories in models.values():
+                for category, parts in categories.items():
+                    categories[category] = [part for position, part in sorted(parts)]
+        for name, data in self._connection.execute(
+                'SELECT name, data FROM sections WHERE document = ? ORDER BY rowid', (PARTS,)):
+            catalog[name] = json.loads(data)
+        return _ordered(catalog, self._key_order(PARTS), depth=3)
+
+
+def _key_path(keys):
+    return json.dumps(list(keys))
+
+
+def _ordered(mapping, order, depth, prefix=()):
+    """Copy of nested mapping with the keys of its first `depth` levels sorted by key_order position"""
+    result = {}
+    for key in sorted(mapping, key=lambda key: order.get(_key_path(prefix + (key,)), UNORDERED)):
+        value = mapping[key]
+        if depth > 1 and isinstance(value, dict):
+            value = _ordered(value, order, depth - 1, prefix + (key,))
+        result[key] = value
+    return result
+
+
+def _is_parts_section(models):
+    """True for make -> model -> category -> [parts]; False for sections like Services"""
+    return isinstance(models, dict) and all(
+        isinstance(categories, dict) and all(isinstance(parts, list) for parts in categories.values())
+        for categories in models.values())
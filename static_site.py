@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Static copy of the public pages
+Renders the home, make, model and services pages through the Flask app's
+views and writes them as <out_dir>/<url path>/index.html, so a front proxy
+can serve the public site without running templates. Every page of a run
+comes from one data snapshot. Only pages whose HTML changed are rewritten,
+and pages of removed models are deleted.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from urllib.parse import unquote
+from flask import g, request
+from werkzeug.exceptions import HTTPException
+import logging
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = '.manifest.json'
+
+
+def public_paths(app, inventory):
+    """URL paths of every public page for inventory"""
+    with app.test_request_context():
+        from flask import url_for
+        paths = [url_for('home'), url_for('services')]
+        for make, models in inventory.items():
+            # Model pages link back to a per-make route, so only makes with one are rendered
+            endpoint = make.lower()
+            if endpoint not in app.view_functions:
+                continue
+            paths.append(url_for(endpoint))
+            for model in models:
+                if '/' not in model:
+                    paths.append(url_for('model_detail', make=make, model_name=model))
+    return paths
+
+
+def _file_for(out_dir, path):
+    parts = [part for part in unquote(path).split('/') if part]
+    return os.path.join(out_dir, *parts, 'index.html')
+
+
+def render_page(app, snapshot, path):
+    """(status, body) of the page at path rendered from snapshot
+
+    The view runs in a bare request context: no before/after request hooks,
+    so pre-rendering neither shows up in request metrics and profiling nor
+    triggers a data reload, and the view reads the given snapshot from g.data
+    (where the app pins each request's snapshot).
+    """
+    with app.test_request_context(path):
+        g.data = snapshot
+        try:
+            if request.routing_exception is not None:
+                raise request.routing_exception
+            rv = app.view_functions[request.url_rule.endpoint](**request.view_args)
+        except HTTPException as e:
+            return e.code, None
+        response = app.make_response(rv)
+        return response.status_code, response.get_data()
+
+
+def prerender(app, snapshot, out_dir):
+    """Write every public page of snapshot under out_dir; returns {'written', 'unchanged', 'removed'} counts"""
+    manifest_path = os.path.join(out_dir, MANIFEST_FILE)
+    try:
+        with open(manifest_path, 'r') as f:
+            previous = json.load(f)['pages']
+    except (FileNotFoundError, ValueError, KeyError):
+        previous = {}
+
+    pages = {}
+    counts = {'written': 0, 'unchanged': 0, 'removed': 0}
+    for path in public_paths(app, snapshot.inventory):
+        status, body = render_page(app, snapshot, path)
+        if status != 200:
+            logger.warning(f"Skipping {path}: status {status}")
+            continue
+        digest = hashlib.sha1(body).hexdigest()
+        pages[path] = digest
+        file_path = _file_for(out_dir, path)
+        if previous.get(path) == digest and os.path.exists(file_path):
+            counts['unchanged'] += 1
+            continue
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        tmp_file = f'{file_path}.tmp'
+        with open(tmp_file, 'wb') as f:
+            f.write(body)
+        os.replace(tmp_file, file_path)
+        counts['written'] += 1
+
+    for path in previous:
+        if path not in pages:
+            try:
+                os.remove(_file_for(out_dir, path))
+                counts['removed'] += 1
+            except FileNotFoundError:
+                pass
+
+    os.makedirs(out_dir, exist_ok=True)
+    tmp_file = f'{manifest_path}.tmp'
+    with open(tmp_file, 'w') as f:
+        json.dump({'version': snapshot.version, 'pages': pages}, f, indent=2)
+    os.replace(tmp_file, manifest_path)
+    return counts
+
+
+class StaticSite:
+    """Re-renders the static pages on a worker thread after data changes, coalescing bursts"""
+
+    def __init__(self, app, snapshot_store, out_dir):
+        self.app = app
+        self.snapshot_store = snapshot_store
+        self.out_dir = out_dir
+        self._pending = threading.Event()
+        self.renders = 0
+        self.last_version = None
+        self.last_counts = None
+        self._thread = threading.Thread(target=self._run, name='static-site', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        self.schedule()
+        return self
+
+    def schedule(self, *args):
+        """Request a render of the current data; returns immediately (usable as a reload callback)"""
+        self._pending.set()
+
+    def _run(self):
+        while True:
+            self._pending.wait()
+            self._pending.clear()
+            snapshot = self.snapshot_store.current()
+            if snapshot.version == self.last_version:
+                continue
+            try:
+                self.last_counts = prerender(self.app, snapshot, self.out_dir)
+            except Exception:
+                logger.exception("Pre-rendering the public pages failed")
+                continue
+            self.renders += 1
+            self.last_version = snapshot.version
+            logger.info(f"Pre-rendered pages for data version {snapshot.version}: {self.last_counts}")
+
+    def stats(self):
+        return {
+            "out_dir": self.out_dir,
+            "renders": self.renders,
+            "version": self.last_version,
+            "last": self.last_counts
+        }
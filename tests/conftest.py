@@ -0,0 +1,42 @@
+import os
+import shutil
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """Copy of the shipped inventory and parts data"""
+    target = tmp_path / 'data'
+    target.mkdir()
+    for name in ('inventory.json', 'parts_catalog.json'):
+        shutil.copy(os.path.join(ROOT, 'data', name), target / name)
+    return str(target)
+
+
+@pytest.fixture
+def app_module(tmp_path, data_dir, monkeypatch):
+    """app/main.py imported fresh, serving the copied data from tmp_path"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.syspath_prepend(os.path.join(ROOT, 'app'))
+    sys.modules.pop('main', None)
+    import main
+    yield main
+    sys.modules.pop('main', None)
+
+
+@pytest.fixture
+def client(app_module):
+    return app_module.app.test_client()
+
+
+@pytest.fixture
+def admin_client(app_module):
+    client = app_module.app.test_client()
+    with client.session_transaction() as session:
+        session['admin_logged_in'] = True
+    return client
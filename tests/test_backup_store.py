@@ -0,0 +1,49 @@
+import pytest
+
+from inventory_manager import InventoryManager
+
+
+@pytest.fixture
+def manager(data_dir):
+    return InventoryManager(json_dir=data_dir)
+
+
+def test_unchanged_data_is_not_backed_up_twice(manager):
+    first, created = manager.backups.create()
+    assert created
+    again, created = manager.backups.create()
+    assert not created and again['id'] == first['id']
+
+
+def test_repeated_content_within_a_second_gets_unique_ids(manager):
+    inventory = manager.load_json(manager.inventory_file)
+    original, _ = manager.backups.create()
+    for _ in range(3):
+        manager.save_json({}, manager.inventory_file)
+        manager.backups.create()
+        manager.save_json(inventory, manager.inventory_file)
+        manager.backups.create()
+
+    ids = [backup['id'] for backup in manager.backups.list()]
+    assert len(ids) == len(set(ids)) == 7
+    assert sum(1 for backup in manager.backups.list() if backup['objects'] == original['objects']) == 4
+
+
+def test_restore_brings_back_the_data_and_backs_up_the_current_data(manager):
+    inventory = manager.load_json(manager.inventory_file)
+    backup, _ = manager.backups.create()
+    manager.save_json({}, manager.inventory_file)
+
+    manager.backups.restore(backup['id'])
+    assert manager.load_json(manager.inventory_file) == inventory
+    assert manager.backups.list()[0]['reason'] == f"before restoring {backup['id']}"
+
+
+def test_only_the_newest_backups_are_kept(manager):
+    manager.backups.keep = 2
+    for year in (2001, 2002, 2003):
+        manager.save_json({'Ford': {'Test': {'years': [[year, year]]}}}, manager.inventory_file)
+        manager.backups.create()
+    backups = manager.backups.list()
+    assert len(backups) == 2
+    assert manager.backups.load(backups[-1]['id'])['inventory']['Ford']['Test']['years'] == [[2002, 2002]]
@@ -0,0 +1,36 @@
+import argparse
+import os
+import sys
+
+from conftest import ROOT
+
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+import run_benchmarks
+from synthetic_catalog import generate_inventory
+
+
+def test_synthetic_catalog_is_reproducible():
+    assert generate_inventory(3, 4, seed=1) == generate_inventory(3, 4, seed=1)
+    assert sum(len(models) for models in generate_inventory(3, 4, seed=1).values()) == 12
+
+
+def test_compare_flags_only_slowdowns_over_the_threshold(capsys):
+    baseline = {'scale': {'makes': 1}, 'results': {'a': {'median': 1.0}, 'b': {'median': 1.0}}}
+    report = {'scale': {'makes': 1}, 'results': {'a': {'median': 1.5}, 'b': {'median': 1.1}, 'c': {'median': 1.0}}}
+    assert run_benchmarks.compare(report, baseline, 0.2) == ['a']
+    assert 'new' in capsys.readouterr().out
+
+
+def test_suite_runs_on_a_small_catalog(monkeypatch):
+    monkeypatch.delitem(sys.modules, 'main', raising=False)
+    args = argparse.Namespace(makes=2, models_per_make=3, parts=200, seed=0, repeat=1, number=1,
+                              only=list(run_benchmarks.GROUPS), skip=['excel'])
+    report = run_benchmarks.run(args)
+    sys.modules.pop('main', None)
+
+    results = report['results']
+    assert 'indexes.search_index' in results and 'storage.load_json.parts' in results
+    assert 'routes.GET /admin/stats' in results and 'routes.POST /webhook/batch' not in results
+    assert all(result['median'] >= 0 and result['runs'] == 1 for result in results.values())
+    assert report['scale']['parts'] == 200
@@ -0,0 +1,107 @@
+import pytest
+
+from inventory_manager import InventoryManager, STORAGE_MODES
+
+
+def snapshot(manager):
+    return manager.load_json(manager.inventory_file), manager.load_json(manager.parts_file)
+
+
+def first_part(manager):
+    parts = manager.load_json(manager.parts_file)
+    make = next(iter(parts))
+    model = next(iter(parts[make]))
+    category = next(iter(parts[make][model]))
+    return make, model, category, parts[make][model][category][0]
+
+
+@pytest.mark.parametrize('storage', STORAGE_MODES)
+def test_failing_operation_rolls_back_the_batch(data_dir, storage):
+    manager = InventoryManager(json_dir=data_dir, storage=storage)
+    before = snapshot(manager)
+    make, model, category, part = first_part(manager)
+
+    committed, results = manager.apply_bulk([
+        {'op': 'add_part', 'make': make, 'model': model, 'category': category, 'part': 'Bulk Test Part'},
+        {'op': 'update_vehicle', 'make': make, 'model': model, 'fields': {'status': 'Limited'}},
+        {'op': 'delete_part', 'make': make, 'model': model, 'category': category, 'part': 'No Such Part'}
+    ])
+
+    assert not committed
+    assert [result['ok'] for result in results] == [True, True, False]
+    assert results[2]['error']['code'] == 'not_found'
+    assert snapshot(manager) == before
+    assert snapshot(InventoryManager(json_dir=data_dir, storage=storage)) == before
+
+
+@pytest.mark.parametrize('storage', STORAGE_MODES)
+def test_batch_commits_when_every_operation_applies(data_dir, storage):
+    manager = InventoryManager(json_dir=data_dir, storage=storage)
+    make, model, category, part = first_part(manager)
+
+    committed, results = manager.apply_bulk([
+        {'op': 'delete_part', 'make': make, 'model': model, 'category': category, 'part': part},
+        {'op': 'update_vehicle', 'make': make, 'model': model,
+         'fields': {'price_range': '$30,000 - $50,000', 'years': [2020, [2022, 2024]]}}
+    ])
+
+    assert committed, results
+    inventory, parts = snapshot(InventoryManager(json_dir=data_dir, storage=storage))
+    assert part not in parts[make][model].get(category, [])
+    assert inventory[make][model]['price_range'] == '$30,000 - $50,000'
+    assert inventory[make][model]['years'] == [[2020, 2020], [2022, 2024]]
+
+
+@pytest.mark.parametrize('fields, field', [
+    ({'owner': 'someone'}, 'owner'),
+    ({'years': [1800]}, 'years'),
+    ({'years': [[2024, 2020]]}, 'years'),
+    ({'years': 'all'}, 'years'),
+    ({'price_range': 'call us'}, 'price_range'),
+    ({'features': 'Towing'}, 'features'),
+    ({'status': 3}, 'status')
+])
+def test_update_vehicle_fields_are_validated(data_dir, fields, field):
+    manager = InventoryManager(json_dir=data_dir)
+    before = snapshot(manager)
+    make, model = first_part(manager)[:2]
+
+    committed, results = manager.apply_bulk([{'op': 'update_vehicle', 'make': make, 'model': model, 'fields': fields}])
+
+    assert not committed
+    assert results[0]['error']['code'] == 'invalid'
+    assert results[0]['error']['field'] == field
+    assert snapshot(manager) == before
+
+
+def test_add_vehicle_year_and_attributes_are_validated(data_dir):
+    manager = InventoryManager(json_dir=data_dir)
+    committed, results = manager.apply_bulk([
+        {'op': 'add_vehicle', 'make': 'Ford', 'model': 'Bulk', 'year': 3000},
+        {'op': 'add_vehicle', 'make': 'Ford', 'model': 'Bulk', 'year': 2024, 'attributes': {'secret': True}}
+    ])
+    assert not committed
+    assert [result['error']['field'] for result in results] == ['year', 'secret']
+
+
+def test_bulk_endpoint_reports_errors_per_operation(admin_client):
+    response = admin_client.post('/admin/bulk', json={'operations': [
+        {'op': 'update_vehicle', 'make': 'Ford', 'model': 'F-150', 'fields': {'years': [2024]}},
+        {'op': 'update_vehicle', 'make': 'Ford', 'model': 'F-150', 'fields': {'__class__': 'x'}}
+    ]})
+    assert response.status_code == 400
+    results = response.get_json()['results']
+    assert results[0]['ok'] and results[0]['error'] is None
+    assert results[1]['error'] == {'code': 'invalid', 'field': '__class__',
+                                   'message': results[1]['error']['message']}
+
+
+def test_admin_update_vehicle_validates_fields(admin_client):
+    response = admin_client.post('/admin/vehicle/update', json={
+        'make': 'Ford', 'model': 'F-150', 'price_range': 'call us', 'years': [2024]})
+    assert response.status_code == 400
+    assert response.get_json()['field'] == 'price_range'
+
+    response = admin_client.post('/admin/vehicle/update', json={
+        'make': 'Ford', 'model': 'F-150', 'price_range': '$45k+', 'years': [2023, 2024]})
+    assert response.get_json() == {'success': True}
@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+from catalog_pages import CatalogPages, decode_cursor, encode_cursor
+
+
+def walk(client, url):
+    """Every record of a paged endpoint, following next_cursor"""
+    records = []
+    cursor = None
+    while True:
+        page = client.get(url + (f'&cursor={cursor}' if cursor else '')).get_json()
+        records.extend(page['results'])
+        cursor = page['next_cursor']
+        if cursor is None:
+            return records, page['total']
+
+
+def test_cursor_round_trip_and_rejects_garbage():
+    assert decode_cursor(encode_cursor(('Ford', 'F-150'))) == ('Ford', 'F-150')
+    for token in ('not-a-cursor', encode_cursor(('only one',)), ''):
+        with pytest.raises(ValueError):
+            decode_cursor(token)
+
+
+def test_pages_stay_consistent_when_models_change_between_requests():
+    document = {'Ford': {'A': {}, 'B': {}, 'C': {}}, 'Jeep': {'D': {}}}
+    keys, cursor = CatalogPages(document).page(limit=2)
+    assert keys == [('Ford', 'A'), ('Ford', 'B')]
+
+    # 'A' is deleted and 'AA' added before the next page is fetched
+    document['Ford'] = {'AA': {}, 'B': {}, 'C': {}}
+    keys, cursor = CatalogPages(document).page(decode_cursor(cursor), limit=2)
+    assert keys == [('Ford', 'C'), ('Jeep', 'D')]
+    assert cursor is None
+
+
+@pytest.mark.parametrize('endpoint', ['/api/inventory', '/api/parts'])
+def test_walking_the_cursor_visits_every_model_once(client, endpoint):
+    records, total = walk(client, f'{endpoint}?limit=4')
+    keys = [(record['make'], record['model']) for record in records]
+    assert len(keys) == total == len(set(keys))
+    assert keys == sorted(keys)
+
+
+def test_fields_project_records(client):
+    page = client.get('/api/inventory?limit=2&fields=years').get_json()
+    assert all(set(record) == {'make', 'model', 'years'} for record in page['results'])
+
+
+def test_ndjson_stream_matches_the_pages(client):
+    paged, total = walk(client, '/api/inventory?limit=5')
+    response = client.get('/api/inventory?stream=ndjson')
+    assert response.mimetype == 'application/x-ndjson'
+    streamed = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert streamed == paged
+
+
+@pytest.mark.parametrize('query', ['cursor=bogus', 'limit=0', 'limit=5000', 'stream=csv'])
+def test_invalid_page_options_are_rejected(client, query):
+    assert client.get(f'/api/inventory?{query}').status_code == 400
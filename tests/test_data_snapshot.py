@@ -0,0 +1,75 @@
+from data_snapshot import SnapshotStore
+from inventory_manager import InventoryManager
+from part_index import PartIndex
+from repository import InventoryRepository
+
+
+def store_for(data_dir, storage='json'):
+    return SnapshotStore(InventoryRepository(InventoryManager(json_dir=data_dir, storage=storage)))
+
+
+def test_unchanged_files_keep_the_snapshot(data_dir):
+    store = store_for(data_dir)
+    snapshot = store.current()
+    assert store.refresh() is snapshot
+    assert store.reloads == 1
+
+
+def test_writes_by_another_worker_are_picked_up(data_dir):
+    store = store_for(data_dir, 'journal')
+    before = store.current()
+    other_worker = InventoryManager(json_dir=data_dir, storage='journal')
+    other_worker.add_part('Jeep', 'Wrangler', 'Winches', 'Warn Zeon 10-S')
+
+    after = store.refresh()
+    assert after is not before
+    assert after.version != before.version and after.generation > before.generation
+    assert 'Warn Zeon 10-S' in after.parts_catalog['Jeep']['Wrangler']['Winches']
+    # The old snapshot is left as it was for requests still using it
+    assert 'Winches' not in before.parts_catalog['Jeep']['Wrangler']
+
+
+def test_held_reloads_keep_serving_the_current_snapshot(data_dir):
+    store = store_for(data_dir)
+    snapshot = store.current()
+    with store.hold_reloads():
+        store.repository.add_part('Ford', 'F-150', 'Engine', 'Held Part')
+        assert store.refresh(wait=False) is snapshot
+    assert 'Held Part' in store.refresh(wait=False).parts_catalog['Ford']['F-150']['Engine']
+
+
+def test_waiting_and_forced_refreshes_are_deferred_until_release(data_dir):
+    store = store_for(data_dir)
+    snapshot = store.current()
+    with store.hold_reloads():
+        with store.hold_reloads():
+            store.repository.add_part('Ford', 'F-150', 'Engine', 'Held Part')
+            assert store.refresh() is snapshot
+            assert store.refresh(force=True) is snapshot
+        assert store.current() is snapshot
+    # Released: the deferred (forced) refresh has run without anyone asking again
+    released = store.current()
+    assert released is not snapshot and store.reloads == 2
+    assert 'Held Part' in released.parts_catalog['Ford']['F-150']['Engine']
+
+
+def test_part_index_is_updated_incrementally(data_dir):
+    store = store_for(data_dir)
+    store.current()
+    store.repository.add_part('Ford', 'F-150', 'Engine', 'Turbo Intercooler')
+    store.repository.delete_part('Ford', 'F-150', 'Engine',
+                                 store.current().parts_catalog['Ford']['F-150']['Engine'][0])
+    snapshot = store.refresh()
+
+    rebuilt = PartIndex(snapshot.parts_catalog)
+    for query in ('intercooler', 'oil filter', 'brake'):
+        assert snapshot.part_index.search(query) == rebuilt.search(query)
+
+
+def test_requests_see_one_snapshot_throughout(app_module, client, data_dir):
+    app = app_module.app
+    with app.test_request_context('/'):
+        pinned = app_module.current_data()
+        InventoryManager(json_dir=data_dir).add_vehicle('Ford', 'Maverick', 2024)
+        assert app_module.current_data() is pinned
+    assert 'Maverick' in client.get('/api/inventory/Ford').get_json()['Ford']
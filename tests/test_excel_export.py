@@ -0,0 +1,38 @@
+from openpyxl import load_workbook
+
+from inventory_manager import InventoryManager
+
+
+def sheet_rows(excel_file):
+    workbook = load_workbook(excel_file, read_only=True)
+    return {sheet.title: [row for row in sheet.iter_rows(values_only=True)] for sheet in workbook.worksheets}
+
+
+def test_export_then_import_round_trips_the_data(data_dir, tmp_path):
+    manager = InventoryManager(excel_file=str(tmp_path / 'inventory.xlsx'), json_dir=data_dir)
+    inventory = manager.load_json(manager.inventory_file)
+    parts = manager.load_json(manager.parts_file)
+
+    assert manager.export_to_excel()
+    assert manager.import_from_excel()
+    # Export fills in the default price range and status of models that have none
+    expected = {make: {model: {'price_range': '', 'status': 'Available', **data} for model, data in models.items()}
+                for make, models in inventory.items()}
+    assert manager.load_json(manager.inventory_file) == expected
+    # The Services entry of the parts catalog is not part of the Parts sheet
+    del parts['Services']
+    assert manager.load_json(manager.parts_file) == parts
+
+
+def test_streaming_export_writes_the_same_rows(data_dir, tmp_path):
+    regular = InventoryManager(excel_file=str(tmp_path / 'regular.xlsx'), json_dir=data_dir)
+    streamed = InventoryManager(excel_file=str(tmp_path / 'streamed.xlsx'), json_dir=data_dir)
+    assert regular.export_to_excel()
+    assert streamed.export_to_excel(stream=True)
+
+    regular_rows = sheet_rows(regular.excel_file)
+    streamed_rows = sheet_rows(streamed.excel_file)
+    assert list(streamed_rows) == list(regular_rows)
+    for title, rows in regular_rows.items():
+        # pandas writes missing values as empty cells, as the streaming writer does
+        assert streamed_rows[title] == rows, title
@@ -0,0 +1,73 @@
+import shutil
+
+import pytest
+from openpyxl import load_workbook
+
+from inventory_manager import InventoryManager
+
+
+def exported_workbook(data_dir, tmp_path):
+    """Workbook exported from the shipped data, imported once so differential imports have a baseline"""
+    manager = InventoryManager(excel_file=str(tmp_path / 'inventory.xlsx'), json_dir=data_dir)
+    assert manager.export_to_excel()
+    assert manager.import_from_excel()
+    return manager.excel_file
+
+
+def edit_parts_sheet(excel_file):
+    workbook = load_workbook(excel_file)
+    sheet = workbook['Parts']
+    rows = [list(row) for row in sheet.iter_rows(values_only=True)]
+    header, body = rows[0], rows[1:]
+
+    def find(*key):
+        return next(i for i, row in enumerate(body) if tuple(row[:4]) == key)
+
+    # New part in the middle of a category (after the first Navigator brake part)
+    i = find('Lincoln', 'Navigator', 'Brakes', 'Premium Brake Pads')
+    body.insert(i + 1, ['Lincoln', 'Navigator', 'Brakes', 'Ceramic Pads'] + [None] * (len(header) - 4))
+    # Deleted part
+    del body[find('Lincoln', 'Navigator', 'Brakes', 'Stainless Steel Lines')]
+    # Two rows swapped within a category
+    first = next(i for i, row in enumerate(body) if row[0] == 'Ford' and row[1] == 'F-150' and row[2] == 'Engine')
+    body[first], body[first + 1] = body[first + 1], body[first]
+    # New category
+    body.append(['Jeep', 'Wrangler', 'Winches', 'Warn Zeon 10-S'] + [None] * (len(header) - 4))
+
+    sheet.delete_rows(2, sheet.max_row)
+    for row in body:
+        sheet.append(row)
+    vehicles = workbook['Ford_Vehicles']
+    vehicles.cell(row=2, column=5).value = 'Edited description'
+    workbook.save(excel_file)
+
+
+@pytest.mark.parametrize('storage', ['json', 'journal', 'sqlite'])
+def test_incremental_import_matches_full_import(data_dir, tmp_path, storage):
+    excel_file = exported_workbook(data_dir, tmp_path)
+    edit_parts_sheet(excel_file)
+
+    incremental = InventoryManager(excel_file=excel_file, json_dir=data_dir, storage=storage)
+    report = incremental.import_changes_from_excel()
+    assert report['mode'] == 'incremental'
+    assert report['sheets']['Parts']['status'] == 'changed'
+
+    full_dir = str(tmp_path / 'full')
+    shutil.copytree(data_dir, full_dir, ignore=shutil.ignore_patterns('*.db*', '*.journal', 'backups'))
+    full = InventoryManager(excel_file=excel_file, json_dir=full_dir)
+    assert full.import_from_excel()
+
+    incremental_parts = incremental.load_json(incremental.parts_file)
+    full_parts = full.load_json(full.parts_file)
+    assert incremental_parts['Lincoln']['Navigator']['Brakes'] == full_parts['Lincoln']['Navigator']['Brakes']
+    assert incremental_parts == full_parts
+    assert incremental.load_json(incremental.inventory_file) == full.load_json(full.inventory_file)
+
+
+def test_unchanged_workbook_applies_nothing(data_dir, tmp_path):
+    excel_file = exported_workbook(data_dir, tmp_path)
+    manager = InventoryManager(excel_file=excel_file, json_dir=data_dir)
+    before = manager.load_json(manager.parts_file)
+    report = manager.import_changes_from_excel()
+    assert report['operations'] == 0
+    assert manager.load_json(manager.parts_file) == before
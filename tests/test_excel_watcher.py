@@ -0,0 +1,52 @@
+import threading
+import time
+
+import pytest
+from openpyxl import load_workbook
+
+from excel_watcher import ExcelWatcher, fcntl
+from inventory_manager import InventoryManager
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.02)
+    return condition()
+
+
+@pytest.fixture
+def manager(data_dir, tmp_path):
+    manager = InventoryManager(excel_file=str(tmp_path / 'inventory.xlsx'), json_dir=data_dir)
+    assert manager.export_to_excel()
+    assert manager.import_from_excel()
+    return manager
+
+
+def test_saved_workbook_is_imported(manager):
+    imported = threading.Event()
+    watcher = ExcelWatcher(manager, on_import=lambda report: imported.set(), debounce=0.1, poll_interval=0.1).start()
+    try:
+        workbook = load_workbook(manager.excel_file)
+        workbook['Ford_Vehicles'].cell(row=2, column=5, value='Edited while watched')
+        workbook.save(manager.excel_file)
+        assert imported.wait(5)
+    finally:
+        watcher.stop()
+    inventory = manager.load_json(manager.inventory_file)
+    assert 'Edited while watched' in [data['description'] for data in inventory['Ford'].values()]
+
+
+@pytest.mark.skipif(fcntl is None, reason='needs flock')
+def test_only_one_watcher_watches_and_another_takes_over(manager):
+    first = ExcelWatcher(manager, poll_interval=0.05).start()
+    second = ExcelWatcher(manager, poll_interval=0.05).start()
+    try:
+        assert first.watching and first.stats()['mode'] != 'standby'
+        assert not second.watching and second.stats()['mode'] == 'standby'
+
+        first.stop()
+        assert wait_for(lambda: second.watching)
+    finally:
+        first.stop()
+        second.stop()
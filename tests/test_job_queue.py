@@ -0,0 +1,81 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import pytest
+
+from job_queue import FAILED, SUCCEEDED, JobQueue
+
+
+def wait_for_job(queue, job_id, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get(job_id)
+        if job['state'] in (SUCCEEDED, FAILED):
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"Job {job_id} did not finish")
+
+
+def test_thread_jobs_run_with_guard_and_callback():
+    events = []
+
+    @contextmanager
+    def guard():
+        events.append('enter')
+        yield
+        events.append('exit')
+
+    queue = JobQueue(use_processes=False)
+    job = queue.submit('sum', sum, ([1, 2, 3],), guard=guard, on_done=lambda result: events.append(result))
+    job = wait_for_job(queue, job['id'])
+    assert job['state'] == SUCCEEDED and job['result'] == 6
+    assert job['wait_ms'] is not None and job['duration_ms'] is not None
+    assert events == ['enter', 'exit', 6]
+    assert queue.stats()['succeeded'] == 1
+
+
+def test_queued_job_of_the_same_kind_is_reused():
+    release = threading.Event()
+    queue = JobQueue(use_processes=False)
+    running = queue.submit('block', release.wait)
+    first = queue.submit('export', str, (1,))
+    second = queue.submit('export', str, (2,))
+    assert second['id'] == first['id']
+    release.set()
+    assert wait_for_job(queue, first['id'])['result'] == '1'
+    wait_for_job(queue, running['id'])
+
+
+def test_failures_are_reported():
+    queue = JobQueue(use_processes=False)
+    job = wait_for_job(queue, queue.submit('parse', int, ('not a number',))['id'])
+    assert job['state'] == FAILED and 'not a number' in job['error']
+    assert queue.stats()['failed'] == 1
+    with pytest.raises(ValueError):
+        queue.get('unknown')
+
+
+def test_process_jobs_run_in_another_process():
+    queue = JobQueue()
+    job = wait_for_job(queue, queue.submit('pid', os.getpid)['id'])
+    assert job['state'] == SUCCEEDED and job['result'] != os.getpid()
+
+    failed = wait_for_job(queue, queue.submit('parse', int, ('x',))['id'])
+    assert failed['state'] == FAILED and "'x'" in failed['error']
+
+
+def test_excel_export_and_import_jobs(admin_client, app_module):
+    response = admin_client.post('/admin/export-excel', headers={'Accept': 'application/json'})
+    assert response.status_code == 202
+    job = wait_for_job(app_module.job_queue, response.get_json()['job']['id'])
+    assert job['state'] == SUCCEEDED and job['result']['size'] > 0
+
+    response = admin_client.post('/admin/import-excel', headers={'Accept': 'application/json'})
+    job = wait_for_job(app_module.job_queue, response.get_json()['job']['id'])
+    assert job['state'] == SUCCEEDED
+
+    status = admin_client.get(f"/admin/jobs/{job['id']}").get_json()
+    assert status['summary']
+    assert admin_client.get('/admin/jobs').get_json()['stats']['succeeded'] == 2
@@ -0,0 +1,91 @@
+import json
+import os
+import time
+
+from inventory_manager import InventoryManager
+
+
+def parts_of(manager):
+    return manager.load_json(manager.parts_file)
+
+
+def add_parts(manager, count, prefix='Journal Part'):
+    for i in range(count):
+        manager.add_part('Ford', 'F-150', 'Engine', f'{prefix} {i}')
+
+
+def journal_lines(manager):
+    path = f'{manager.parts_file}.journal'
+    if not os.path.exists(path):
+        return []
+    with open(path, 'rb') as f:
+        return f.read().splitlines()
+
+
+def test_mutations_are_journaled_and_replayed(data_dir):
+    manager = InventoryManager(json_dir=data_dir, storage='journal', compact_threshold=1000)
+    with open(manager.parts_file) as f:
+        base = json.load(f)
+    add_parts(manager, 3)
+    manager.delete_part('Ford', 'F-150', 'Engine', 'Journal Part 1')
+
+    # The base file is untouched; the journal holds one line per mutation
+    with open(manager.parts_file) as f:
+        assert json.load(f) == base
+    assert len(journal_lines(manager)) == 4
+
+    replayed = parts_of(InventoryManager(json_dir=data_dir, storage='journal'))
+    assert replayed == parts_of(manager)
+    engine = replayed['Ford']['F-150']['Engine']
+    assert 'Journal Part 0' in engine and 'Journal Part 2' in engine and 'Journal Part 1' not in engine
+
+
+def test_compaction_folds_the_journal_into_the_base_file(data_dir):
+    manager = InventoryManager(json_dir=data_dir, storage='journal', compact_threshold=1000)
+    add_parts(manager, 5)
+    expected = parts_of(manager)
+
+    assert manager.compact_journal(manager.parts_file)
+    assert journal_lines(manager) == []
+    with open(manager.parts_file) as f:
+        assert json.load(f) == expected
+    assert not manager.compact_journal(manager.parts_file)
+
+    # Writes carry on after compaction
+    add_parts(manager, 1, prefix='After Compaction')
+    assert 'After Compaction 0' in parts_of(InventoryManager(json_dir=data_dir, storage='journal'))['Ford']['F-150']['Engine']
+
+
+def test_compaction_starts_in_the_background_at_the_threshold(data_dir):
+    manager = InventoryManager(json_dir=data_dir, storage='journal', compact_threshold=3)
+    add_parts(manager, 3)
+    deadline = time.monotonic() + 5
+    while journal_lines(manager) and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert journal_lines(manager) == []
+    assert 'Journal Part 2' in parts_of(InventoryManager(json_dir=data_dir))['Ford']['F-150']['Engine']
+
+
+def test_compaction_by_another_worker_keeps_every_entry(data_dir):
+    writer = InventoryManager(json_dir=data_dir, storage='journal', compact_threshold=1000)
+    compactor = InventoryManager(json_dir=data_dir, storage='journal', compact_threshold=1000)
+    add_parts(writer, 2, prefix='Before')
+    assert compactor.compact_journal(compactor.parts_file)
+    add_parts(writer, 2, prefix='After')
+
+    engine = parts_of(InventoryManager(json_dir=data_dir, storage='journal'))['Ford']['F-150']['Engine']
+    assert {'Before 0', 'Before 1', 'After 0', 'After 1'} <= set(engine)
+    assert parts_of(compactor) == parts_of(writer)
+
+
+def test_torn_last_line_is_ignored_and_overwritten(data_dir):
+    manager = InventoryManager(json_dir=data_dir, storage='journal', compact_threshold=1000)
+    add_parts(manager, 2)
+    with open(f'{manager.parts_file}.journal', 'ab') as f:
+        f.write(b'{"op":"add_part","make":"Ford"')
+
+    reopened = InventoryManager(json_dir=data_dir, storage='journal', compact_threshold=1000)
+    assert parts_of(reopened) == parts_of(manager)
+    add_parts(reopened, 1, prefix='After Crash')
+    lines = journal_lines(reopened)
+    assert len(lines) == 3 and all(json.loads(line) for line in lines)
@@ -0,0 +1,78 @@
+import os
+import sys
+
+import pytest
+
+from conftest import ROOT
+
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+import load_test
+
+
+@pytest.mark.parametrize('values, fraction, expected', [
+    (list(range(1, 11)), 0.50, 5),
+    (list(range(1, 11)), 0.90, 9),
+    (list(range(1, 11)), 0.70, 7),
+    (list(range(1, 21)), 0.95, 19),
+    (list(range(1, 101)), 0.99, 99),
+    (list(range(1, 11)), 0.95, 10),
+    ([7], 0.5, 7),
+    ([], 0.5, 0.0)
+])
+def test_percentile_is_nearest_rank(values, fraction, expected):
+    assert load_test.percentile(values, fraction) == expected
+
+
+def test_routes_are_labelled_by_template_without_importing_the_app():
+    sys.modules.pop('main', None)
+    label = load_test.route_labeler()
+    assert label('GET', '/api/inventory/Ford/F-150?fields=years') == 'GET /api/inventory/<make>/<model>'
+    assert label('POST', '/webhook/check-vehicle') == 'POST /webhook/check-vehicle'
+    # Unknown paths and methods fall back to the bare path
+    assert label('GET', '/no/such/page?x=1') == 'GET /no/such/page'
+    assert label('GET', '/webhook/check-vehicle') == 'GET /webhook/check-vehicle'
+    assert 'main' not in sys.modules
+
+
+class FakeResponse:
+    def __init__(self, status):
+        self.status = status
+
+    def read(self):
+        return b'{}'
+
+    def getheader(self, name, default=None):
+        return default
+
+
+class FakeConnection:
+    """http.client.HTTPConnection stand-in answering by path"""
+    def __init__(self, host, port, timeout=None):
+        self.path = None
+
+    def request(self, method, path, body=None, headers=None):
+        if path == '/down':
+            raise ConnectionRefusedError()
+        self.path = path
+
+    def getresponse(self):
+        return FakeResponse(500 if self.path == '/broken' else 404 if self.path == '/missing' else 200)
+
+    def close(self):
+        pass
+
+
+def test_samples_are_aggregated_per_route(monkeypatch):
+    monkeypatch.setattr(load_test.http.client, 'HTTPConnection', FakeConnection)
+    requests = [{'method': 'GET', 'path': path, 'json': None, 'route': route, 'ts': None}
+                for path, route in [('/ok', 'ok')] * 6 + [('/missing', 'ok'), ('/broken', 'bad'), ('/down', 'bad')]]
+    samples, elapsed = load_test.run_load('http://127.0.0.1:1', requests, concurrency=3)
+    assert sorted(status for _, _, status in samples) == [0, 200, 200, 200, 200, 200, 200, 404, 500]
+
+    report = load_test.summarize(samples, elapsed)
+    assert report['ALL']['requests'] == 9
+    assert report['ok']['requests'] == 7 and report['ok']['client_errors'] == 1
+    assert report['ok']['error_rate'] == 0
+    assert report['bad']['error_rate'] == 1.0 and report['bad']['statuses'] == {'500': 1, '0': 1}
+    assert report['ALL']['p50_ms'] <= report['ALL']['p99_ms'] <= report['ALL']['max_ms']
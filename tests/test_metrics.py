@@ -0,0 +1,28 @@
+from metrics import Metrics
+
+
+def test_histograms_and_counters_render_in_prometheus_format():
+    metrics = Metrics()
+    metrics.observe_request('GET', '/api/search', 200, 0.003, size=120)
+    metrics.observe_request('GET', '/api/search', 200, 0.2, size=80)
+    metrics.observe_request('POST', '/webhook/batch', 500, 0.01, exception='KeyError')
+    text = metrics.render([('inventory_models', 'gauge', 'Models', 7)])
+
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/api/search",le="0.005"} 1' in text
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/api/search",le="+Inf"} 2' in text
+    assert 'http_response_size_bytes_sum{method="GET",route="/api/search"} 200' in text
+    assert 'http_requests_total{method="GET",route="/api/search",status="200"} 2' in text
+    assert 'KeyError' in text and 'route="/webhook/batch"' in text
+    assert '# TYPE inventory_models gauge' in text and 'inventory_models 7' in text
+
+
+def test_requests_are_labelled_by_route_template(client):
+    client.get('/api/inventory/Ford/F-150')
+    client.get('/api/inventory/Jeep/Wrangler')
+    client.get('/no/such/page')
+    text = client.get('/metrics').get_data(as_text=True)
+
+    assert 'http_requests_total{method="GET",route="/api/inventory/<make>/<model>",status="200"} 2' in text
+    assert 'route="/api/inventory/Ford/F-150"' not in text
+    assert 'http_requests_total{method="GET",route="<unmatched>",status="404"} 1' in text
+    assert 'data_generation' in text and 'response_cache_hits_total' in text
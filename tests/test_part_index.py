@@ -0,0 +1,77 @@
+from part_index import PartIndex, normalize_part_name
+
+CATALOG = {
+    'Ford': {
+        'F-150': {
+            'Brakes': ['Premium Brake Pads', 'Brake Rotors'],
+            'Engine': ['Oil Filter', 'Air Filter', 'Spark Plugs']
+        },
+        'Mustang': {'Brakes': ['Brake Rotors']}
+    },
+    'Jeep': {'Wrangler': {'Engine': ['Oil Filter']}},
+    'Services': {'Oil Change': '$49.99'}
+}
+
+
+def names(results):
+    return [result['part'] for result in results]
+
+
+def test_normalize_folds_case_punctuation_and_plurals():
+    assert normalize_part_name('Brake-Rotors') == 'brake rotor'
+    assert normalize_part_name('Stainless Lines') == 'stainless line'
+
+
+def test_exact_misspelled_and_partial_queries():
+    index = PartIndex(CATALOG)
+    assert len(index) == 5
+    assert names(index.search('oil filter'))[0] == 'Oil Filter'
+    assert names(index.search('oil filtr'))[0] == 'Oil Filter'
+    assert names(index.search('rotor'))[0] == 'Brake Rotors'
+    assert names(index.search('spark'))[0] == 'Spark Plugs'
+    assert index.search('windshield') == []
+
+
+def test_locations_and_filters():
+    index = PartIndex(CATALOG)
+    result = index.search('oil filter', limit=1)[0]
+    assert result['locations'] == [
+        {'make': 'Ford', 'model': 'F-150', 'category': 'Engine'},
+        {'make': 'Jeep', 'model': 'Wrangler', 'category': 'Engine'}
+    ]
+    filtered = index.search('oil filter', make='jeep', limit=1)[0]
+    assert filtered['locations'] == [{'make': 'Jeep', 'model': 'Wrangler', 'category': 'Engine'}]
+    assert index.search('brake rotors', category='Engine') == []
+
+
+def test_apply_changes_matches_a_rebuild():
+    index = PartIndex(CATALOG)
+    ops = [
+        {'op': 'add_part', 'make': 'Jeep', 'model': 'Wrangler', 'category': 'Brakes', 'part': 'Brake Rotors'},
+        {'op': 'batch', 'ops': [
+            {'op': 'delete_part', 'make': 'Ford', 'model': 'F-150', 'category': 'Engine', 'part': 'Spark Plugs'}
+        ]}
+    ]
+    updated = index.apply_changes(ops)
+
+    rebuilt_catalog = {
+        'Ford': {
+            'F-150': {'Brakes': ['Premium Brake Pads', 'Brake Rotors'], 'Engine': ['Oil Filter', 'Air Filter']},
+            'Mustang': {'Brakes': ['Brake Rotors']}
+        },
+        'Jeep': {'Wrangler': {'Engine': ['Oil Filter'], 'Brakes': ['Brake Rotors']}}
+    }
+    rebuilt = PartIndex(rebuilt_catalog)
+    for query in ('brake rotor', 'spark plug', 'oil filter', 'filtr'):
+        assert updated.search(query) == rebuilt.search(query)
+
+    # The original index is left as it was
+    assert names(index.search('spark plug'))[0] == 'Spark Plugs'
+    assert len(index.search('brake rotors', make='Jeep')) == 0
+
+
+def test_search_endpoint(client):
+    response = client.get('/api/parts/search?q=brake')
+    assert response.status_code == 200
+    assert response.get_json()['count'] > 0
+    assert client.get('/api/parts/search?q=').status_code == 400
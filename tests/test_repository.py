@@ -0,0 +1,44 @@
+from inventory_manager import InventoryManager
+from repository import InventoryRepository
+
+
+def test_documents_are_read_once_until_they_change(data_dir):
+    manager = InventoryManager(json_dir=data_dir)
+    repository = InventoryRepository(manager)
+    stamp, inventory = repository.inventory()
+    assert repository.inventory() == (stamp, inventory)
+    assert repository.stats()['misses'] == 1 and repository.stats()['hits'] == 1
+
+    # A write made outside the repository is picked up through the file stamp
+    InventoryManager(json_dir=data_dir).add_vehicle('Ford', 'Maverick', 2024)
+    new_stamp, inventory = repository.inventory()
+    assert new_stamp != stamp and 'Maverick' in inventory['Ford']
+    assert repository.stats()['misses'] == 2
+
+
+def test_writes_through_the_repository_invalidate_the_document(data_dir):
+    repository = InventoryRepository(InventoryManager(json_dir=data_dir))
+    repository.parts()
+    repository.add_part('Ford', 'F-150', 'Engine', 'Test Filter')
+    assert repository.stats()['invalidations'] == 1
+    assert 'Test Filter' in repository.parts()[1]['Ford']['F-150']['Engine']
+    repository.delete_part('Ford', 'F-150', 'Engine', 'Test Filter')
+    assert 'Test Filter' not in repository.parts()[1]['Ford']['F-150']['Engine']
+    assert repository.stats()['misses'] == 3
+
+
+def test_part_writes_are_recorded_for_incremental_updates(data_dir):
+    repository = InventoryRepository(InventoryManager(json_dir=data_dir))
+    parts_file = repository.inventory_manager.parts_file
+    stamp, _ = repository.parts()
+    repository.add_part('Ford', 'F-150', 'Engine', 'Test Filter')
+    repository.delete_part('Ford', 'F-150', 'Engine', 'Test Filter')
+    new_stamp, parts = repository.parts()
+
+    ops = repository.changes_between(parts_file, stamp, new_stamp)
+    assert [op['op'] for op in ops] == ['add_part', 'delete_part']
+    assert 'Test Filter' not in parts['Ford']['F-150'].get('Engine', [])
+
+    # Writes the repository did not see leave a gap in the chain
+    InventoryManager(json_dir=data_dir).add_part('Ford', 'F-150', 'Engine', 'Other Filter')
+    assert repository.changes_between(parts_file, stamp, repository.parts()[0]) is None
@@ -0,0 +1,101 @@
+import threading
+import time
+
+import request_profiler
+from request_profiler import RequestProfiler
+
+DETAILS = {'method': 'GET', 'path': '/api/search'}
+
+
+def sampler_stopped(profiler, timeout=2):
+    deadline = time.monotonic() + timeout
+    while profiler._sampler is not None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return profiler._sampler is None
+
+
+def test_nothing_is_tracked_or_sampled_while_capture_is_off():
+    profiler = RequestProfiler()
+    assert profiler.start('/api/search') is None
+    assert profiler._sampler is None
+    assert not profiler._in_flight
+
+
+def test_slow_requests_are_captured_with_stack_samples():
+    profiler = RequestProfiler(slow_ms=20, sample_interval=0.001)
+    request = profiler.start('/api/search')
+    assert profiler._sampler is not None
+    time.sleep(0.1)
+    capture = profiler.finish(request, DETAILS)
+
+    assert capture['kind'] == 'slow'
+    assert capture['samples'] > 0
+    assert any('test_slow_requests_are_captured_with_stack_samples' in stack for stack in capture['stacks'])
+    assert profiler.finish(profiler.start('/api/search'), DETAILS) is None
+
+
+def test_sampler_exits_when_slow_capture_is_switched_off():
+    profiler = RequestProfiler(slow_ms=20, sample_interval=0.001)
+    profiler.finish(profiler.start('/'), DETAILS)
+    assert profiler._sampler is not None
+
+    profiler.set_slow_ms(0)
+    assert sampler_stopped(profiler)
+    assert profiler.start('/') is None
+
+
+def test_sampler_runs_only_for_a_profiling_session():
+    profiler = RequestProfiler(sample_interval=0.001)
+    profiler.enable_profiling('/api', count=1)
+    assert profiler.start('/admin') is None
+
+    request = profiler.start('/api/search')
+    time.sleep(0.05)
+    capture = profiler.finish(request, DETAILS)
+    assert capture['kind'] == 'profile'
+    assert capture['samples'] > 0
+    assert sampler_stopped(profiler)
+
+
+def test_stacks_are_built_without_the_lock(monkeypatch):
+    profiler = RequestProfiler(slow_ms=1, sample_interval=0.001)
+    held = []
+    folded_stack = request_profiler._folded_stack
+
+    def checking_folded_stack(frame):
+        held.append(profiler._lock.locked())
+        return folded_stack(frame)
+
+    monkeypatch.setattr(request_profiler, '_folded_stack', checking_folded_stack)
+    request = profiler.start('/api/search')
+    time.sleep(0.05)
+    profiler.finish(request, DETAILS)
+    assert held and not any(held)
+
+
+def test_concurrent_requests_are_sampled_separately():
+    profiler = RequestProfiler(slow_ms=20, sample_interval=0.001)
+    captures = []
+
+    def handle():
+        request = profiler.start('/api/search')
+        time.sleep(0.05)
+        captures.append(profiler.finish(request, DETAILS))
+
+    threads = [threading.Thread(target=handle) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(captures) == 3 and all(capture['samples'] for capture in captures)
+    profiler.set_slow_ms(None)
+    assert sampler_stopped(profiler)
+
+
+def test_profiling_page_switches_slow_capture(admin_client, app_module):
+    response = admin_client.post('/admin/profiling', data={'action': 'slow_on', 'slow_ms': '250'})
+    assert response.status_code == 302
+    assert app_module.profiler.slow_ms == 250
+    assert b'250 ms' in admin_client.get('/admin/profiling').data
+    admin_client.post('/admin/profiling', data={'action': 'slow_off'})
+    assert app_module.profiler.slow_ms is None
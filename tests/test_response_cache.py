@@ -0,0 +1,39 @@
+import gzip
+
+from inventory_manager import InventoryManager
+
+
+def test_conditional_get_answers_304(client):
+    first = client.get('/api/inventory')
+    assert first.status_code == 200 and first.headers['ETag']
+    again = client.get('/api/inventory', headers={'If-None-Match': first.headers['ETag']})
+    assert again.status_code == 304
+    assert again.get_data() == b''
+
+
+def test_gzip_body_matches_the_plain_body(client):
+    plain = client.get('/api/parts')
+    compressed = client.get('/api/parts', headers={'Accept-Encoding': 'gzip'})
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert compressed.headers['Vary'] == 'Accept-Encoding'
+    assert gzip.decompress(compressed.get_data()) == plain.get_data()
+    assert compressed.headers['ETag'] == plain.headers['ETag']
+
+
+def test_responses_are_built_once_per_data_version(client, app_module, data_dir):
+    cache = app_module.response_cache
+    first = client.get('/api/inventory/Ford')
+    hits = cache.hits
+    assert client.get('/api/inventory/Ford').get_data() == first.get_data()
+    assert cache.hits == hits + 1
+
+    # Another worker changes the data: the old ETag no longer matches
+    other_worker = InventoryManager(json_dir=data_dir)
+    inventory = other_worker.load_json(other_worker.inventory_file)
+    inventory['Ford']['F-150']['description'] = 'Changed by another worker'
+    other_worker.save_json(inventory, other_worker.inventory_file)
+
+    changed = client.get('/api/inventory/Ford', headers={'If-None-Match': first.headers['ETag']})
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != first.headers['ETag']
+    assert changed.get_json()['Ford']['F-150']['description'] == 'Changed by another worker'
@@ -0,0 +1,65 @@
+import json
+import os
+
+import pytest
+
+from conftest import ROOT
+from search_index import SearchIndex
+
+QUERIES = ['f-150', '150', 'ford', 'jeep wrang', 'navi', 'suv', 'truck', 'lincoln nav', 'z', '-', 'no such vehicle']
+
+
+@pytest.fixture(scope='module')
+def inventory():
+    with open(os.path.join(ROOT, 'data', 'inventory.json')) as f:
+        return json.load(f)
+
+
+def scan(inventory, query):
+    """The substring scan the index replaced"""
+    matches = []
+    for make, models in inventory.items():
+        for model, data in models.items():
+            text = f"{make} {model} {data.get('description', '')} {data.get('category', '')} {' '.join(data.get('features', []))}".lower()
+            if query in text:
+                matches.append((make, model))
+    return matches
+
+
+@pytest.mark.parametrize('query', QUERIES)
+def test_phrase_search_matches_the_substring_scan(inventory, query):
+    index = SearchIndex(inventory)
+    assert [(doc.make, doc.model) for doc in index.search(query)] == scan(inventory, query)
+
+
+def test_all_terms_mode(inventory):
+    index = SearchIndex(inventory)
+    matches = index.search('navigator lincoln', match='all')
+    assert [(doc.make, doc.model) for doc in matches] == [('Lincoln', 'Navigator')]
+    assert index.search('navigator lincoln') == []
+
+
+def test_ranking_prefers_name_matches():
+    index = SearchIndex({
+        'Ford': {
+            'Ranger': {'description': 'Tows like a bronco', 'category': 'Truck', 'features': []},
+            'Bronco': {'description': 'Off-road SUV', 'category': 'SUV', 'features': []}
+        }
+    })
+    assert [doc.model for doc in index.search('bronco')] == ['Ranger', 'Bronco']
+    assert [doc.model for doc in index.search('bronco', ranked=True)] == ['Bronco', 'Ranger']
+    assert [doc.model for doc in index.search('bronco', ranked=True, limit=1)] == ['Bronco']
+
+
+def test_search_endpoint(client):
+    body = client.get('/api/search?q=jeep&limit=2').get_json()
+    assert body['count'] == 2
+    assert client.get('/api/search?q=jeep&match=any').status_code == 400
+    assert client.get('/api/search').status_code == 400
+
+
+def test_infix_lookups_match_a_vocabulary_scan(inventory):
+    index = SearchIndex(inventory)
+    terms = {token[i:j] for token in index.vocabulary for i in range(len(token)) for j in range(i + 1, len(token) + 1)}
+    for term in sorted(terms) + ['zzzz', 'qx']:
+        assert index._infix_tokens(term) == {token for token in index.vocabulary if term in token}, term
@@ -0,0 +1,113 @@
+import json
+import os
+import shutil
+
+import pytest
+
+from inventory_manager import InventoryManager, migrate_storage
+
+
+def load_both(manager):
+    return manager.load_json(manager.inventory_file), manager.load_json(manager.parts_file)
+
+
+def test_new_database_is_seeded_from_json(data_dir):
+    json_manager = InventoryManager(json_dir=data_dir)
+    sqlite_manager = InventoryManager(json_dir=data_dir, storage='sqlite')
+    assert load_both(sqlite_manager) == load_both(json_manager)
+    assert sqlite_manager.load_json(sqlite_manager.inventory_file)
+
+
+def test_refuses_to_start_without_data(tmp_path):
+    with pytest.raises(RuntimeError, match='empty'):
+        InventoryManager(json_dir=str(tmp_path), storage='sqlite')
+
+
+def test_emptied_database_is_not_reseeded(data_dir):
+    manager = InventoryManager(json_dir=data_dir, storage='sqlite')
+    manager.save_json({}, manager.inventory_file)
+    reopened = InventoryManager(json_dir=data_dir, storage='sqlite')
+    assert reopened.load_json(reopened.inventory_file) == {}
+
+
+def test_mutations_match_json_storage(data_dir, tmp_path):
+    sqlite_manager = InventoryManager(json_dir=data_dir, storage='sqlite')
+    json_dir = str(tmp_path / 'json')
+    os.makedirs(json_dir)
+    json_manager = InventoryManager(json_dir=json_dir)
+    for file_path in (sqlite_manager.inventory_file, sqlite_manager.parts_file):
+        json_manager.save_json(sqlite_manager.load_json(file_path), os.path.join(json_dir, os.path.basename(file_path)))
+
+    model = next(iter(json_manager.load_json(json_manager.inventory_file)['Ford']))
+    for manager in (json_manager, sqlite_manager):
+        manager.add_vehicle('Ford', 'Test Model', 2020, {'category': 'SUV'})
+        manager.add_vehicle('Ford', 'Test Model', 2022)
+        manager.update_vehicle('Ford', model, {'status': 'Sold', 'years': [2001, 2002, 2005]})
+        manager.add_part('Ford', model, 'Brakes', 'Zeta Pad')
+        manager.add_part('Ford', model, 'Brakes', 'Alpha Pad')
+        manager.delete_part('Ford', model, 'Brakes', 'Zeta Pad')
+        manager.delete_vehicle('Jeep', next(iter(manager.load_json(manager.inventory_file)['Jeep'])))
+    assert load_both(sqlite_manager) == load_both(json_manager)
+    assert (sqlite_manager.load_json(sqlite_manager.parts_file)['Ford'][model]['Brakes']
+            == json_manager.load_json(json_manager.parts_file)['Ford'][model]['Brakes'])
+
+
+def test_migration_round_trip(data_dir):
+    original = load_both(InventoryManager(json_dir=data_dir))
+    migrate_storage('json', 'sqlite', json_dir=data_dir)
+    sqlite_manager = InventoryManager(json_dir=data_dir, storage='sqlite')
+    assert load_both(sqlite_manager) == original
+
+    sqlite_manager.add_part('Jeep', 'Wrangler', 'Lights', 'Fog Lamp')
+    changed = load_both(sqlite_manager)
+    migrate_storage('sqlite', 'json', json_dir=data_dir)
+    assert load_both(InventoryManager(json_dir=data_dir)) == changed
+
+
+def ordered(manager):
+    """Both documents as JSON text, so key and field order count"""
+    return tuple(json.dumps(data) for data in load_both(manager))
+
+
+@pytest.fixture
+def both_backends(data_dir, tmp_path):
+    json_dir = str(tmp_path / 'json')
+    shutil.copytree(data_dir, json_dir)
+    return InventoryManager(json_dir=json_dir), InventoryManager(json_dir=data_dir, storage='sqlite')
+
+
+def test_backends_keep_the_same_order(both_backends):
+    json_manager, sqlite_manager = both_backends
+    assert ordered(sqlite_manager) == ordered(json_manager)
+
+    for manager in both_backends:
+        # A make added after the Services section stays after it
+        manager.add_part('Toyota', 'Tacoma', 'Brakes', 'Pad')
+        # Categories and models whose first rows are deleted keep their place
+        manager.add_part('Ford', 'F-150', 'Engine', 'Zzz Late Part')
+        for part in list(manager.load_json(manager.parts_file)['Ford']['F-150']['Engine']):
+            if part != 'Zzz Late Part':
+                manager.delete_part('Ford', 'F-150', 'Engine', part)
+        manager.add_vehicle('Ford', 'Late Model', 2024)
+        for model in list(manager.load_json(manager.inventory_file)['Ford']):
+            if model != 'Late Model':
+                manager.delete_vehicle('Ford', model)
+        # An emptied key that comes back goes to the end, as a new dict key does
+        manager.delete_vehicle('Lincoln', 'Navigator')
+        manager.add_vehicle('Lincoln', 'Navigator', 2025, {'category': 'SUV'})
+        manager.update_vehicle('Jeep', 'Wrangler', {'years': [2020, 2021], 'status': 'Limited'})
+    assert ordered(sqlite_manager) == ordered(json_manager)
+
+    reopened = InventoryManager(json_dir=os.path.dirname(sqlite_manager.inventory_file), storage='sqlite')
+    assert ordered(reopened) == ordered(json_manager)
+
+
+def test_saved_documents_keep_their_order(both_backends):
+    inventory, parts = load_both(both_backends[0])
+    parts = {'Services': parts.pop('Services'), **dict(reversed(list(parts.items())))}
+    inventory = {make: {model: dict(reversed(list(data.items()))) for model, data in models.items()}
+                 for make, models in reversed(list(inventory.items()))}
+    for manager in both_backends:
+        manager.save_json(inventory, manager.inventory_file)
+        manager.save_json(parts, manager.parts_file)
+    assert ordered(both_backends[1]) == ordered(both_backends[0])
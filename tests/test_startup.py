@@ -0,0 +1,51 @@
+import json
+import os
+import subprocess
+import sys
+
+from conftest import ROOT
+from inventory_manager import InventoryManager
+
+
+def load_both(manager):
+    return manager.load_json(manager.inventory_file), manager.load_json(manager.parts_file)
+
+
+def test_binary_snapshots_load_the_same_data(data_dir):
+    expected = load_both(InventoryManager(json_dir=data_dir))
+    manager = InventoryManager(json_dir=data_dir, binary_snapshot=True)
+    paths = manager.compile_binary_snapshots()
+    assert all(os.path.exists(path) for path in paths)
+    assert manager._read_binary_snapshot(manager.inventory_file) is not None
+    assert load_both(InventoryManager(json_dir=data_dir, binary_snapshot=True)) == expected
+
+    # Same bytes written again (new inode and mtime): the snapshot no longer matches its source
+    with open(manager.inventory_file, 'rb') as f:
+        content = f.read()
+    os.remove(manager.inventory_file)
+    with open(manager.inventory_file, 'wb') as f:
+        f.write(content)
+    assert manager._read_binary_snapshot(manager.inventory_file) is None
+    assert load_both(InventoryManager(json_dir=data_dir, binary_snapshot=True)) == expected
+
+
+def test_stale_or_foreign_snapshots_are_ignored(data_dir):
+    manager = InventoryManager(json_dir=data_dir, binary_snapshot=True)
+    manager.compile_binary_snapshots()
+    inventory = manager.load_json(manager.inventory_file)
+    inventory['Ford']['F-150']['description'] = 'Edited after compiling'
+    InventoryManager(json_dir=data_dir).save_json(inventory, manager.inventory_file)
+    assert manager.load_json(manager.inventory_file)['Ford']['F-150']['description'] == 'Edited after compiling'
+
+    with open(f'{manager.parts_file}.bin', 'wb') as f:
+        f.write(b'inventory-snapshot 1 python 2.7\n')
+    assert manager.load_json(manager.parts_file) == InventoryManager(json_dir=data_dir).load_json(manager.parts_file)
+
+
+def test_startup_does_not_import_pandas(tmp_path, data_dir):
+    result = subprocess.run([sys.executable, os.path.join(ROOT, 'app', 'main.py'), '--startup-report'],
+                            cwd=str(tmp_path), capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    report = json.loads(result.stdout)
+    assert report['models'] > 0
+    assert not report['modules_loaded']['pandas']
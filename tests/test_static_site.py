@@ -0,0 +1,48 @@
+import json
+import os
+
+from static_site import MANIFEST_FILE, prerender
+
+
+def read_page(out_dir, *parts):
+    with open(os.path.join(out_dir, *parts, 'index.html'), encoding='utf-8') as f:
+        return f.read()
+
+
+def test_pages_come_from_the_given_snapshot(app_module, tmp_path):
+    out_dir = str(tmp_path / 'site')
+    snapshot = app_module.snapshot_store.current()
+    model = next(iter(snapshot.inventory['Ford']))
+
+    # The data changes after the snapshot was taken; the render must not notice
+    app_module.repository.delete_vehicle('Ford', model)
+    app_module.reload_data()
+    assert model not in app_module.snapshot_store.current().inventory['Ford']
+
+    counts = prerender(app_module.app, snapshot, out_dir)
+    assert counts['written'] > 0
+    assert model in read_page(out_dir, 'model', 'Ford', model)
+    with open(os.path.join(out_dir, MANIFEST_FILE)) as f:
+        manifest = json.load(f)
+    assert manifest['version'] == snapshot.version
+    assert len(manifest['pages']) == counts['written']
+
+
+def test_rerender_rewrites_only_changed_pages(app_module, tmp_path):
+    out_dir = str(tmp_path / 'site')
+    first = prerender(app_module.app, app_module.snapshot_store.current(), out_dir)
+    again = prerender(app_module.app, app_module.snapshot_store.current(), out_dir)
+    assert again == {'written': 0, 'unchanged': first['written'], 'removed': 0}
+
+    model = next(iter(app_module.snapshot_store.current().inventory['Jeep']))
+    app_module.repository.delete_vehicle('Jeep', model)
+    counts = prerender(app_module.app, app_module.reload_data(), out_dir)
+    assert counts['removed'] == 1
+
+
+def test_prerender_skips_request_hooks(app_module, tmp_path):
+    app_module.profiler.enable_profiling('/', count=5)
+    before = app_module.metrics.render()
+    prerender(app_module.app, app_module.snapshot_store.current(), str(tmp_path / 'site'))
+    assert app_module.metrics.render() == before
+    assert app_module.profiler.profile_remaining == 5
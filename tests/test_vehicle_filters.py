@@ -0,0 +1,44 @@
+import pytest
+
+from inventory_manager import InventoryManager
+
+
+def test_limit_and_offset_page_through_matches(client):
+    everything = client.get('/api/vehicles').get_json()
+    page = client.get('/api/vehicles?limit=2&offset=1').get_json()
+    assert page['count'] == everything['count']
+    assert page['offset'] == 1
+    assert page['results'] == everything['results'][1:3]
+
+
+def test_filters_narrow_results_and_facets(client):
+    body = client.get('/api/vehicles?make=Jeep').get_json()
+    assert body['count'] > 0
+    assert {result['make'] for result in body['results']} == {'Jeep'}
+
+
+@pytest.mark.parametrize('query', ['limit=abc', 'limit=0', 'limit=-1', 'limit=', 'offset=x', 'offset=-5', 'offset=1.5'])
+def test_invalid_limit_or_offset_is_rejected(client, query):
+    response = client.get(f'/api/vehicles?{query}')
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+
+def test_price_filters_use_the_matching_end_of_a_range(client, data_dir):
+    manager = InventoryManager(json_dir=data_dir)
+    for model, price_range in (('F-150', '$35,000 - $60,000'), ('Escape', 'Under $30,000'), ('Mustang', '$45k+')):
+        manager.update_vehicle('Ford', model, {'price_range': price_range})
+
+    def models(query):
+        return {result['model'] for result in client.get(f'/api/vehicles?make=Ford&{query}').get_json()['results']}
+
+    assert models('price_max=under%20%2432k') == {'Escape'}
+    assert models('price_max=%2440k') == {'Escape', 'F-150'}
+    assert models('price_min=%2450k') == {'F-150', 'Mustang'}
+
+
+@pytest.mark.parametrize('query', ['price_max=cheap', 'price_max=under%20%24', 'price_max=%2445k%2B'])
+def test_unparseable_prices_are_rejected(client, query):
+    response = client.get(f'/api/vehicles?{query}')
+    assert response.status_code == 400
+    assert 'price_max' in response.get_json()['error']
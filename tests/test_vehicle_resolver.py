@@ -0,0 +1,79 @@
+import json
+import os
+
+import pytest
+
+from conftest import ROOT
+from vehicle_resolver import ACCEPT_CONFIDENCE, VehicleResolver, compact_key, normalize, phonetic_key
+
+
+@pytest.fixture(scope='module')
+def resolver():
+    with open(os.path.join(ROOT, 'data', 'inventory.json')) as f:
+        return VehicleResolver(json.load(f))
+
+
+@pytest.mark.parametrize('spoken, digits', [
+    ('f one fifty', 'f 150'),
+    ('one hundred fifty', '150'),
+    ('twenty five', '25'),
+    ('five hundred', '500'),
+    ('F-150 Raptor', 'f 150 raptor')
+])
+def test_spoken_numbers_become_digits(spoken, digits):
+    assert normalize(spoken) == digits
+
+
+def test_keys_agree_across_spellings():
+    assert compact_key('F-150') == compact_key('f 150') == compact_key('f one fifty')
+    assert phonetic_key('Navigater') == phonetic_key('Navigator')
+    assert phonetic_key('Rangor') == phonetic_key('Ranger')
+
+
+@pytest.mark.parametrize('make, model, expected', [
+    ('Ford', 'F-150', ('Ford', 'F-150')),
+    (None, 'f one fifty', ('Ford', 'F-150')),
+    ('lincon', 'navigater', ('Lincoln', 'Navigator')),
+    (None, 'jeep grand cherokee', ('Jeep', 'Grand Cherokee'))
+])
+def test_noisy_names_resolve(resolver, make, model, expected):
+    best = resolver.best(make, model)
+    assert best is not None, resolver.resolve(make, model)
+    assert (best['make'], best['model']) == expected
+    assert best['confidence'] >= ACCEPT_CONFIDENCE
+
+
+def test_near_misses_are_suggested_but_not_accepted(resolver):
+    candidates = resolver.resolve('ford', 'mustan')
+    assert (candidates[0]['make'], candidates[0]['model']) == ('Ford', 'Mustang')
+    assert candidates[0]['method'] == 'trigram'
+    assert resolver.best('ford', 'mustan') is None
+
+
+def test_unknown_names_give_no_confident_match(resolver):
+    assert resolver.best('Ford', 'zzzz') is None
+    assert resolver.resolve() == []
+
+
+def test_webhook_and_model_lookup_use_the_resolver(client):
+    body = client.post('/webhook/check-vehicle', json={'model': 'f one fifty'}).get_json()
+    assert 'F-150' in body['message']
+    response = client.get('/api/inventory/lincon/navigater')
+    assert response.status_code == 200
+    assert (response.get_json()['make'], response.get_json()['model']) == ('Lincoln', 'Navigator')
+    missing = client.get('/api/inventory/Ford/zzzz')
+    assert missing.status_code == 404 and 'candidates' in missing.get_json()
+
+
+@pytest.mark.parametrize('route, body, field', [
+    ('/webhook/check-vehicle', {'make': ['x'], 'model': 'f150'}, 'make'),
+    ('/webhook/check-vehicle', {'model': 123}, 'model'),
+    ('/webhook/search-vehicles', {'query': {'text': 'suv'}}, 'query'),
+    ('/webhook/search-parts', {'query': ['brakes']}, 'query'),
+    ('/webhook/search-parts', {'query': 'brakes', 'make': 7}, 'make')
+])
+def test_non_string_names_are_rejected(client, route, body, field):
+    response = client.post(route, json=body)
+    assert response.status_code == 400
+    assert f"'{field}' must be a string" in response.get_json()['error']
+
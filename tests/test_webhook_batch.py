@@ -0,0 +1,40 @@
+import pytest
+
+
+def run_batch(client, operations):
+    response = client.post('/webhook/batch', json={'operations': operations})
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def test_items_run_independently(client):
+    body = run_batch(client, [
+        {'type': 'business-info'},
+        {'type': 'check-vehicle', 'params': {'make': 'Ford', 'model': 'F-150'}},
+        {'type': 'no-such-operation'}
+    ])
+    assert [result['status'] for result in body['results']] == [200, 200, 400]
+    assert body['errors'] == 1
+    assert body['version']
+
+
+@pytest.mark.parametrize('params', [[], '', 0, False, None, ['make'], 'Ford'])
+def test_params_must_be_an_object_when_given(client, params):
+    body = run_batch(client, [{'type': 'business-info', 'params': params}, {'type': 'business-info'}])
+    assert body['results'][0]['status'] == 400
+    assert body['results'][0]['error'] == "'params' must be an object"
+    assert body['results'][1]['status'] == 200
+
+
+@pytest.mark.parametrize('operations', [None, [], {'type': 'business-info'}, [{'type': 'business-info'}] * 21])
+def test_batch_shape_is_checked(client, operations):
+    response = client.post('/webhook/batch', json={'operations': operations})
+    assert response.status_code == 400
+
+
+def test_non_string_names_fail_only_their_batch_item(client):
+    body = client.post('/webhook/batch', json={'operations': [
+        {'type': 'search-vehicles', 'params': {'query': 5}},
+        {'type': 'check-vehicle', 'params': {'make': 'Ford', 'model': 'F-150'}}
+    ]}).get_json()
+    assert [result['status'] for result in body['results']] == [400, 200]
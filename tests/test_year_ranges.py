@@ -0,0 +1,48 @@
+import pytest
+
+from year_ranges import (add_year, compact_inventory, compress_years, contains_year, count_years, expand_years,
+                         format_year_ranges, normalize_years, year_bounds)
+
+
+def test_compress_and_expand_round_trip():
+    years = [2024, 1990, 1991, 1992, 2010, 2011, 1991]
+    ranges = compress_years(years)
+    assert ranges == [[1990, 1992], [2010, 2011], [2024, 2024]]
+    assert expand_years(ranges) == sorted(set(years))
+    assert count_years(ranges) == 6
+    assert year_bounds(ranges) == (1990, 2024)
+    assert format_year_ranges(ranges) == '1990-1992, 2010-2011, 2024'
+
+
+@pytest.mark.parametrize('years, expected', [
+    ([], []),
+    ([2001, 2000], [[2000, 2001]]),
+    ([[2005, 2010], [1999, 2004]], [[1999, 2010]]),
+    ([[2000, 2005], [2003, 2008], [2012, 2012]], [[2000, 2008], [2012, 2012]]),
+    (['2001', '2002'], [[2001, 2002]])
+])
+def test_normalize_accepts_either_form(years, expected):
+    assert normalize_years(years) == expected
+
+
+def test_membership_and_adding_years():
+    ranges = [[1990, 2000], [2010, 2020]]
+    assert contains_year(ranges, 1990) and contains_year(ranges, 2015)
+    assert not contains_year(ranges, 2005) and not contains_year(ranges, 1989)
+    assert add_year(ranges, 2005) == [[1990, 2000], [2005, 2005], [2010, 2020]]
+    assert add_year(ranges, 2001) == [[1990, 2001], [2010, 2020]]
+    assert add_year(ranges, 1995) is ranges
+
+
+def test_compact_inventory_converts_listed_years_in_place():
+    inventory = {'Ford': {'F-150': {'years': [1990, 1991, 1993]}, 'Mustang': {'category': 'Car'}}, 'Services': []}
+    assert compact_inventory(inventory) is inventory
+    assert inventory['Ford']['F-150']['years'] == [[1990, 1991], [1993, 1993]]
+    assert 'years' not in inventory['Ford']['Mustang']
+
+
+def test_api_lists_years_unless_compact_is_requested(client):
+    expanded = client.get('/api/inventory/Ford/F-150').get_json()
+    compact = client.get('/api/inventory/Ford/F-150?format=compact').get_json()
+    assert expanded['data']['years'] == expand_years(compact['data']['years'])
+    assert client.get('/api/inventory/Ford/F-150?format=ranges').status_code == 400
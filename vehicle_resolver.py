@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Fuzzy make/model resolution for speech-to-text input
+Normalized, phonetic and trigram keys for every make and model are built
+once per data load so "f one fifty" or "grand cherokee" find the right model
+"""
+
+import re
+import time
+from collections import Counter
+
+# Per-call time budget for the trigram pass (exact and phonetic lookups are always done)
+RESOLVE_BUDGET_MS = 5.0
+
+# Minimum confidence to use the top candidate without asking the caller
+ACCEPT_CONFIDENCE = 0.8
+
+# Candidates below this confidence are not suggested at all
+MIN_CONFIDENCE = 0.4
+
+# Models of a different make than the one asked for are ranked lower
+OTHER_MAKE_PENALTY = 0.75
+
+TOKEN_RE = re.compile(r'[a-z]+|\d+')
+
+ONES = {
+    'zero': 0, 'oh': 0, 'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5,
+    'six': 6, 'seven': 7, 'eight': 8, 'nine': 9
+}
+TEENS = {
+    'ten': 10, 'eleven': 11, 'twelve': 12, 'thirteen': 13, 'fourteen': 14,
+    'fifteen': 15, 'sixteen': 16, 'seventeen': 17, 'eighteen': 18, 'nineteen': 19
+}
+TENS = {
+    'twenty': 20, 'thirty': 30, 'forty': 40, 'fifty': 50,
+    'sixty': 60, 'seventy': 70, 'eighty': 80, 'ninety': 90
+}
+
+
+def _numbers_to_digits(tokens):
+    """Spoken numbers to digits: 'one fifty' -> '150', 'five hundred' -> '500', 'twenty five' -> '25'"""
+    out = []
+    digits = None
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        if token in TENS:
+            value = TENS[token]
+            if i + 1 < len(tokens) and tokens[i + 1] in ONES and tokens[i + 1] not in ('zero', 'oh'):
+                value += ONES[tokens[i + 1]]
+                i += 1
+            piece = str(value)
+        elif token in TEENS:
+            piece = str(TEENS[token])
+        elif token in ONES:
+            piece = str(ONES[token])
+        elif token == 'hundred' and digits is not None:
+            digits = str(int(digits) * 100)
+            i += 1
+            continue
+        elif token == 'and' and digits is not None and i + 1 < len(tokens) and (
+                tokens[i + 1] in ONES or tokens[i + 1] in TEENS or tokens[i + 1] in TENS):
+            i += 1
+            continue
+        else:
+            if digits is not None:
+                out.append(digits)
+                digits = None
+            out.append(token)
+            i += 1
+            continue
+
+        if digits is None:
+            digits = piece
+        elif digits.endswith('00') and len(piece) <= 2:
+            # 'one hundred fifty' -> 150
+            digits = digits[:-len(piece)] + piece
+        else:
+            digits += piece
+        i += 1
+
+    if digits is not None:
+        out.append(digits)
+    return out
+
+
+def normalize(text):
+    """Lowercase word/number tokens with spoken numbers turned into digits"""
+    return ' '.join(_numbers_to_digits(TOKEN_RE.findall(str(text).lower())))
+
+
+def compact_key(text):
+    """Normalized text without separators, so 'F-150', 'f 150' and 'f one fifty' agree"""
+    return normalize(text).replace(' ', '')
+
+
+def _phonetic_token(token):
+    if token.isdigit():
+        return token
+    for old, new in (('ph', 'f'), ('ck', 'k'), ('gh', 'g'), ('sch', 'sk'), ('qu', 'kw'), ('x', 'ks')):
+        token = token.replace(old, new)
+    token = re.sub(r'c(?=[eiy])', 's', token)
+    token = token.replace('c', 'k').replace('q', 'k').replace('z', 's').replace('v', 'f')
+    first, rest = token[:1], token[1:]
+    rest = re.sub(r'[aeiouyhw]', '', rest)
+    key = first + rest
+    return re.sub(r'(.)\1+', r'\1', key)
+
+
+def phonetic_key(text):
+    """Rough sound-alike key: 'Navigater' and 'Navigator' share one"""
+    return ''.join(_phonetic_token(token) for token in normalize(text).split())
+
+
+def trigrams(key):
+    padded = f'  {key} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class VehicleResolver:
+    def __init__(self, inventory):
+        self.makes = []
+        self.models = []
+        # compact/phonetic key -> make name
+        self.make_keys = {}
+        self.make_phonetic = {}
+        # compact/phonetic key -> set of model ids (index into self.models)
+        self.exact = {}
+        self.phonetic = {}
+        # trigram -> set of model ids, over the model name alone
+        self.grams = {}
+        self.model_grams = []
+        self.model_keys = []
+
+        for make, models in inventory.items():
+            if not isinstance(models, dict):
+                continue
+            self.makes.append(make)
+            self.make_keys.setdefault(compact_key(make), make)
+            self.make_phonetic.setdefault(phonetic_key(make), make)
+
+            for model, data in models.items():
+                if not isinstance(data, dict):
+                    continue
+                model_id = len(self.models)
+                self.models.append((make, model))
+                for text in (model, f'{make} {model}'):
+                    self.exact.setdefault(compact_key(text), set()).add(model_id)
+                    self.phonetic.setdefault(phonetic_key(text), set()).add(model_id)
+                self.model_keys.append(compact_key(model))
+                grams = trigrams(self.model_keys[-1])
+                self.model_grams.append(grams)
+                for gram in grams:
+                    self.grams.setdefault(gram, set()).add(model_id)
+
+    def __len__(self):
+        return len(self.models)
+
+    def resolve_make(self, text):
+        """(make, confidence) for a spoken make, or (None, 0.0)"""
+        if not text:
+            return None, 0.0
+        key = compact_key(text)
+        if key in self.make_keys:
+            return self.make_keys[key], 1.0
+        phonetic = phonetic_key(text)
+        if phonetic in self.make_phonetic:
+            return self.make_phonetic[phonetic], 0.9
+
+        grams = trigrams(key)
+        best, best_score = None, 0.0
+        for make in self.makes:
+            make_grams = trigrams(compact_key(make))
+            shared = len(grams & make_grams)
+            score = shared / (len(grams) + len(make_grams) - shared)
+            if score > best_score:
+                best, best_score = make, score
+        if best_score < MIN_CONFIDENCE:
+            return None, 0.0
+        return best, round(best_score, 3)
+
+    def resolve(self, make=None, model=None, limit=3, budget_ms=RESOLVE_BUDGET_MS):
+        """Best (make, model) candidates for noisy input, highest confidence first
+
+        Either argument may be missing, and model may include the make
+        ("ford f 150"). Returns a list of dicts with make, model, confidence
+        and the key that matched ('exact', 'phonetic' or 'trigram').
+        """
+        deadline = time.perf_counter() + budget_ms / 1000
+        wanted_make, _ = self.resolve_make(make)
+        text = model or make or ''
+        if not text.strip():
+            return []
+
+        scores = {}
+
+        def offer(model_id, confidence, method):
+            candidate_make = self.models[model_id][0]
+            if wanted_make is not None and candidate_make != wanted_make:
+                confidence *= OTHER_MAKE_PENALTY
+            if confidence > scores.get(model_id, (0.0, None))[0]:
+                scores[model_id] = (confidence, method)
+
+        texts = [text]
+        if make and model:
+            texts.append(f'{make} {model}')
+        for candidate_text in texts:
+            for model_id in self.exact.get(compact_key(candidate_text), ()):
+                offer(model_id, 1.0, 'exact')
+            for model_id in self.phonetic.get(phonetic_key(candidate_text), ()):
+                offer(model_id, 0.9, 'phonetic')
+
+        if not any(confidence >= ACCEPT_CONFIDENCE for confidence, _ in scores.values()):
+            key = compact_key(text)
+            # Drop a spoken make prefix ("jeep grand cherokee") before comparing to model names
+            for make_key in self.make_keys:
+                if key.startswith(make_key) and len(key) > len(make_key):
+                    key = key[len(make_key):]
+                    break
+            grams = trigrams(key)
+            shared = Counter()
+            for gram in grams:
+                for model_id in self.grams.get(gram, ()):
+                    shared[model_id] += 1
+                if time.perf_counter() > deadline:
+                    break
+            for model_id, count in shared.most_common():
+                if time.perf_counter() > deadline:
+                    break
+                model_grams = self.model_grams[model_id]
+                similarity = count / (len(grams) + len(model_grams) - count)
+                model_key = self.model_keys[model_id]
+                if len(key) >= 3 and (model_key.startswith(key) or key.startswith(model_key)):
+                    # 'mustang mach e' vs 'Mustang', 'navi' vs 'Navigator'
+                    similarity = max(similarity, 0.8)
+                offer(model_id, 0.85 * similarity, 'trigram')
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1][0], self.models[item[0]]))
+        return [
+            {
+                'make': self.models[model_id][0],
+                'model': self.models[model_id][1],
+                'confidence': round(confidence, 3),
+                'method': method
+            }
+            for model_id, (confidence, method) in ranked[:limit]
+            if confidence >= MIN_CONFIDENCE
+        ]
+
+    def best(self, make=None, model=None):
+        """Top candidate if it is confident enough to act on, else None"""
+        candidates = self.resolve(make, model, limit=1)
+        if candidates and candidates[0]['confidence'] >= ACCEPT_CONFIDENCE:
+            return candidates[0]
+        return None
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Compact model-year storage
+A model's years are kept as sorted, non-overlapping inclusive ranges,
+e.g. [[1990, 2005], [2010, 2025]] instead of every year listed out
+"""
+
+from bisect import bisect_right
+
+# Response formats offered by the APIs; 'expanded' lists every year
+YEAR_FORMATS = ('expanded', 'compact')
+
+
+def is_compact(years):
+    """True if years is already a list of [start, end] ranges"""
+    return bool(years) and isinstance(years[0], (list, tuple))
+
+
+def compress_years(years):
+    """Build ranges from an iterable of years (any order, duplicates allowed)"""
+    ranges = []
+    for year in sorted(set(int(year) for year in years)):
+        if ranges and year == ranges[-1][1] + 1:
+            ranges[-1][1] = year
+        else:
+            ranges.append([year, year])
+    return ranges
+
+
+def normalize_years(years):
+    """Accept either the expanded list or ranges and return merged ranges"""
+    if not years:
+        return []
+    if not is_compact(years):
+        return compress_years(years)
+
+    ranges = []
+    for start, end in sorted((int(start), int(end)) for start, end in years):
+        if ranges and start <= ranges[-1][1] + 1:
+            ranges[-1][1] = max(ranges[-1][1], end)
+        else:
+            ranges.append([start, end])
+    return ranges
+
+
+def expand_years(ranges):
+    """List every year covered by ranges"""
+    if not ranges or not is_compact(ranges):
+        return list(ranges or [])
+    return [year for start, end in ranges for year in range(start, end + 1)]
+
+
+def contains_year(ranges, year):
+    """O(log n) membership check"""
+    i = bisect_right(ranges, [year, float('inf')]) - 1
+    return i >= 0 and ranges[i][0] <= year <= ranges[i][1]
+
+
+def add_year(ranges, year):
+    """Return ranges with year included"""
+    if contains_year(ranges, year):
+        return ranges
+    return normalize_years(ranges + [[year, year]])
+
+
+def count_years(ranges):
+    return sum(end - start + 1 for start, end in ranges)
+
+
+def year_bounds(ranges):
+    """(first year, last year), or None when there are no years"""
+    if not ranges:
+        return None
+    return ranges[0][0], ranges[-1][1]
+
+
+def format_year_ranges(ranges):
+    """Human readable form, e.g. '1990-2005, 2010-2025'"""
+    return ', '.join(str(start) if start == end else f'{start}-{end}' for start, end in ranges)
+
+
+def compact_inventory(inventory):
+    """Normalize every model's years to ranges in place and return inventory"""
+    for models in inventory.values():
+        if not isinstance(models, dict):
+            continue
+        for data in models.values():
+            if isinstance(data, dict) and 'years' in data:
+                data['years'] = normalize_years(data['years'])
+    return inventory
+
+
+def expand_model(data):
+    """Copy of a model's data with years listed out (the default API format)"""
+    if 'years' not in data:
+        return data
+    expanded = dict(data)
+    expanded['years'] = expand_years(data['years'])
+    return expanded
+
+
+def expand_inventory(inventory):
+    """Copy of inventory (or one make's models) with every model's years listed out"""
+    return {
+        make: {model: expand_model(data) for model, data in models.items()}
+        for make, models in inventory.items()
+    }